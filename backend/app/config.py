@@ -25,6 +25,55 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FILE: Path | None = None
 
+    # Write data files without indentation
+    JSON_COMPACT_FILES: bool = True
+
+    # Memory-mapped columnar copies of programs files (needs numpy)
+    COLUMNAR_PROGRAMS: bool = True
+    COLUMNAR_VALUE_CACHE_SIZE: int = 65536
+    # Build missing or stale columns on first load instead of parsing JSON
+    # in every worker
+    COLUMNAR_BUILD_ON_LOAD: bool = True
+
+    # Write .gz (and .br with brotli installed) copies of ingested data files
+    PRECOMPRESS_DATA_FILES: bool = True
+
+    # Ingest schedule, also used to derive Cache-Control max-age
+    SOURCES_REFRESH_HOURS: int = 3
+    XMLEPG_REFRESH_HOURS: int = 12
+    HTTP_CACHE_MIN_MAX_AGE: int = 60
+
+    # Day grid cache for /py/epg/date
+    GRID_CACHE_SIZE: int = 64
+    GRID_PREWARM_DAYS: int = 2
+    GRID_PREWARM_TIMEZONES: list[str] = [
+        "Australia/Sydney",
+        "Australia/Melbourne",
+        "Australia/Brisbane",
+        "Australia/Adelaide",
+        "Australia/Perth",
+    ]
+
+    # Load sources and build their indexes in the background at startup;
+    # an empty list warms every source in the sources files
+    PREWARM_ON_STARTUP: bool = False
+    PREWARM_SOURCES: list[str] = []
+    PREWARM_WORKERS: int = 4
+
+    # Threads for file reads and JSON decoding outside the event loop, and
+    # processes for day grid builds (0 builds them in those threads)
+    IO_THREADS: int = 16
+    CPU_WORKERS: int = 0
+
+    # Per-phase timings of each request in a Server-Timing header, and a
+    # warning for requests slower than SLOW_REQUEST_MS (0 disables it)
+    SERVER_TIMING: bool = False
+    SLOW_REQUEST_MS: float = 0
+
+    # Response compression; smaller bodies are sent uncompressed
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CACHE_MB: int = 64
+
     # API Key for protected endpoints
     ADMIN_API_KEY: str = "webepg-admin"
 
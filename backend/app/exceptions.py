@@ -94,6 +94,43 @@ class InvalidDateFormatError(WebEPGException):
         self.expected_format = expected_format
 
 
+class InvalidSearchQueryError(WebEPGException):
+    """Raised when a search query contains no searchable terms."""
+
+    def __init__(self, query: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Search query '{query}' contains no searchable words",
+            error_code="INVALID_SEARCH_QUERY",
+            error_type="InvalidSearchQueryError",
+        )
+        self.query = query
+
+
+class InvalidSourceSelectionError(WebEPGException):
+    """Raised when a multi-source request selects no sources."""
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            error_code="INVALID_SOURCE_SELECTION",
+            error_type="InvalidSourceSelectionError",
+        )
+
+
+class InvalidTimeWindowError(WebEPGException):
+    """Raised when a time window is empty, reversed or too long."""
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            error_code="INVALID_TIME_WINDOW",
+            error_type="InvalidTimeWindowError",
+        )
+
+
 class FileProcessingError(WebEPGException):
     """Raised when file processing fails."""
 
@@ -1,10 +1,15 @@
 """Centralized logging configuration for the WebEPG API."""
 
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional
 
+# Writes records to stdout and the log file in a background thread
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -13,6 +18,10 @@ def setup_logging(
 ) -> None:
     """
     Configure application-wide logging.
+
+    Loggers only put records on a queue; a ``QueueListener`` thread formats
+    them and writes them to stdout and the log file, so handler I/O never
+    blocks the event loop. Call ``stop_logging`` on shutdown to flush it.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -25,24 +34,67 @@ def setup_logging(
             "%(filename)s:%(lineno)d - %(message)s"
         )
 
+    global _listener
+    previous = _listener
+
+    formatter = logging.Formatter(log_format)
     handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
 
     if log_file:
         log_file.parent.mkdir(parents=True, exist_ok=True)
         handlers.append(logging.FileHandler(log_file))
 
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # The listener's handlers apply the format; queued records only carry
+    # the merged message
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
     logging.basicConfig(
         level=getattr(logging, log_level.upper(), logging.INFO),
-        format=log_format,
-        handlers=handlers,
+        handlers=[queue_handler],
         force=True,  # Override any existing configuration
     )
+    if previous is not None:
+        _stop_listener(previous)
 
     # Set specific logger levels
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("uvicorn").setLevel(logging.INFO)
 
 
+def stop_logging() -> None:
+    """
+    Write out queued records and stop the listener thread, if running.
+
+    Records logged afterwards, e.g. by interpreter shutdown, are written
+    directly by the same handlers.
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+
+def _stop_listener(listener: QueueListener) -> None:
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name."""
     return logging.getLogger(name)
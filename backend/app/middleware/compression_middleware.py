@@ -0,0 +1,234 @@
+"""Response compression middleware."""
+
+from typing import List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.compression_cache import CompressedKey, CompressionCache
+from app.utils.compression import (
+    RESPONSE_CODINGS,
+    StreamCompressor,
+    negotiate_encoding,
+)
+from app.utils.server_timing import phase
+
+_COMPRESSIBLE_TYPES = frozenset(
+    ("application/json", "application/xml", "application/javascript")
+)
+# Responses without a body, or whose body must not be re-encoded
+_SKIPPED_STATUSES = frozenset((204, 206, 304))
+
+
+def is_compressible(content_type: str) -> bool:
+    """Return whether a media type is text that compresses well."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best coding the client accepts.
+
+    Bodies smaller than ``minimum_size`` are sent as is. Streamed bodies are
+    compressed chunk by chunk and flushed after each chunk. Compressed
+    bodies of responses carrying an ETag are cached, so repeated requests
+    for the same ETag are not compressed again.
+
+    Requests under ``excluded_paths`` are passed through untouched, for
+    mounts that choose their own encoding such as the static file mount.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        cache: Optional[CompressionCache],
+        excluded_paths: Sequence[str] = (),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.excluded_paths = tuple(path.rstrip("/") for path in excluded_paths)
+
+    def is_excluded(self, path: str) -> bool:
+        """Return whether a request path lies under an excluded prefix."""
+        return any(
+            path == excluded or path.startswith(excluded + "/")
+            for excluded in self.excluded_paths
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "HEAD"
+            or self.is_excluded(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), RESPONSE_CODINGS
+        )
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.pathsend" in extensions:
+            # File bodies have to pass through here to be compressed
+            # Updated in place like the router does, so outer middleware
+            # still sees the matched route
+            extensions = dict(extensions)
+            del extensions["http.response.pathsend"]
+            scope["extensions"] = extensions
+
+        responder = _CompressionResponder(self, scope, send, coding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Rewrites the messages of a single response."""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Scope,
+        send: Send,
+        coding: str,
+    ) -> None:
+        self.minimum_size = middleware.minimum_size
+        self.cache = middleware.cache
+        self.target = scope.get("raw_path") or scope["path"].encode()
+        if scope.get("query_string"):
+            self.target += b"?" + scope["query_string"]
+        self.downstream = send
+        self.coding = coding
+
+        self.start: Optional[Message] = None
+        self.state = "start"
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor: Optional[StreamCompressor] = None
+        self.cache_key: Optional[CompressedKey] = None
+        self.cached_chunks: Optional[List[bytes]] = None
+        self.cached_size = 0
+
+    async def send(self, message: Message) -> None:
+        if self.state == "start":
+            await self._response_start(message)
+        elif self.state == "passthrough" or message["type"] != "http.response.body":
+            await self.downstream(message)
+        elif self.state == "cached":
+            # The body was already sent from the cache
+            return
+        elif self.state == "buffering":
+            await self._buffer(message)
+        else:
+            await self._stream(message)
+
+    async def _response_start(self, message: Message) -> None:
+        headers = MutableHeaders(raw=message["headers"])
+        if (
+            message["status"] in _SKIPPED_STATUSES
+            or "content-encoding" in headers
+            or not is_compressible(headers.get("content-type", ""))
+        ):
+            self.state = "passthrough"
+            await self.downstream(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        self.start = message
+
+        etag = headers.get("etag")
+        if etag and self.cache is not None:
+            self.cache_key = (self.coding, etag, self.target.decode("latin-1"))
+            body = self.cache.get(self.cache_key)
+            if body is not None:
+                self.state = "cached"
+                await self._send_compressed_start(content_length=len(body))
+                await self.downstream({"type": "http.response.body", "body": body})
+                return
+
+        self.state = "buffering"
+
+    async def _buffer(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+
+        if not more_body:
+            content = b"".join(self.buffered)
+            if len(content) < self.minimum_size:
+                self.state = "passthrough"
+                await self.downstream(self.start)  # type: ignore[arg-type]
+                await self.downstream({"type": "http.response.body", "body": content})
+                return
+
+            with phase("compress"):
+                compressor = StreamCompressor(self.coding)
+                compressed = compressor.compress(content) + compressor.finish()
+            self._store(compressed)
+            await self._send_compressed_start(content_length=len(compressed))
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.buffered_size >= self.minimum_size:
+            # Long enough to be worth compressing: switch to streaming
+            self.state = "streaming"
+            self.compressor = StreamCompressor(self.coding)
+            if self.cache_key is not None:
+                self.cached_chunks = []
+            await self._send_compressed_start(content_length=None)
+            content = b"".join(self.buffered)
+            self.buffered = []
+            await self._send_chunk(
+                self.compressor.compress(content) + self.compressor.flush(), True
+            )
+
+    async def _stream(self, message: Message) -> None:
+        compressor = self.compressor
+        assert compressor is not None
+        more_body = message.get("more_body", False)
+        chunk = compressor.compress(message.get("body", b""))
+        chunk += compressor.flush() if more_body else compressor.finish()
+        await self._send_chunk(chunk, more_body)
+
+        if not more_body and self.cached_chunks is not None:
+            self._store(b"".join(self.cached_chunks))
+
+    async def _send_chunk(self, chunk: bytes, more_body: bool) -> None:
+        if self.cached_chunks is not None:
+            self.cached_size += len(chunk)
+            if self.cache is None or self.cached_size > self.cache.max_entry_bytes:
+                self.cached_chunks = None
+            else:
+                self.cached_chunks.append(chunk)
+        await self.downstream(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    async def _send_compressed_start(self, content_length: Optional[int]) -> None:
+        start = self.start
+        assert start is not None
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self.coding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        # The compressed body is a different representation of the resource
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        await self.downstream(start)
+
+    def _store(self, body: bytes) -> None:
+        if self.cache is not None and self.cache_key is not None:
+            self.cache.put(self.cache_key, body)
@@ -2,51 +2,63 @@
 
 import logging
 import time
-from collections.abc import Awaitable, Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses."""
+class LoggingMiddleware:
+    """
+    Middleware for logging HTTP requests and responses.
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """Log request and response details."""
-        start_time = time.time()
+    A plain ASGI middleware: it reads the status from the response start and
+    passes every message on unchanged, so streamed bodies are not buffered.
+    Each request is logged once, when its response has been sent, with the
+    time taken until then.
+    """
 
-        # Log request
-        logger.info(
-            f"{request.method} {request.url.path} - "
-            f"Client: {request.client.host if request.client else 'unknown'}"
-        )
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Process request
-        try:
-            response = await call_next(request)
-            process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-            # Log successful response
-            logger.info(
-                f"{request.method} {request.url.path} - "
-                f"Status: {response.status_code} - "
-                f"Time: {process_time:.3f}s"
-            )
+        start_time = time.perf_counter()
+        status_code = 0
 
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = time.time() - start_time
+            process_time = time.perf_counter() - start_time
             logger.error(
-                f"{request.method} {request.url.path} - "
+                f"{scope['method']} {scope['path']} - "
+                f"Client: {_client_host(scope)} - "
                 f"Error: {type(e).__name__}: {str(e)} - "
                 f"Time: {process_time:.3f}s",
                 exc_info=True,
             )
             raise
 
+        # Skip building the message when INFO records would be dropped
+        if logger.isEnabledFor(logging.INFO):
+            process_time = time.perf_counter() - start_time
+            logger.info(
+                f"{scope['method']} {scope['path']} - "
+                f"Client: {_client_host(scope)} - "
+                f"Status: {status_code} - "
+                f"Time: {process_time:.3f}s"
+            )
+
+
+def _client_host(scope: Scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
@@ -0,0 +1,84 @@
+"""Request latency and response size metrics."""
+
+import time
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import http_request_duration, http_response_bytes
+
+# Route label for requests that matched no route, so unknown paths cannot
+# create new series
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the path template of the route that handled a request.
+
+    Routers included with a prefix report their routes' paths without it,
+    so the prefix is taken from the leading segments of the request path.
+    Requests served by a mounted app are labelled ``{mount}/{path}``.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template:
+        if ":path}" in template:
+            # Spans an unknown number of segments
+            return template
+        segments = scope["path"].split("/")
+        depth = template.count("/")
+        prefix = "/".join(segments[: len(segments) - depth])
+        return prefix + template
+
+    if "app_root_path" in scope:
+        mount = scope.get("root_path", "")[len(scope["app_root_path"]) :]
+        if mount:
+            return mount + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Record each response's latency and body size by route template.
+
+    Latency runs until the last body chunk is sent, so streamed responses
+    are measured in full. The route template is read from the scope after
+    routing, e.g. ``/api/py/epg/date/{date}/{source}``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        content_length = 0
+        body_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, content_length, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_length = int(
+                    Headers(raw=message["headers"]).get("content-length", 0)
+                )
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.pathsend":
+                # The server sends the file itself
+                body_bytes += content_length
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_template(scope)
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route, str(status)
+            )
+            http_response_bytes.inc(route, amount=body_bytes)
@@ -0,0 +1,62 @@
+"""Server-Timing header and slow request log."""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.server_timing import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Time the phases of each request.
+
+    With ``emit_header`` the phases recorded before the response starts, and
+    the time taken until then as ``total``, are sent in a ``Server-Timing``
+    header. Requests that take ``slow_request_ms`` or longer to send in full
+    are logged with every phase; 0 turns the log off.
+    """
+
+    def __init__(
+        self, app: ASGIApp, emit_header: bool = True, slow_request_ms: float = 0
+    ) -> None:
+        self.app = app
+        self.emit_header = emit_header
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = PhaseTimer()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_header:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timer.header_value())
+            await send(message)
+
+        with timer:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._log_if_slow(scope, timer)
+
+    def _log_if_slow(self, scope: Scope, timer: PhaseTimer) -> None:
+        if not self.slow_request_seconds:
+            return
+        elapsed = timer.elapsed()
+        if elapsed < self.slow_request_seconds:
+            return
+        path = scope["path"]
+        if scope.get("query_string"):
+            path += "?" + scope["query_string"].decode("latin-1")
+        logger.warning(
+            f"Slow request: {scope['method']} {path} - "
+            f"Time: {elapsed * 1000:.1f}ms - "
+            f"Phases: {timer.summary() or 'none'}"
+        )
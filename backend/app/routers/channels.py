@@ -1,11 +1,16 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request, Response
 from pydantic import BaseModel
 
 from app.exceptions import ChannelNotFoundError, FileProcessingError
-from app.utils.file_operations import load_json
+from app.services.source_store import source_store
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
+)
 
 router = APIRouter()
 
@@ -79,18 +84,21 @@ class ChannelResponse(BaseModel):
                 }
             }
         },
+        304: {"description": "Channel data has not changed since the given ETag"},
         404: {"description": "Channel data for the specified ID not found"},
         500: {"description": "Error processing channel data"}
     }
 )
 async def get_channel_data(
+    request: Request,
+    response: Response,
     id: str = Path(
         ...,
         min_length=1,
         description="Source identifier (e.g., 'source1', 'xmltvnet')",
         example="xmltvnet"
     ),
-) -> Dict[str, Any]:
+) -> Union[Dict[str, Any], Response]:
     """
     Retrieve channel data for a specific source ID.
     
@@ -98,6 +106,9 @@ async def get_channel_data(
     - Channel metadata (ID, name, slug, number)
     - Channel logos and URLs
     - Channel grouping information
+
+    Responses carry an ETag; send it back in If-None-Match to get a
+    304 Not Modified while the channel data is unchanged.
     
     **Parameters:**
     - **id**: Source identifier matching a processed XMLTV source
@@ -121,12 +132,23 @@ async def get_channel_data(
     """
     filename = f"{id}_channels.json"
     try:
-        channels_data = load_json(filename)
+        channels_entry = await source_store.aload_entry(filename)
     except FileNotFoundError as err:
         raise ChannelNotFoundError(id) from err
     except Exception as err:
         raise FileProcessingError(filename, str(err)) from err
 
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(channels_entry.version, "channels", id),
+        max_age=seconds_until_next_ingest(id, channels_entry.modified),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    channels_data = channels_entry.data
+
     # Ensure channels_data is a list
     if not isinstance(channels_data, list):
         channels_data = []
@@ -1,12 +1,19 @@
 from datetime import datetime
-from typing import List
+from typing import List, Union
 
 import pytz
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 from pydantic import BaseModel
 
 from app.exceptions import InvalidTimezoneError, SourceNotFoundError
-from app.utils.file_operations import load_json
+from app.services.source_store import source_store
+from app.utils.date_ranges import covered_days
+from app.utils.grid_engine import format_day, local_clock
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
+)
 
 router = APIRouter()
 
@@ -18,15 +25,14 @@ class DateResponse(BaseModel):
 
 @router.get("/py/dates/{source}", response_model=DateResponse)
 async def get_unique_dates(
+    request: Request,
+    response: Response,
     source: str,
     timezone: str = Query(default="UTC", description="Timezone for date conversion"),
-) -> DateResponse:
-    # Load the programs file for the source
-    programs_filename = f"{source}_programs.json"
-
-    # Check if the file exists
+) -> Union[DateResponse, Response]:
+    # Load the start-time summary for the source
     try:
-        programs_data = load_json(programs_filename)
+        dates_entry = await source_store.aload_dates(source)
     except FileNotFoundError as err:
         raise SourceNotFoundError(source) from err
 
@@ -36,20 +42,23 @@ async def get_unique_dates(
     except pytz.exceptions.UnknownTimeZoneError as err:
         raise InvalidTimezoneError(timezone) from err
 
-    # Set to collect unique dates
-    unique_dates = set()
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(dates_entry.version, "dates", source, target_timezone.zone),
+        max_age=seconds_until_next_ingest(source, dates_entry.modified),
+    )
+    if not_modified is not None:
+        return not_modified
 
-    # Convert start_time to the target timezone and extract the date
-    for program in programs_data:
-        utc_start = datetime.fromisoformat(program['start_time'])
-        local_start = utc_start.astimezone(target_timezone)
-        program_date = local_start.strftime("%Y%m%d")  # Get the date in YYYYMMDD format
-        unique_dates.add(program_date)
+    # Derive the local dates from the UTC start-time runs, in YYYYMMDD format
+    local_days = covered_days(dates_entry.data, local_clock(target_timezone))
+    unique_dates = [format_day(day).replace("-", "") for day in local_days]
 
     # Get current UTC time
     current_time = datetime.now(pytz.UTC).isoformat()
 
     # Return the response in the desired format
     return DateResponse(
-        date=current_time, query="dates", source=source, data=sorted(unique_dates)
+        date=current_time, query="dates", source=source, data=unique_dates
     )
@@ -1,11 +1,10 @@
 from collections import defaultdict
 from datetime import datetime, timedelta
 from datetime import timezone as tz
-from typing import Any, DefaultDict, Dict, List
+from typing import Any, Callable, DefaultDict, Dict, List, Optional
 
 import pytz
-from fastapi import APIRouter, Path, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Path, Query, Request, Response
 
 from app.exceptions import (
     InvalidDateFormatError,
@@ -13,60 +12,39 @@ from app.exceptions import (
     ProgrammingNotFoundError,
     SourceNotFoundError,
 )
-from app.utils.file_operations import load_json
-from app.utils.time_utils import (
-    adjust_programming,
-    group_and_fill_programs,
-    group_and_fill_programschannels,
+from app.services.category_index import CategoryIndex, normalize_category
+from app.services.grid_cache import day_grid_cache
+from app.services.source_store import SourceData, source_store
+from app.utils.grid_engine import build_channel_schedule
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
 )
+from app.utils.program_format import format_program, listing_channel
+from app.utils.projection import (
+    ProgramProjection,
+    ProjectionParam,
+    etag_parts,
+    project,
+)
+from app.utils.serialization import json_response
+from app.utils.server_timing import phase
 
 router = APIRouter()
 
 
-class ChannelInfo(BaseModel):
-    id: str
-    name: str
-    icon: str
-    slug: str
-    lcn: str
-    group: str
-
-
-def program_overlaps_date(
-    program: Dict[str, Any], date_str: str, target_timezone: pytz.tzinfo.BaseTzInfo
-) -> bool:
-    def parse_datetime(dt_string: str) -> datetime:
-        dt = datetime.fromisoformat(dt_string.replace("Z", "+00:00"))
-        return dt.astimezone(pytz.utc) if dt.tzinfo is None else dt
-
-    start = parse_datetime(program["start_time"])
-    end = parse_datetime(program["end_time"])
-    date = datetime.strptime(date_str, "%Y-%m-%d")
-    date_start = target_timezone.localize(
-        date.replace(hour=0, minute=0, second=0, microsecond=0)
-    )
-    date_end = target_timezone.localize(
-        date.replace(hour=23, minute=59, second=59, microsecond=999999)
-    )
-
-    return (
-        start.astimezone(target_timezone) <= date_end
-        and end.astimezone(target_timezone) >= date_start
-    )
-
-
-def get_all_channels(channels_data: List[Dict[str, Any]]) -> List[str]:
-    return [channel["channel_slug"] for channel in channels_data]
-
-
-def parse_datetime(datetime_str: str, timezone: pytz.tzinfo.BaseTzInfo) -> datetime:
-    dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
-    return dt.astimezone(timezone)
+def seconds_until_midnight(
+    timezone: pytz.tzinfo.BaseTzInfo, now: datetime
+) -> int:
+    """Return the number of seconds from ``now`` until the next local midnight."""
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return int((timezone.localize(tomorrow) - now).total_seconds())
 
 
-def is_sports_program(program: Dict[str, Any]) -> bool:
-    if "categories" in program:
-        categories = " ".join(cat.lower() for cat in program["categories"])
+def is_sports_program(program_categories: Optional[List[str]]) -> bool:
+    if program_categories is not None:
+        categories = " ".join(cat.lower() for cat in program_categories)
         sports_keywords = [
             "sports",
             "sport",
@@ -79,9 +57,9 @@ def is_sports_program(program: Dict[str, Any]) -> bool:
     return False
 
 
-def is_movies_program(program: Dict[str, Any]) -> bool:
-    if "categories" in program:
-        categories = " ".join(cat.lower() for cat in program["categories"])
+def is_movies_program(program_categories: Optional[List[str]]) -> bool:
+    if program_categories is not None:
+        categories = " ".join(cat.lower() for cat in program_categories)
         movies_keywords = [
             "movie",
         ]
@@ -91,6 +69,7 @@ def is_movies_program(program: Dict[str, Any]) -> bool:
 
 @router.get(
     "/py/epg/channels/{id}/{channel}",
+    response_model=Dict[str, Any],
     summary="Get Programming by Channel",
     description="Retrieve electronic program guide data for a specific channel, grouped by date.",
     response_description="Programming data grouped by date",
@@ -122,11 +101,15 @@ def is_movies_program(program: Dict[str, Any]) -> bool:
                 }
             }
         },
+        304: {"description": "Programming has not changed since the given ETag"},
         400: {"description": "Invalid timezone or request parameters"},
         404: {"description": "Channel or programming data not found"}
     }
 )
 async def get_programming_by_channel(
+    request: Request,
+    response: Response,
+    projection: ProjectionParam,
     id: str = Path(..., description="Source identifier", example="xmltvnet"),
     channel: str = Path(..., description="Channel slug identifier", example="channel-1"),
     timezone: str = Query(
@@ -134,7 +117,7 @@ async def get_programming_by_channel(
         description="Timezone for adjusting program times (e.g., 'Australia/Sydney', 'UTC')",
         example="Australia/Sydney"
     ),
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get programming schedule for a specific channel.
     
@@ -152,8 +135,7 @@ async def get_programming_by_channel(
     ```
     """
     try:
-        programs_data = load_json(f"{id}_programs.json")
-        channels_data = load_json(f"{id}_channels.json")
+        source_data = await source_store.aget(id, "timelines")
     except FileNotFoundError as err:
         raise SourceNotFoundError(id) from err
     except Exception as err:
@@ -165,32 +147,54 @@ async def get_programming_by_channel(
     except pytz.exceptions.UnknownTimeZoneError as err:
         raise InvalidTimezoneError(timezone) from err
 
-    channel_metadata = next(
-        (ch for ch in channels_data if ch.get("channel_slug") == channel), None
-    )
-    filtered_programming = [
-        program for program in programs_data if program.get("channel") == channel
-    ]
+    # A channel that no longer exists is a 404 even for a stale ETag
+    channel_metadata = source_data.channels_by_slug.get(channel)
+    timeline = source_data.timelines.get(channel)
 
-    if not filtered_programming or not channel_metadata:
+    if timeline is None or not len(timeline.positions) or not channel_metadata:
         raise ProgrammingNotFoundError(
             f"No programming or channel metadata found for channel: {channel}"
         )
 
-    adjusted_programming = adjust_programming(filtered_programming, target_timezone)
-    grouped_programs = group_and_fill_programs(adjusted_programming, target_timezone)
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            "epg/channels",
+            id,
+            channel,
+            target_timezone.zone,
+            *etag_parts(projection),
+        ),
+        max_age=seconds_until_next_ingest(id, source_data.modified),
+    )
+    if not_modified is not None:
+        return not_modified
 
-    return {
-        "date_pulled": datetime.now(tz.utc).isoformat(),
-        "query": "epg/channels",
-        "source": id,
-        "channel": channel_metadata,
-        "programs": dict(grouped_programs),
-    }
+    with phase("fill"):
+        grouped_programs = build_channel_schedule(
+            timeline.in_source_order(), target_timezone, channel
+        )
+
+    return json_response(
+        {
+            "date_pulled": datetime.now(tz.utc).isoformat(),
+            "query": "epg/channels",
+            "source": id,
+            "channel": channel_metadata,
+            "programs": {
+                day: project(programs, projection)
+                for day, programs in grouped_programs.items()
+            },
+        },
+        response,
+    )
 
 
 @router.get(
     "/py/epg/date/{date}/{source}",
+    response_model=Dict[str, Any],
     summary="Get Programming by Date",
     description="Retrieve programming schedule for all channels on a specific date.",
     response_description="Programming data for all channels on the specified date",
@@ -218,11 +222,15 @@ async def get_programming_by_channel(
                 }
             }
         },
+        304: {"description": "Programming has not changed since the given ETag"},
         400: {"description": "Invalid date format or timezone"},
         404: {"description": "No programming found for the specified date"}
     }
 )
 async def get_programming_by_date(
+    request: Request,
+    response: Response,
+    projection: ProjectionParam,
     date: str = Path(
         ...,
         description="Date in YYYYMMDD format (e.g., 20240115)",
@@ -235,7 +243,7 @@ async def get_programming_by_date(
         description="Timezone for adjusting program times",
         example="Australia/Sydney"
     ),
-) -> Dict[str, Any]:
+) -> Response:
     """
     Get programming schedule for all channels on a specific date.
     
@@ -258,8 +266,7 @@ async def get_programming_by_date(
         raise InvalidDateFormatError(date) from err
 
     try:
-        programs_data = load_json(f"{source}_programs.json")
-        channels_data = load_json(f"{source}_channels.json")
+        source_data = await source_store.aget(source, "timelines")
     except FileNotFoundError as err:
         raise SourceNotFoundError(source) from err
     except Exception as err:
@@ -271,263 +278,255 @@ async def get_programming_by_date(
     except pytz.exceptions.UnknownTimeZoneError as err:
         raise InvalidTimezoneError(timezone) from err
 
-    all_channels = get_all_channels(channels_data)
-    adjusted_programming = adjust_programming(programs_data, target_timezone)
-    grouped_programs = group_and_fill_programschannels(
-        adjusted_programming, target_timezone, all_channels
-    )
-
     selected_date_str = selected_date.strftime("%Y-%m-%d")
 
-    if selected_date_str not in grouped_programs:
-        raise ProgrammingNotFoundError(
-            f"No programming found for date: {selected_date_str}"
-        )
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            "epg/date",
+            source,
+            selected_date_str,
+            target_timezone.zone,
+            *etag_parts(projection),
+        ),
+        max_age=seconds_until_next_ingest(source, source_data.modified),
+    )
+    if not_modified is not None:
+        return not_modified
 
-    channels_list = []
-    for channel_slug, programs in grouped_programs[selected_date_str].items():
-        channel_info = next(
-            (c for c in channels_data if c["channel_slug"] == channel_slug), None
-        )
-        if channel_info:
-            channels_list.append(
-                {
-                    "channel": {
-                        "id": channel_info["channel_id"],
-                        "name": channel_info["channel_names"],
-                        "icon": channel_info["channel_logo"],
-                        "slug": channel_info["channel_slug"],
-                        "lcn": channel_info["channel_number"],
-                    },
-                    "programs": programs,
-                }
-            )
+    channels_list = await day_grid_cache.aget(
+        source_data, target_timezone, selected_date_str
+    )
 
     if not channels_list:
         raise ProgrammingNotFoundError(
             f"No programming found for date: {selected_date_str}"
         )
 
-    return {
-        "date_pulled": datetime.now(tz.utc).isoformat(),
-        "query": "epg/date",
-        "source": source,
-        "date": selected_date_str,
-        "channels": channels_list,
-    }
-
+    if projection is not None:
+        # Cached grids are shared; wrap their program lists instead
+        channels_list = [
+            {**entry, "programs": project(entry["programs"], projection)}
+            for entry in channels_list
+        ]
 
-def process_sports_program(
-    program: Dict[str, Any],
-    channel_info: Dict[str, Any],
-    target_timezone: pytz.tzinfo.BaseTzInfo,
-) -> Dict[str, Any]:
-    program_start = parse_datetime(program["start_time"], target_timezone)
-    program_end = parse_datetime(program["end_time"], target_timezone)
-    program_date = program_start.date().isoformat()
-
-    return {
-        "date": program_date,
-        "program_info": {
-            "title": program["title"],
-            "start": program_start.isoformat(),
-            "end": program_end.isoformat(),
-            "description": program.get("description", ""),
-            "categories": program.get("categories", []),
-            "subtitle": program.get("subtitle", ""),
-            "episode": program.get("episode", ""),
-            "original_air_date": program.get("original_air_date", ""),
-            "rating": program.get("rating", ""),
+    return json_response(
+        {
+            "date_pulled": datetime.now(tz.utc).isoformat(),
+            "query": "epg/date",
+            "source": source,
+            "date": selected_date_str,
+            "channels": channels_list,
         },
-    }
+        response,
+    )
 
 
-@router.get("/py/epg/sports/{source}")
-async def get_sports_programming(
+def _programs_by_channel_and_day(
+    source_data: SourceData,
+    categories: List[str],
+    start_date: datetime,
+    end_date: datetime,
+    target_timezone: pytz.tzinfo.BaseTzInfo,
+) -> Dict[str, DefaultDict[str, List[Dict[str, Any]]]]:
+    # Only visit programs indexed under a matching category inside the window
+    programs_data = source_data.programs
+    channels_by_slug = source_data.channels_by_slug
+    listed_programs: DefaultDict[str, DefaultDict[str, List[Dict[str, Any]]]] = (
+        defaultdict(lambda: defaultdict(list))
+    )
+    positions = source_data.category_index.positions(
+        categories, start_date.timestamp(), end_date.timestamp()
+    )
+    for position in positions:
+        program = programs_data[position]
+        if channels_by_slug.get(program["channel"]):
+            program_info = format_program(program, target_timezone)
+            # The local date leads the ISO start time
+            day = program_info["start"][:10]
+            listed_programs[program["channel"]][day].append(program_info)
+    return listed_programs
+
+
+async def _category_listing(
+    request: Request,
+    response: Response,
     source: str,
-    days: int = Query(7, description="Number of days to look ahead"),
-    timezone: str = Query("UTC", description="Timezone for adjusting program times"),
-) -> Dict[str, Any]:
+    query: str,
+    select_categories: Callable[[CategoryIndex], List[str]],
+    days: int,
+    timezone: str,
+    projection: Optional[ProgramProjection],
+    category: Optional[str] = None,
+) -> Response:
+    """
+    Build a category listing: upcoming programs grouped by channel and date.
+
+    Args:
+        request: Incoming request, for conditional headers
+        response: Injected response receiving the cache headers
+        source: Source identifier
+        query: Query name for the response and ETag, e.g. ``epg/sports``
+        select_categories: Returns the normalized categories to list
+        days: Number of days to look ahead from local midnight
+        timezone: Requested timezone name
+        projection: Program fields to return, or None for all
+        category: Requested category, for the generic category endpoint
+
+    Returns:
+        The listing, or a 304 response when the client's copy is current
+    """
     try:
-        programs_data = load_json(f"{source}_programs.json")
-        channels_data = load_json(f"{source}_channels.json")
+        source_data = await source_store.aget(source, "category_index")
     except FileNotFoundError as err:
         raise SourceNotFoundError(source) from err
     except Exception as err:
         from app.exceptions import DataProcessingError
         raise DataProcessingError("loading source data", str(err)) from err
 
+    categories = select_categories(source_data.category_index)
+
     try:
         target_timezone = pytz.timezone(timezone)
     except pytz.exceptions.UnknownTimeZoneError as err:
         raise InvalidTimezoneError(timezone) from err
 
-    start_date = datetime.now(target_timezone).replace(
-        hour=0, minute=0, second=0, microsecond=0
-    )
+    now = datetime.now(target_timezone)
+    start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = start_date + timedelta(days=days)
 
-    sports_programs: DefaultDict[str, DefaultDict[str, List[Dict[str, Any]]]] = (
-        defaultdict(lambda: defaultdict(list))
+    # The window starts at local midnight, so the response changes daily
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            query,
+            source,
+            *categories,
+            days,
+            target_timezone.zone,
+            start_date.isoformat(),
+            *etag_parts(projection),
+        ),
+        max_age=min(
+            seconds_until_next_ingest(source, source_data.modified),
+            seconds_until_midnight(target_timezone, now),
+        ),
     )
+    if not_modified is not None:
+        return not_modified
+
+    with phase("filter"):
+        listed_programs = _programs_by_channel_and_day(
+            source_data, categories, start_date, end_date, target_timezone
+        )
 
-    for program in programs_data:
-        if start_date <= parse_datetime(
-            program["start_time"], target_timezone
-        ) < end_date and is_sports_program(program):
-            channel_info = next(
-                (c for c in channels_data if c["channel_slug"] == program["channel"]),
-                None,
-            )
-            if channel_info:
-                processed_program = process_sports_program(
-                    program, channel_info, target_timezone
-                )
-                sports_programs[program["channel"]][processed_program["date"]].append(
-                    processed_program["program_info"]
-                )
-
-    if not sports_programs:
+    if not listed_programs:
+        label = category if category is not None else query.split("/")[-1]
         raise ProgrammingNotFoundError(
-            f"No sports programming found for the next {days} days"
+            f"No {label} programming found for the next {days} days"
         )
 
     formatted_response: Dict[str, Any] = {
         "date_pulled": datetime.now(tz.utc).isoformat(),
-        "query": "epg/sports",
+        "query": query,
         "source": source,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "timezone": timezone,
-        "channels": [],  # Explicitly define as a list
     }
+    if category is not None:
+        formatted_response["category"] = category
+    formatted_response.update(
+        {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "timezone": target_timezone.zone,
+            "channels": [],  # Explicitly define as a list
+        }
+    )
 
-    for channel_slug, programs_by_day in sports_programs.items():
-        channel_info = next(
-            (c for c in channels_data if c["channel_slug"] == channel_slug), None
-        )
-        if channel_info:
-            channel_data = {
-                "channel": {
-                    "id": channel_info["channel_id"],
-                    "name": channel_info["channel_name"],
-                    "icon": channel_info["channel_logo"],
-                    "slug": channel_info["channel_slug"],
-                    "lcn": channel_info["channel_number"],
-                    "group": channel_info["channel_group"],
-                },
-                "programs": dict(
-                    programs_by_day
-                ),  # Convert defaultdict to regular dict
-            }
-            formatted_response["channels"].append(channel_data)
+    for channel_slug, programs_by_day in listed_programs.items():
+        channel_info = source_data.channels_by_slug[channel_slug]
+        channel_data = {
+            "channel": listing_channel(channel_info),
+            "programs": {
+                day: project(programs, projection)
+                for day, programs in programs_by_day.items()
+            },
+        }
+        formatted_response["channels"].append(channel_data)
 
-    return formatted_response
+    return json_response(formatted_response, response)
 
 
-def process_movies_program(
-    program: Dict[str, Any],
-    channel_info: Dict[str, Any],
-    target_timezone: pytz.tzinfo.BaseTzInfo,
-) -> Dict[str, Any]:
-    program_start = parse_datetime(program["start_time"], target_timezone)
-    program_end = parse_datetime(program["end_time"], target_timezone)
-    program_date = program_start.date().isoformat()
-
-    return {
-        "date": program_date,
-        "program_info": {
-            "title": program["title"],
-            "start": program_start.isoformat(),
-            "end": program_end.isoformat(),
-            "description": program.get("description", ""),
-            "categories": program.get("categories", []),
-            "subtitle": program.get("subtitle", ""),
-            "episode": program.get("episode", ""),
-            "original_air_date": program.get("original_air_date", ""),
-            "rating": program.get("rating", ""),
-        },
-    }
+@router.get("/py/epg/sports/{source}", response_model=Dict[str, Any])
+async def get_sports_programming(
+    request: Request,
+    response: Response,
+    source: str,
+    projection: ProjectionParam,
+    days: int = Query(7, description="Number of days to look ahead"),
+    timezone: str = Query("UTC", description="Timezone for adjusting program times"),
+) -> Response:
+    return await _category_listing(
+        request,
+        response,
+        source,
+        "epg/sports",
+        lambda index: index.matching(lambda category: is_sports_program([category])),
+        days,
+        timezone,
+        projection,
+    )
 
 
-@router.get("/py/epg/movies/{source}")
+@router.get("/py/epg/movies/{source}", response_model=Dict[str, Any])
 async def get_movies_programming(
+    request: Request,
+    response: Response,
     source: str,
+    projection: ProjectionParam,
     days: int = Query(7, description="Number of days to look ahead"),
     timezone: str = Query("UTC", description="Timezone for adjusting program times"),
-) -> Dict[str, Any]:
-    try:
-        programs_data = load_json(f"{source}_programs.json")
-        channels_data = load_json(f"{source}_channels.json")
-    except FileNotFoundError as err:
-        raise SourceNotFoundError(source) from err
-    except Exception as err:
-        from app.exceptions import DataProcessingError
-        raise DataProcessingError("loading source data", str(err)) from err
-
-    try:
-        target_timezone = pytz.timezone(timezone)
-    except pytz.exceptions.UnknownTimeZoneError as err:
-        raise InvalidTimezoneError(timezone) from err
-
-    start_date = datetime.now(target_timezone).replace(
-        hour=0, minute=0, second=0, microsecond=0
-    )
-    end_date = start_date + timedelta(days=days)
-
-    movies_programs: DefaultDict[str, DefaultDict[str, List[Dict[str, Any]]]] = (
-        defaultdict(lambda: defaultdict(list))
+) -> Response:
+    return await _category_listing(
+        request,
+        response,
+        source,
+        "epg/movies",
+        lambda index: index.matching(lambda category: is_movies_program([category])),
+        days,
+        timezone,
+        projection,
     )
 
-    for program in programs_data:
-        if start_date <= parse_datetime(
-            program["start_time"], target_timezone
-        ) < end_date and is_movies_program(program):
-            channel_info = next(
-                (c for c in channels_data if c["channel_slug"] == program["channel"]),
-                None,
-            )
-            if channel_info:
-                processed_program = process_movies_program(
-                    program, channel_info, target_timezone
-                )
-                movies_programs[program["channel"]][processed_program["date"]].append(
-                    processed_program["program_info"]
-                )
-
-    if not movies_programs:
-        raise ProgrammingNotFoundError(
-            f"No movies programming found for the next {days} days"
-        )
 
-    formatted_response: Dict[str, Any] = {
-        "date_pulled": datetime.now(tz.utc).isoformat(),
-        "query": "epg/movies",
-        "source": source,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "timezone": timezone,
-        "channels": [],  # Explicitly define as a list
-    }
-
-    for channel_slug, programs_by_day in movies_programs.items():
-        channel_info = next(
-            (c for c in channels_data if c["channel_slug"] == channel_slug), None
-        )
-        if channel_info:
-            channel_data = {
-                "channel": {
-                    "id": channel_info["channel_id"],
-                    "name": channel_info["channel_name"],
-                    "icon": channel_info["channel_logo"],
-                    "slug": channel_info["channel_slug"],
-                    "lcn": channel_info["channel_number"],
-                    "group": channel_info["channel_group"],
-                },
-                "programs": dict(
-                    programs_by_day
-                ),  # Convert defaultdict to regular dict
-            }
-            formatted_response["channels"].append(channel_data)
+@router.get("/py/epg/category/{source}/{category}", response_model=Dict[str, Any])
+async def get_category_programming(
+    request: Request,
+    response: Response,
+    source: str,
+    category: str,
+    projection: ProjectionParam,
+    days: int = Query(7, description="Number of days to look ahead"),
+    timezone: str = Query("UTC", description="Timezone for adjusting program times"),
+) -> Response:
+    """
+    Get upcoming programs in a category, grouped by channel and date.
 
-    return formatted_response
+    The category is matched case-insensitively against whole program
+    categories, ignoring differences in whitespace.
+    """
+    normalized_category = normalize_category(category)
+    return await _category_listing(
+        request,
+        response,
+        source,
+        "epg/category",
+        lambda index: [normalized_category],
+        days,
+        timezone,
+        projection,
+        category=category,
+    )
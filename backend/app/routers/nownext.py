@@ -1,12 +1,37 @@
+import asyncio
+import json
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Annotated, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import pytz
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.exceptions import InvalidTimezoneError, SourceNotFoundError
-from app.utils.file_operations import load_json
+from app.exceptions import (
+    ConfigurationError,
+    InvalidSourceSelectionError,
+    InvalidTimezoneError,
+    SourceNotFoundError,
+)
+from app.services.schedule_index import ChannelTimeline
+from app.services.source_store import SourceData, source_store
+from app.utils.file_operations import load_configured_sources
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
+)
+from app.utils.projection import (
+    ProgramProjection,
+    ProjectionParam,
+    etag_parts,
+    project,
+)
+from app.utils.serialization import dumps, json_response
+from app.utils.server_timing import phase
+from app.utils.time_utils import resolve_instant
 
 router = APIRouter()
 
@@ -45,96 +70,338 @@ class NowNextResponse(BaseModel):
     data: List[ChannelPrograms]
 
 
+ChannelKey = Tuple[str, str]
+
+
+def unique_channels(
+    channels_data: List[Dict[str, Any]],
+) -> Dict[ChannelKey, Dict[str, Any]]:
+    """Deduplicate channels based on unique (channel_id, channel_number) pairs."""
+    return {
+        (channel["channel_id"], channel["channel_number"]): channel
+        for channel in channels_data
+    }
+
+
+def transition_state(
+    source_data: SourceData, at_epoch: float, live: bool
+) -> Tuple[int, int]:
+    """
+    Return the transition index of an instant and how long a response stays valid.
+
+    Now/next answers only change when a program starts or ends, so the
+    response is valid until the next transition after the requested instant.
+    Responses for an explicit instant never change before the next ingest.
+    """
+    transition_times = source_data.transition_times
+    transition_idx = bisect_right(transition_times, at_epoch)
+    max_age = seconds_until_next_ingest(source_data.source, source_data.modified)
+    if live and transition_idx < len(transition_times):
+        max_age = min(max_age, int(transition_times[transition_idx] - at_epoch))
+    return transition_idx, max_age
+
+
+def channel_now_next(
+    channel: Dict[str, Any],
+    timelines: Dict[str, ChannelTimeline],
+    at_epoch: float,
+    target_timezone: pytz.tzinfo.BaseTzInfo,
+) -> ChannelPrograms:
+    """Build a channel's now/next entry at an instant."""
+    timeline = timelines.get(channel["channel_slug"])
+    current_program, next_program = (
+        timeline.now_next(at_epoch) if timeline else (None, None)
+    )
+
+    return ChannelPrograms(
+        channel=ChannelInfo(
+            id=channel["channel_id"],
+            name=channel["channel_names"],
+            icon=channel["channel_logo"],
+            slug=channel["channel_slug"],
+            lcn=channel["channel_number"],
+            group=channel["channel_group"],
+        ),
+        currentProgram=format_program(current_program, target_timezone)
+        if current_program
+        else None,
+        nextProgram=format_program(next_program, target_timezone)
+        if next_program
+        else None,
+    )
+
+
+def project_entry(
+    entry: Dict[str, Any], projection: Optional[ProgramProjection]
+) -> Dict[str, Any]:
+    """Wrap the programs of a dumped now/next entry for projection."""
+    if projection is not None:
+        entry["currentProgram"] = project(entry["currentProgram"], projection)
+        entry["nextProgram"] = project(entry["nextProgram"], projection)
+    return entry
+
+
+def select_sources(
+    sources: Optional[List[str]], group: Optional[str], subgroup: Optional[str]
+) -> List[str]:
+    """
+    Resolve the sources named explicitly and those in a configured group.
+
+    Raises:
+        ConfigurationError: If the sources configuration can't be read
+        InvalidSourceSelectionError: If nothing was selected
+    """
+    selected = [
+        name.strip()
+        for value in sources or []
+        for name in value.split(",")
+        if name.strip()
+    ]
+    if group is not None or subgroup is not None:
+        try:
+            configured = load_configured_sources()
+        except (FileNotFoundError, json.JSONDecodeError) as err:
+            raise ConfigurationError("XMLTV sources file not found or invalid") from err
+        selected.extend(
+            source["id"]
+            for source in configured
+            if (group is None or source.get("group") == group)
+            and (subgroup is None or source.get("subgroup") == subgroup)
+        )
+
+    if not selected:
+        raise InvalidSourceSelectionError(
+            "No sources selected; pass sources, or a group or subgroup with sources"
+        )
+    return list(dict.fromkeys(selected))
+
+
+def stream_nownext(
+    loaded: List[SourceData],
+    missing: List[str],
+    now: datetime,
+    target_timezone: pytz.tzinfo.BaseTzInfo,
+    projection: Optional[ProgramProjection] = None,
+) -> Iterator[bytes]:
+    """Encode a multi-source now/next document, one source per chunk."""
+    at_epoch = now.timestamp()
+    header = {
+        "date": now.isoformat(),
+        "query": "nownext",
+        "sources": [source_data.source for source_data in loaded],
+        "missing": missing,
+    }
+    # Open the header object and its data array; entries follow per source
+    yield dumps(header)[:-1] + b',"data":['
+
+    seen: Set[ChannelKey] = set()
+    first = True
+    for source_data in loaded:
+        timelines = source_data.timelines
+        entries = []
+        for key, channel in unique_channels(source_data.channels).items():
+            if key in seen:
+                continue
+            seen.add(key)
+            entry = {"source": source_data.source}
+            entry.update(
+                channel_now_next(
+                    channel, timelines, at_epoch, target_timezone
+                ).model_dump()
+            )
+            entries.append(dumps(project_entry(entry, projection)))
+        if entries:
+            yield (b"" if first else b",") + b",".join(entries)
+            first = False
+
+    yield b"]}"
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    summary="Get Now/Next Across Sources",
+    responses={
+        200: {
+            "description": "NowNextResponse-shaped document with data from every "
+            "source, each entry tagged with its source",
+            "content": {"application/json": {}},
+        },
+        304: {"description": "Now/next has not changed since the given ETag"},
+    },
+)
+async def get_nownext_multi(
+    request: Request,
+    response: Response,
+    projection: ProjectionParam,
+    sources: Annotated[
+        Optional[List[str]],
+        Query(description="Source ids; repeat the parameter or separate with commas"),
+    ] = None,
+    group: Optional[str] = Query(
+        default=None, description="Add every configured source in this group"
+    ),
+    subgroup: Optional[str] = Query(
+        default=None, description="Add every configured source in this subgroup"
+    ),
+    timezone: str = Query(default="UTC", description="Timezone for date conversion"),
+    at: Annotated[
+        Optional[datetime],
+        Query(
+            description="ISO 8601 instant to report now/next for (default: current time, naive values are UTC)",
+        ),
+    ] = None,
+) -> Response:
+    """
+    Report now/next for several sources in one response.
+
+    Sources are answered in the order given, then in configuration order for
+    a group or subgroup. A channel that appears in more than one source,
+    matched on (channel_id, channel_number), is reported for the first
+    source only. Selected sources without data files are listed under
+    ``missing``. The body is streamed one source at a time.
+    """
+    selected = select_sources(sources, group, subgroup)
+
+    try:
+        target_timezone = pytz.timezone(timezone)
+    except pytz.UnknownTimeZoneError as err:
+        raise InvalidTimezoneError(timezone) from err
+
+    now = resolve_instant(at, target_timezone)
+    at_epoch = now.timestamp()
+
+    # Load concurrently, so cold sources cost the slowest load, not the sum
+    results = await asyncio.gather(
+        *(
+            source_store.aget(source, "timelines", "transition_times")
+            for source in selected
+        ),
+        return_exceptions=True,
+    )
+    loaded: List[SourceData] = []
+    missing: List[str] = []
+    for source, result in zip(selected, results, strict=True):
+        if isinstance(result, FileNotFoundError):
+            missing.append(source)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            loaded.append(result)
+    if not loaded:
+        raise SourceNotFoundError(", ".join(missing))
+
+    source_etag_parts: List[Any] = [target_timezone.zone]
+    max_age: Optional[int] = None
+    for source_data in loaded:
+        transition_idx, source_max_age = transition_state(
+            source_data, at_epoch, at is None
+        )
+        source_etag_parts.extend(
+            (source_data.source, source_data.version, transition_idx)
+        )
+        max_age = source_max_age if max_age is None else min(max_age, source_max_age)
+
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            "nownext-multi",
+            *source_etag_parts,
+            *missing,
+            *etag_parts(projection),
+        ),
+        max_age=max_age,  # type: ignore[arg-type]
+    )
+    if not_modified is not None:
+        return not_modified
+
+    return StreamingResponse(
+        stream_nownext(loaded, missing, now, target_timezone, projection),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
+
 @router.get("/{source}", response_model=NowNextResponse)
 async def get_nownext(
+    request: Request,
+    response: Response,
     source: str,
+    projection: ProjectionParam,
     timezone: str = Query(default="UTC", description="Timezone for date conversion"),
-) -> NowNextResponse:
+    at: Annotated[
+        Optional[datetime],
+        Query(
+            description="ISO 8601 instant to report now/next for (default: current time, naive values are UTC)",
+        ),
+    ] = None,
+) -> Union[NowNextResponse, Response]:
     # Load the programs and channels files for the source
     try:
-        programs_data = load_json(f"{source}_programs.json")
-        channels_data = load_json(f"{source}_channels.json")
+        source_data = await source_store.aget(
+            source, "timelines", "transition_times"
+        )
     except FileNotFoundError as err:
         raise SourceNotFoundError(source) from err
 
+    channels_data = source_data.channels
+
     # Handle timezone conversion
     try:
         target_timezone = pytz.timezone(timezone)
     except pytz.UnknownTimeZoneError as err:
         raise InvalidTimezoneError(timezone) from err
 
-    # Get the current time in the target timezone
-    now = datetime.now(target_timezone)
-
-    # Deduplicate channels based on unique (channel_id, channel_number) pairs
-    unique_channels = {
-        (channel["channel_id"], channel["channel_number"]): channel
-        for channel in channels_data
-    }
+    # Resolve the requested instant (default: now) in the target timezone
+    now = resolve_instant(at, target_timezone)
+    at_epoch = now.timestamp()
+    timelines = source_data.timelines
 
-    # Helper to find current and next programs
-    def find_now_next(programs: List[Dict[str, Any]]) -> tuple[Dict[str, Any] | None, Dict[str, Any] | None]:
-        current, next_program = None, None
-        for idx, program in enumerate(programs):
-            start = datetime.fromisoformat(program["start_time"]).astimezone(
-                target_timezone
-            )
-            end = datetime.fromisoformat(program["end_time"]).astimezone(
-                target_timezone
-            )
+    transition_idx, max_age = transition_state(source_data, at_epoch, at is None)
 
-            if start <= now < end:
-                current = program
-                next_program = next(
-                    (
-                        p
-                        for p in programs[idx + 1 :]
-                        if datetime.fromisoformat(p["start_time"]).astimezone(
-                            target_timezone
-                        )
-                        >= end
-                    ),
-                    None,
-                )
-                break
-            elif start > now and not current:
-                next_program = program
-                break
-        return current, next_program
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            "nownext",
+            source,
+            target_timezone.zone,
+            transition_idx,
+            *etag_parts(projection),
+        ),
+        max_age=max_age,
+    )
+    if not_modified is not None:
+        return not_modified
 
     # Process each channel and attach now/next programs
-    nownext_data = []
-    for channel in unique_channels.values():
-        channel_slug = channel["channel_slug"]
-        channel_programs = sorted(
-            (p for p in programs_data if p["channel"] == channel_slug),
-            key=lambda x: datetime.fromisoformat(x["start_time"]),
-        )
-        current_program, next_program = find_now_next(channel_programs)
-
-        nownext_data.append(
-            ChannelPrograms(
-                channel=ChannelInfo(
-                    id=channel["channel_id"],
-                    name=channel["channel_names"],
-                    icon=channel["channel_logo"],
-                    slug=channel["channel_slug"],
-                    lcn=channel["channel_number"],
-                    group=channel["channel_group"],
-                ),
-                currentProgram=format_program(current_program, target_timezone)
-                if current_program
-                else None,
-                nextProgram=format_program(next_program, target_timezone)
-                if next_program
-                else None,
-            )
-        )
+    with phase("nownext"):
+        nownext_data = [
+            channel_now_next(channel, timelines, at_epoch, target_timezone)
+            for channel in unique_channels(channels_data).values()
+        ]
 
-    return NowNextResponse(
-        date=now.isoformat(), query="nownext", source=source, data=nownext_data
-    )
+    if projection is not None:
+        # Projected programs no longer match ProgramInfo; encode directly
+        return json_response(
+            {
+                "date": now.isoformat(),
+                "query": "nownext",
+                "source": source,
+                "data": [
+                    project_entry(entry.model_dump(), projection)
+                    for entry in nownext_data
+                ],
+            },
+            response,
+        )
 
+    with phase("validate"):
+        return NowNextResponse(
+            date=now.isoformat(), query="nownext", source=source, data=nownext_data
+        )
 
 
 def format_program(
@@ -0,0 +1,180 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from datetime import timezone as tz
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+
+import pytz
+from fastapi import APIRouter, Query, Request, Response
+
+from app.exceptions import (
+    InvalidSearchQueryError,
+    InvalidTimezoneError,
+    SourceNotFoundError,
+)
+from app.services.search_index import tokenize
+from app.services.source_store import source_store
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
+)
+from app.utils.program_format import format_program, listing_channel
+from app.utils.projection import (
+    ProjectionParam,
+    etag_parts,
+    project,
+)
+from app.utils.serialization import json_response
+from app.utils.server_timing import phase
+from app.utils.time_utils import resolve_instant
+
+router = APIRouter()
+
+# Same limit as the window endpoint; also keeps the window end representable
+MAX_SEARCH_DAYS = 7
+
+
+def window_transitions(
+    transition_times: List[float], start: float, end: float
+) -> Tuple[int, int, Optional[int]]:
+    """
+    Locate a sliding time window within a source's program transitions.
+
+    Results only change when a program start enters or leaves the window, so
+    the two indexes identify the results and the window can slide for the
+    returned number of seconds before they change.
+
+    Returns:
+        Tuple of (index of the first transition at or after ``start``, the
+        same for ``end``, seconds until either moves; None if neither will)
+    """
+    first_idx = bisect_left(transition_times, start)
+    last_idx = bisect_left(transition_times, end)
+    waits = []
+    if first_idx < len(transition_times):
+        waits.append(int(transition_times[first_idx] - start))
+    if last_idx < len(transition_times):
+        waits.append(int(transition_times[last_idx] - end))
+    return first_idx, last_idx, min(waits) if waits else None
+
+
+@router.get("/py/epg/search/{source}", response_model=Dict[str, Any])
+async def search_programming(
+    request: Request,
+    response: Response,
+    source: str,
+    projection: ProjectionParam,
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    days: int = Query(
+        7, ge=1, le=MAX_SEARCH_DAYS, description="Number of days to look ahead"
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of ranked results to skip"),
+    timezone: str = Query("UTC", description="Timezone for adjusting program times"),
+    at: Annotated[
+        Optional[datetime],
+        Query(
+            description="ISO 8601 instant the window starts at (default: current time, naive values are UTC)",
+        ),
+    ] = None,
+) -> Response:
+    """
+    Search upcoming program titles, subtitles and descriptions.
+
+    Returns programs starting within ``days`` of ``at`` that contain every
+    word of the query, ranked by where the words appear (title, then
+    subtitle, then description) and then by start time. ``total`` counts
+    every match in the window, before ``offset`` and ``limit`` are applied;
+    page through them by raising ``offset``.
+    """
+    try:
+        source_data = await source_store.aget(
+            source, "search_index", "transition_times"
+        )
+    except FileNotFoundError as err:
+        raise SourceNotFoundError(source) from err
+    except Exception as err:
+        from app.exceptions import DataProcessingError
+
+        raise DataProcessingError("loading source data", str(err)) from err
+
+    terms = list(dict.fromkeys(tokenize(q)))
+    if not terms:
+        raise InvalidSearchQueryError(q)
+
+    try:
+        target_timezone = pytz.timezone(timezone)
+    except pytz.exceptions.UnknownTimeZoneError as err:
+        raise InvalidTimezoneError(timezone) from err
+
+    window_start = resolve_instant(at, target_timezone)
+    window_end = window_start + timedelta(days=days)
+    start_epoch = window_start.timestamp()
+    end_epoch = window_end.timestamp()
+
+    first_idx, last_idx, changes_in = window_transitions(
+        source_data.transition_times, start_epoch, end_epoch
+    )
+    max_age = seconds_until_next_ingest(source, source_data.modified)
+    if at is None and changes_in is not None:
+        max_age = min(max_age, changes_in)
+
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            "epg/search",
+            source,
+            " ".join(terms),
+            days,
+            limit,
+            offset,
+            target_timezone.zone,
+            first_idx,
+            last_idx,
+            *etag_parts(projection),
+        ),
+        max_age=max_age,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    with phase("search"):
+        total, hits = source_data.search_index.search(
+            q, start_epoch, end_epoch, offset + limit
+        )
+
+    programs_data = source_data.programs
+    channels_by_slug = source_data.channels_by_slug
+    results = []
+    for hit in hits[offset:]:
+        program = programs_data[hit.position]
+        channel_info = channels_by_slug.get(program.get("channel"))
+        if not channel_info:
+            continue
+        results.append(
+            {
+                "channel": listing_channel(channel_info),
+                "program": project(
+                    format_program(program, target_timezone), projection
+                ),
+                "score": hit.score,
+            }
+        )
+
+    return json_response(
+        {
+            "date_pulled": datetime.now(tz.utc).isoformat(),
+            "query": "epg/search",
+            "source": source,
+            "q": q,
+            "start": window_start.isoformat(),
+            "end": window_end.isoformat(),
+            "timezone": target_timezone.zone,
+            "total": total,
+            "offset": offset,
+            "results": results,
+        },
+        response,
+    )
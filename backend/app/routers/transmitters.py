@@ -5,7 +5,7 @@ from pydantic import BaseModel
 
 from app.config import settings
 from app.exceptions import ConfigurationError, DataProcessingError, TransmitterDataError
-from app.utils.file_operations import load_sources
+from app.services.data_access import load_sources_async
 
 router = APIRouter()
 
@@ -491,7 +491,7 @@ async def _get_transmitters_nested(
         List of validated transmitter site objects with nested licences
     """
     try:
-        transmitter_sources = load_sources(data_path)
+        transmitter_sources = await load_sources_async(data_path)
 
         if not isinstance(transmitter_sources, list):
             raise TransmitterDataError("Transmitter data is not a list.")
@@ -555,7 +555,7 @@ async def _get_radio_transmitters_nested(
         List of validated radio transmitter site objects with nested am, fm, dr arrays
     """
     try:
-        transmitter_sources = load_sources(data_path)
+        transmitter_sources = await load_sources_async(data_path)
 
         if not isinstance(transmitter_sources, list):
             raise TransmitterDataError("Transmitter data is not a list.")
@@ -618,7 +618,7 @@ async def _get_transmitters(
         List of validated transmitter objects
     """
     try:
-        transmitter_sources = load_sources(data_path)
+        transmitter_sources = await load_sources_async(data_path)
 
         if not isinstance(transmitter_sources, list):
             raise TransmitterDataError("Transmitter data is not a list.")
@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta
+from datetime import timezone as tz
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+
+import pytz
+from fastapi import APIRouter, Query, Request, Response
+
+from app.exceptions import (
+    ChannelNotFoundError,
+    InvalidTimeWindowError,
+    InvalidTimezoneError,
+    SourceNotFoundError,
+)
+from app.services.source_store import SourceData, source_store
+from app.utils.grid_engine import fill_window, local_clock
+from app.utils.http_cache import (
+    build_etag,
+    conditional_response,
+    seconds_until_next_ingest,
+)
+from app.utils.program_format import grid_channel
+from app.utils.projection import (
+    ProjectionParam,
+    etag_parts,
+    project,
+)
+from app.utils.serialization import json_response
+from app.utils.server_timing import phase
+from app.utils.time_utils import resolve_instant
+
+router = APIRouter()
+
+DEFAULT_WINDOW = timedelta(hours=3)
+MAX_WINDOW = timedelta(days=7)
+
+
+def select_channels(source_data: SourceData, channels: Optional[str]) -> List[str]:
+    """
+    Resolve a comma-separated list of channel slugs.
+
+    Args:
+        source_data: Source the channels belong to
+        channels: Comma-separated slugs; None or empty selects every channel
+
+    Returns:
+        Channel slugs in the requested order, or in source order for all
+        channels
+
+    Raises:
+        ChannelNotFoundError: If a slug is not a channel of the source
+    """
+    if not channels:
+        return list(dict.fromkeys(c["channel_slug"] for c in source_data.channels))
+
+    slugs = list(dict.fromkeys(s.strip() for s in channels.split(",") if s.strip()))
+    for slug in slugs:
+        if slug not in source_data.channels_by_slug:
+            raise ChannelNotFoundError(slug)
+    return slugs
+
+
+def resolve_window(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    target_timezone: pytz.tzinfo.BaseTzInfo,
+) -> Tuple[datetime, datetime]:
+    """
+    Work out the window bounds, defaulting to the next three hours.
+
+    Bounds are truncated to whole seconds. Without ``start`` the window
+    begins at the start of the current minute, so clients polling "what's on
+    now" share one cacheable response.
+
+    Returns:
+        Tuple of (window start, window end) in the target timezone
+
+    Raises:
+        InvalidTimeWindowError: If the window is empty or longer than 7 days
+    """
+    if start is None:
+        window_start = resolve_instant(None, target_timezone).replace(
+            second=0, microsecond=0
+        )
+    else:
+        window_start = resolve_instant(start, target_timezone).replace(microsecond=0)
+    window_end = (
+        window_start + DEFAULT_WINDOW
+        if end is None
+        else resolve_instant(end, target_timezone).replace(microsecond=0)
+    )
+
+    if window_end <= window_start:
+        raise InvalidTimeWindowError("Window end must be after its start")
+    if window_end - window_start > MAX_WINDOW:
+        raise InvalidTimeWindowError(
+            f"Window must not be longer than {MAX_WINDOW.days} days"
+        )
+    return window_start, window_end
+
+
+def build_window(
+    source_data: SourceData,
+    slugs: List[str],
+    target_timezone: pytz.tzinfo.BaseTzInfo,
+    start: int,
+    end: int,
+) -> List[Dict[str, Any]]:
+    """
+    Build the clipped, gap-filled programming of channels within a window.
+
+    Args:
+        source_data: Source to read programs from
+        slugs: Channels to include, in output order
+        target_timezone: Timezone program times are expressed in
+        start: Window start, in UTC epoch seconds
+        end: Window end (exclusive), in UTC epoch seconds
+
+    Returns:
+        Channel entries with their programs
+    """
+    clock = local_clock(target_timezone)
+    timelines = source_data.timelines
+    channels_by_slug = source_data.channels_by_slug
+    channels_list = []
+    for slug in slugs:
+        channel_info = channels_by_slug.get(slug)
+        if not channel_info:
+            continue
+        timeline = timelines.get(slug)
+        entries = timeline.overlapping(start, end) if timeline else []
+        channels_list.append(
+            {
+                "channel": grid_channel(channel_info),
+                "programs": fill_window(entries, clock, start, end, slug),
+            }
+        )
+    return channels_list
+
+
+@router.get("/py/epg/window/{source}", response_model=Dict[str, Any])
+async def get_programming_window(
+    request: Request,
+    response: Response,
+    source: str,
+    projection: ProjectionParam,
+    start: Annotated[
+        Optional[datetime],
+        Query(
+            description="ISO 8601 window start (default: start of the current minute, naive values are UTC)",
+        ),
+    ] = None,
+    end: Annotated[
+        Optional[datetime],
+        Query(
+            description="ISO 8601 window end, exclusive (default: three hours after start)",
+        ),
+    ] = None,
+    channels: Optional[str] = Query(
+        default=None, description="Comma-separated channel slugs (default: all)"
+    ),
+    timezone: str = Query("UTC", description="Timezone for adjusting program times"),
+) -> Response:
+    """
+    Get the programming of a source within a time window.
+
+    Returns only the programs overlapping ``[start, end)``, clipped to the
+    window and gap-filled per channel like the day grid, which keeps a
+    scrolling "next few hours" view to a few kilobytes.
+    """
+    try:
+        source_data = await source_store.aget(source, "timelines")
+    except FileNotFoundError as err:
+        raise SourceNotFoundError(source) from err
+    except Exception as err:
+        from app.exceptions import DataProcessingError
+
+        raise DataProcessingError("loading source data", str(err)) from err
+
+    try:
+        target_timezone = pytz.timezone(timezone)
+    except pytz.exceptions.UnknownTimeZoneError as err:
+        raise InvalidTimezoneError(timezone) from err
+
+    window_start, window_end = resolve_window(start, end, target_timezone)
+    start_epoch = int(window_start.timestamp())
+    end_epoch = int(window_end.timestamp())
+    slugs = select_channels(source_data, channels)
+
+    max_age = seconds_until_next_ingest(source, source_data.modified)
+    if start is None:
+        max_age = min(max_age, 60 - datetime.now(tz.utc).second)
+
+    not_modified = conditional_response(
+        request,
+        response,
+        etag=build_etag(
+            source_data.version,
+            "epg/window",
+            source,
+            start_epoch,
+            end_epoch,
+            ",".join(slugs) if channels else "*",
+            target_timezone.zone,
+            *etag_parts(projection),
+        ),
+        max_age=max_age,
+    )
+    if not_modified is not None:
+        return not_modified
+
+    with phase("fill"):
+        channels_list = build_window(
+            source_data, slugs, target_timezone, start_epoch, end_epoch
+        )
+    for entry in channels_list:
+        entry["programs"] = project(entry["programs"], projection)
+
+    return json_response(
+        {
+            "date_pulled": datetime.now(tz.utc).isoformat(),
+            "query": "epg/window",
+            "source": source,
+            "start": window_start.isoformat(),
+            "end": window_end.isoformat(),
+            "timezone": target_timezone.zone,
+            "channels": channels_list,
+        },
+        response,
+    )
@@ -21,6 +21,8 @@ from app.exceptions import (
     UnauthorizedError,
     WebEPGException,
 )
+from app.services.ingest_hooks import after_source_ingest
+from app.utils.serialization import file_indent, read_json_file, write_json_file
 
 router = APIRouter()
 
@@ -509,8 +511,7 @@ async def get_guide_data(sql_in_clause: str) -> List[Dict[str, Any]]:
 
     if is_file_recent(GUIDE_DATA_FILE, hours=6):
         logging.info(f"Using existing guide data from {GUIDE_DATA_FILE}")
-        with open(GUIDE_DATA_FILE, "r") as f:
-            return json.load(f)
+        return read_json_file(Path(GUIDE_DATA_FILE))
 
     logging.info("Fetching fresh guide data from database")
     query1 = f"""SELECT guideid, progstart as start_time, null as start, progstop as end_time, null as end,
@@ -812,6 +813,7 @@ async def create_provider_program_files(  # noqa: C901
             logging.info(
                 f"Created {programs_file} with {len(unique_programs)} unique programs (deduplicated from {len(provider_programs)})"
             )
+            await after_source_ingest(f"xmlepg_{provid}")
 
             if first_program and last_program:
                 logging.info(f"Provider: {provid}")
@@ -830,15 +832,13 @@ async def create_provider_program_files(  # noqa: C901
 
 
 async def load_json_file(file_path: str) -> Any:
-    with open(file_path, "r") as f:
-        return json.load(f)
+    return read_json_file(Path(file_path))
 
 
 async def save_json_file(data: Any, file_path: str) -> None:
     try:
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w") as file:
-            json.dump(data, file, indent=2)
+        write_json_file(Path(file_path), data, indent=file_indent())
         logging.info(f"Successfully saved data to '{file_path}'")
     except Exception as e:
         logging.error(f"Error saving data to '{file_path}': {e}")
@@ -978,8 +978,7 @@ def count_programs_per_channel(guide_data: List[Dict[str, Any]]) -> Dict[str, in
 async def process_group_data(group_config: Dict[str, List[str]]) -> None:  # noqa: C901
     for group_name, channel_groups in group_config.items():
         # Filter channels
-        with open(FILTERED_CHANNEL_DATA_FILE, "r") as f:
-            all_channels = json.load(f)
+        all_channels = read_json_file(Path(FILTERED_CHANNEL_DATA_FILE))
 
         filtered_channels = [
             channel
@@ -1068,8 +1067,7 @@ async def process_group_data(group_config: Dict[str, List[str]]) -> None:  # noq
             updated_channels.append(updated_channel)
 
         # Filter and post-process programs
-        with open(GUIDE_DATA_FILE, "r") as f:
-            all_programs = json.load(f)
+        all_programs = read_json_file(Path(GUIDE_DATA_FILE))
 
         channel_slugs = {channel["channel_slug"] for channel in updated_channels}
         filtered_programs = []
@@ -1160,6 +1158,7 @@ async def process_group_data(group_config: Dict[str, List[str]]) -> None:  # noq
         
         await save_json_file(unique_programs, programs_file)
         logging.info(f"Created {programs_file} with {len(unique_programs)} unique programs (deduplicated from {len(filtered_programs)})")
+        await after_source_ingest(f"xmlepg_group_{group_name}")
 
         if first_program and last_program:
             logging.info(f"Group: {group_name}")
@@ -1256,6 +1255,7 @@ async def process_fta_data(
         
         await save_json_file(unique_programs, programs_file)
         logging.info(f"Created {programs_file} with {len(unique_programs)} unique programs (deduplicated from {len(filtered_programs)})")
+        await after_source_ingest("xmlepg_FTAALL")
 
         logging.info("Successfully processed FTA SQL provider")
         process_status["processed_sources"].append("FTAALL")
@@ -1610,6 +1610,7 @@ async def process_sql_provider(
             
             await save_json_file(unique_programs, programs_file)
             logging.info(f"Created {programs_file} with {len(unique_programs)} unique programs (deduplicated from {len(guide_rows)})")
+            await after_source_ingest(f"xmlepg_{provider['provid']}")
         except Exception as e:
             logging.error(f"SQL-provider run failed: {e}")
             process_status.setdefault("errors", []).append(str(e))
@@ -1792,6 +1793,7 @@ async def process_fta_sql_provider(
             
             await save_json_file(unique_programs, programs_file)
             logging.info(f"Created {programs_file} with {len(unique_programs)} unique programs (deduplicated from {len(filtered_programs)})")
+            await after_source_ingest("xmlepg_FTAALL")
 
         except Exception as e:
             logging.error(f"FTA-SQL provider run failed: {e}")
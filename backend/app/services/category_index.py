@@ -0,0 +1,93 @@
+"""Inverted index from program category to programs, bucketed by UTC day."""
+
+import math
+from typing import Any, Callable, Dict, Iterable, List, Sequence
+
+from app.utils.columnar import program_column, program_epochs
+from app.utils.grid_engine import SECONDS_PER_DAY
+
+Program = Dict[str, Any]
+
+
+def normalize_category(category: str) -> str:
+    """Lowercase a category and collapse runs of whitespace."""
+    return " ".join(category.lower().split())
+
+
+class CategoryIndex:
+    """
+    A source's programs keyed by normalized category and UTC start day.
+
+    Buckets hold positions into the source's program sequence in file order,
+    so lookups return programs in the order a full scan would visit them.
+    """
+
+    def __init__(self, programs: Sequence[Program]) -> None:
+        starts = program_epochs(programs, "start_time")
+        self.starts: List[float] = (
+            starts if isinstance(starts, list) else starts.tolist()
+        )
+        self._buckets: Dict[str, Dict[int, List[int]]] = {}
+
+        normalized: Dict[str, str] = {}
+        for position, categories in enumerate(program_column(programs, "categories")):
+            if not categories:
+                continue
+            day = math.floor(self.starts[position] / SECONDS_PER_DAY)
+            for category in categories:
+                if not isinstance(category, str):
+                    continue
+                key = normalized.get(category)
+                if key is None:
+                    key = normalized[category] = normalize_category(category)
+                bucket = self._buckets.setdefault(key, {}).setdefault(day, [])
+                # A program can list the same category more than once
+                if not bucket or bucket[-1] != position:
+                    bucket.append(position)
+
+    @property
+    def categories(self) -> List[str]:
+        """Every normalized category in the source."""
+        return list(self._buckets)
+
+    def matching(self, predicate: Callable[[str], bool]) -> List[str]:
+        """Return the normalized categories accepted by ``predicate``."""
+        return [category for category in self._buckets if predicate(category)]
+
+    def positions(
+        self, categories: Iterable[str], start: float, end: float
+    ) -> List[int]:
+        """
+        Find programs in any of the categories that start inside a window.
+
+        Args:
+            categories: Normalized categories to look up
+            start: Window start, in epoch seconds
+            end: Window end (exclusive), in epoch seconds
+
+        Returns:
+            Positions of programs with ``start <= start_time < end``, in
+            source file order and without duplicates
+        """
+        first_day = math.floor(start / SECONDS_PER_DAY)
+        last_day = math.floor(end / SECONDS_PER_DAY)
+        found = set()
+        for category in categories:
+            days = self._buckets.get(category)
+            if not days:
+                continue
+            if len(days) <= last_day - first_day:
+                buckets = [
+                    bucket
+                    for day, bucket in days.items()
+                    if first_day <= day <= last_day
+                ]
+            else:
+                buckets = [days.get(day, []) for day in range(first_day, last_day + 1)]
+            for bucket in buckets:
+                found.update(
+                    position
+                    for position in bucket
+                    if start <= self.starts[position] < end
+                )
+        return sorted(found)
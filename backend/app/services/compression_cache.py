@@ -0,0 +1,76 @@
+"""LRU cache of compressed response bodies, keyed by ETag."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+# (content coding, ETag, request path and query string)
+CompressedKey = Tuple[str, str, str]
+
+
+class CompressionCache:
+    """
+    Compressed bodies of responses that carry an ETag, evicted in LRU order.
+
+    Responses with the same ETag are interchangeable, so a repeated request
+    can be answered with the bytes compressed for the first one. The cache
+    is bounded by the total size of the bodies it holds.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._bodies: "OrderedDict[CompressedKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_entry_bytes(self) -> int:
+        """Largest body worth caching; bigger ones would flush the cache."""
+        return self.max_bytes // 8
+
+    def get(self, key: CompressedKey) -> Optional[bytes]:
+        """Return a cached body, or None on a miss."""
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._bodies.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: CompressedKey, body: bytes) -> None:
+        """Store a body, evicting the least recently used ones to make room."""
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._bodies.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._bodies[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._bodies.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the memory held by cached bodies."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "cached_bodies": len(self._bodies),
+                "cached_bytes": self._size,
+            }
+
+
+compression_cache = CompressionCache(
+    max_bytes=settings.COMPRESSION_CACHE_MB * 1024 * 1024
+)
@@ -0,0 +1,100 @@
+"""
+Executors that keep blocking work off the event loop.
+
+File reads and JSON decoding run in a bounded thread pool. CPU-heavy
+transforms such as day grid builds run in a process pool when
+``CPU_WORKERS`` is above zero, and in the thread pool otherwise. Process pool
+tasks receive only small, picklable arguments (source ids, versions, dates)
+and load what they need themselves; with columnar programs that is a
+memory map of the same snapshot the web workers use.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+from app.utils.file_operations import load_sources
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """Return the thread pool for blocking I/O, creating it on first use."""
+    global _io_executor
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=max(settings.IO_THREADS, 1), thread_name_prefix="data-io"
+            )
+        return _io_executor
+
+
+def cpu_executor() -> Executor:
+    """
+    Return the executor for CPU-heavy work.
+
+    A process pool of ``CPU_WORKERS`` processes, started with ``spawn`` so
+    children never inherit locks held by the server's threads; the I/O
+    thread pool when ``CPU_WORKERS`` is 0.
+    """
+    global _cpu_executor
+    if settings.CPU_WORKERS <= 0:
+        return io_executor()
+    with _lock:
+        if _cpu_executor is None:
+            _cpu_executor = ProcessPoolExecutor(
+                max_workers=settings.CPU_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started {settings.CPU_WORKERS} CPU worker processes")
+        return _cpu_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any) -> T:
+    """Run a blocking function in the I/O thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor(), functools.partial(func, *args))
+
+
+async def run_cpu(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a CPU-heavy function in the CPU executor and await its result.
+
+    ``func`` must be a module-level function and its arguments and result
+    picklable, since it may run in another process.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor(), functools.partial(func, *args))
+
+
+async def load_sources_async(filename: str) -> Any:
+    """
+    Awaitable ``load_sources``: read and decode a JSON file off the event loop.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    return await run_io(load_sources, filename)
+
+
+def shutdown() -> None:
+    """Shut down both pools; work already queued still runs."""
+    global _io_executor, _cpu_executor
+    with _lock:
+        executors = (_cpu_executor, _io_executor)
+        _io_executor = _cpu_executor = None
+    for executor in executors:
+        if executor is not None:
+            executor.shutdown(wait=False)
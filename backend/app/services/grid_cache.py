@@ -0,0 +1,221 @@
+"""LRU cache of materialized single-day programming grids."""
+
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+from app.config import settings
+from app.services.data_access import run_cpu, run_io
+from app.services.single_flight import SingleFlight
+from app.services.source_store import SourceData, source_store
+from app.utils.grid_engine import build_day_schedules
+from app.utils.program_format import grid_channel
+from app.utils.server_timing import phase
+from app.utils.time_utils import PytzTimezone
+
+logger = logging.getLogger(__name__)
+
+# (source, source version, timezone name, YYYY-MM-DD)
+GridKey = Tuple[str, str, str, str]
+
+# Slack around the local day when selecting candidate programs. Anything that
+# does not start on the requested local day is dropped by the grid engine.
+_WINDOW_PADDING = 2 * 3600
+
+
+def build_day_grid(
+    source_data: SourceData, target_timezone: PytzTimezone, date_str: str
+) -> List[Dict[str, Any]]:
+    """
+    Build the /py/epg/date channel list for one local day of a source.
+
+    Only programs overlapping the requested day are converted and gap-filled,
+    instead of the whole source.
+
+    Args:
+        source_data: Source to build the grid from
+        target_timezone: Timezone the day is expressed in
+        date_str: Local date in YYYY-MM-DD format
+
+    Returns:
+        Channel entries with their programs, or an empty list if the source
+        has no programming on that date
+    """
+    day = datetime.strptime(date_str, "%Y-%m-%d")
+    day_start = target_timezone.localize(day).timestamp() - _WINDOW_PADDING
+    day_end = (
+        target_timezone.localize(day + timedelta(days=1)).timestamp() + _WINDOW_PADDING
+    )
+
+    entries_by_channel = {
+        channel: timeline.overlapping(day_start, day_end)
+        for channel, timeline in source_data.timelines.items()
+    }
+    all_channels = [channel["channel_slug"] for channel in source_data.channels]
+    schedules = build_day_schedules(
+        entries_by_channel, target_timezone, date_str, all_channels
+    )
+    if schedules is None:
+        return []
+
+    channels_by_slug = source_data.channels_by_slug
+    channels_list = []
+    for channel_slug, programs in schedules.items():
+        channel_info = channels_by_slug.get(channel_slug)
+        if channel_info:
+            channels_list.append(
+                {
+                    "channel": grid_channel(channel_info),
+                    "programs": programs,
+                }
+            )
+    return channels_list
+
+
+def build_day_grid_task(
+    source: str, version: str, timezone_name: str, date_str: str
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    ``build_day_grid`` for the CPU executor, which may be another process.
+
+    The source is loaded from the process's own store, so only the grid is
+    sent back.
+
+    Returns:
+        The grid, or None if the source on disk is no longer at ``version``
+    """
+    source_data = source_store.get(source)
+    if source_data.version != version:
+        return None
+    return build_day_grid(source_data, pytz.timezone(timezone_name), date_str)
+
+
+class DayGridCache:
+    """
+    Day grids keyed by (source, version, timezone, date), evicted in LRU order.
+
+    Entries for an old source version are never hit again once the source
+    files change, and age out of the cache like any other entry.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._grids: "OrderedDict[GridKey, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Concurrent misses for the same grid wait on a single build
+        self.flights = SingleFlight()
+
+    def _key(
+        self, source_data: SourceData, target_timezone: PytzTimezone, date_str: str
+    ) -> GridKey:
+        return (
+            source_data.source,
+            source_data.version,
+            target_timezone.zone,
+            date_str,
+        )
+
+    def _lookup(self, key: GridKey) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is not None:
+                self._grids.move_to_end(key)
+                self.hits += 1
+                return grid
+            self.misses += 1
+            return None
+
+    def _store(self, key: GridKey, grid: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._grids[key] = grid
+            self._grids.move_to_end(key)
+            while len(self._grids) > self.max_entries:
+                self._grids.popitem(last=False)
+                self.evictions += 1
+
+    def get(
+        self, source_data: SourceData, target_timezone: PytzTimezone, date_str: str
+    ) -> List[Dict[str, Any]]:
+        """Return the grid for a day, building and caching it on a miss."""
+        key = self._key(source_data, target_timezone, date_str)
+        grid = self._lookup(key)
+        if grid is None:
+            grid = build_day_grid(source_data, target_timezone, date_str)
+            self._store(key, grid)
+        return grid
+
+    async def aget(
+        self, source_data: SourceData, target_timezone: PytzTimezone, date_str: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Awaitable ``get`` that builds missing grids in the CPU executor.
+
+        Concurrent requests for the same grid share one build.
+        """
+        key = self._key(source_data, target_timezone, date_str)
+        grid = self._lookup(key)
+        if grid is not None:
+            return grid
+        with phase("grid"):
+            return await self.flights.run(
+                key,
+                functools.partial(
+                    self._build_async, key, source_data, target_timezone, date_str
+                ),
+            )
+
+    async def _build_async(
+        self,
+        key: GridKey,
+        source_data: SourceData,
+        target_timezone: PytzTimezone,
+        date_str: str,
+    ) -> List[Dict[str, Any]]:
+        grid = await run_cpu(
+            build_day_grid_task,
+            source_data.source,
+            source_data.version,
+            target_timezone.zone,
+            date_str,
+        )
+        if grid is None:
+            # The executor's copy of the source is at another version
+            grid = await run_io(build_day_grid, source_data, target_timezone, date_str)
+        self._store(key, grid)
+        return grid
+
+    def prewarm(self, source_data: SourceData) -> None:
+        """Build grids for the configured timezones, starting from today."""
+        for timezone_name in settings.GRID_PREWARM_TIMEZONES:
+            try:
+                target_timezone = pytz.timezone(timezone_name)
+            except pytz.exceptions.UnknownTimeZoneError:
+                logger.warning(f"Skipping unknown prewarm timezone: {timezone_name}")
+                continue
+
+            today = datetime.now(target_timezone).date()
+            for offset in range(settings.GRID_PREWARM_DAYS):
+                date_str = (today + timedelta(days=offset)).isoformat()
+                self.get(source_data, target_timezone, date_str)
+        logger.info(f"Prewarmed day grids for {source_data.source}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the number of grids held in memory."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "cached_grids": len(self._grids),
+            }
+
+
+day_grid_cache = DayGridCache(max_entries=settings.GRID_CACHE_SIZE)
@@ -0,0 +1,144 @@
+"""Work to run after ingest rewrites a source's data files."""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, Optional
+
+from app.config import settings
+from app.services.data_access import run_io
+from app.services.grid_cache import day_grid_cache
+from app.services.metrics import ingest_runs
+from app.services.source_store import SourceData, source_store
+from app.utils.columnar import refresh_program_columns
+from app.utils.compression import precompress_source
+from app.utils.date_ranges import write_date_ranges
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Sources waiting for a refresh, in ingest order; a source ingested again
+# before its refresh starts is only refreshed once
+_pending: Dict[str, None] = {}
+_worker: Optional["asyncio.Task[None]"] = None
+
+
+def _step(source_id: str, description: str, func: Callable[[], None]) -> bool:
+    try:
+        func()
+    except Exception as e:
+        logger.warning(f"{description} failed for {source_id}: {str(e)}")
+        return False
+    return True
+
+
+def _write_dates(source_id: str) -> None:
+    # get() just loaded the programs, so this is a cache hit
+    programs_entry = source_store.load_programs(source_id)
+    write_date_ranges(source_id, programs_entry.data, programs_entry.signature[:2])
+
+
+def _precompress(source_id: str) -> None:
+    compressed, failed = precompress_source(source_id)
+    logger.info(
+        f"Pre-compressed {compressed} data files for {source_id}"
+        + (f" ({failed} failed)" if failed else "")
+    )
+
+
+def _build_indexes(source_id: str, source_data: SourceData) -> None:
+    category_count = len(source_data.category_index.categories)
+    term_count = len(source_data.search_index)
+    logger.info(
+        f"Indexed {category_count} categories and {term_count} search terms "
+        f"for {source_id}"
+    )
+
+
+def _refresh_source(source_id: str) -> str:
+    """
+    Rebuild a source's derived data, one independent step at a time.
+
+    A failed step is logged and the remaining steps still run.
+
+    Returns:
+        ``OK``, ``FAILED`` if any step failed, or ``SKIPPED`` if the source
+        files could not be read at all
+    """
+    # Columns are written before the store reloads, so readers switch
+    # straight to the memory-mapped copy instead of parsing the JSON
+    try:
+        refresh_program_columns(source_id)
+        columns_ok = True
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.warning(f"Skipping post-ingest refresh for {source_id}: {str(e)}")
+        return SKIPPED
+    except Exception as e:
+        logger.warning(f"Columnar programs not written for {source_id}: {str(e)}")
+        columns_ok = False
+
+    try:
+        source_data = source_store.get(source_id)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.warning(f"Skipping post-ingest refresh for {source_id}: {str(e)}")
+        return SKIPPED
+
+    results = [
+        columns_ok,
+        _step(source_id, "Dates sidecar", lambda: _write_dates(source_id)),
+    ]
+    # Compressed copies for the /xmltvdata static mount
+    if settings.PRECOMPRESS_DATA_FILES:
+        results.append(
+            _step(source_id, "Pre-compression", lambda: _precompress(source_id))
+        )
+    # Build the category and search indexes ahead of the first request
+    results.append(
+        _step(source_id, "Indexing", lambda: _build_indexes(source_id, source_data))
+    )
+    results.append(
+        _step(
+            source_id,
+            "Day grid pre-warming",
+            lambda: day_grid_cache.prewarm(source_data),
+        )
+    )
+    return OK if all(results) else FAILED
+
+
+async def _drain() -> None:
+    while _pending:
+        source_id = next(iter(_pending))
+        del _pending[source_id]
+        try:
+            outcome = await run_io(_refresh_source, source_id)
+        except Exception as e:
+            logger.error(f"Post-ingest refresh failed for {source_id}: {str(e)}")
+            outcome = FAILED
+        ingest_runs.inc(source_id, outcome)
+
+
+async def after_source_ingest(source_id: str) -> None:
+    """
+    Queue a freshly ingested source for reloading and rebuilding its data.
+
+    Returns without waiting: one background task works through the queue,
+    running each refresh in the I/O thread pool, so an ingest job never
+    waits for derived data and refreshes never compete with each other.
+    Failures are logged and never propagate into the ingest job.
+
+    Args:
+        source_id: Identifier of the source whose files were written
+    """
+    global _worker
+    _pending[source_id] = None
+    # A worker left by an event loop that has since closed never runs
+    if (
+        _worker is None
+        or _worker.done()
+        or _worker.get_loop() is not asyncio.get_running_loop()
+    ):
+        _worker = asyncio.create_task(_drain())
@@ -0,0 +1,268 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Request latency and bytes are recorded by ``MetricsMiddleware``; cache and
+load counters are read from the caches' own ``stats()`` when metrics are
+rendered, so they cost nothing per request. Each worker process keeps its
+own metrics, so with several workers a scrape reports the worker that
+answered it.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.services.compression_cache import compression_cache
+from app.services.grid_cache import day_grid_cache
+from app.services.source_store import source_store
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds; Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+# Label names and values of one sample, and its value
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _sample_line(name: str, labels: Dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{name}{{{label_text}}} {_format_value(value)}"
+
+
+def _family(name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> str:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(_sample_line(name, labels, value) for labels, value in samples)
+    return "\n".join(lines)
+
+
+def _check_labels(name: str, label_names: Labels, label_values: Labels) -> None:
+    if len(label_values) != len(label_names):
+        raise ValueError(
+            f"{name} takes {len(label_names)} label values, got {len(label_values)}"
+        )
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    def __init__(self, name: str, help_text: str, label_names: Labels) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """
+        Add ``amount`` to the sample for ``label_values``.
+
+        Raises:
+            ValueError: If there is not one label value per label name
+        """
+        _check_labels(self.name, self.label_names, label_values)
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> str:
+        """Return the counter in the text exposition format."""
+        with self._lock:
+            values = sorted(self._values.items())
+        return _family(
+            self.name,
+            "counter",
+            self.help_text,
+            (
+                (dict(zip(self.label_names, label_values, strict=True)), value)
+                for label_values, value in values
+            ),
+        )
+
+
+class Histogram:
+    """Histogram with fixed buckets and a fixed set of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Labels,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # Per label set: observations per bucket (the last one is +Inf), sum
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record one observation for ``label_values``.
+
+        Raises:
+            ValueError: If there is not one label value per label name
+        """
+        _check_labels(self.name, self.label_names, label_values)
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(label_values)
+            if counts is None:
+                counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+                self._sums[label_values] = 0.0
+            counts[bucket] += 1
+            self._sums[label_values] += value
+
+    def _samples(self, label_values: Labels, counts: List[int]) -> List[Sample]:
+        labels = dict(zip(self.label_names, label_values, strict=True))
+        samples: List[Sample] = []
+        cumulative = 0
+        for upper, count in zip((*self.buckets, float("inf")), counts, strict=True):
+            cumulative += count
+            samples.append(({**labels, "le": _format_value(upper)}, cumulative))
+        return samples
+
+    def render(self) -> str:
+        """Return the histogram in the text exposition format."""
+        with self._lock:
+            series = sorted(
+                (label_values, list(counts), self._sums[label_values])
+                for label_values, counts in self._counts.items()
+            )
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_values, counts, total in series:
+            labels = dict(zip(self.label_names, label_values, strict=True))
+            lines.extend(
+                _sample_line(f"{self.name}_bucket", sample_labels, value)
+                for sample_labels, value in self._samples(label_values, counts)
+            )
+            lines.append(_sample_line(f"{self.name}_sum", labels, total))
+            lines.append(_sample_line(f"{self.name}_count", labels, sum(counts)))
+        return "\n".join(lines)
+
+
+http_request_duration = Histogram(
+    "webepg_http_request_duration_seconds",
+    "Time to send the complete response, by route template and status.",
+    ("method", "route", "status"),
+)
+http_response_bytes = Counter(
+    "webepg_http_response_bytes_total",
+    "Response body bytes sent, after compression, by route template.",
+    ("route",),
+)
+ingest_runs = Counter(
+    "webepg_ingest_runs_total",
+    "Post-ingest refreshes of a source, by outcome (ok, failed or skipped).",
+    ("source", "outcome"),
+)
+
+
+def _cache_families() -> List[str]:
+    source = source_store.stats()
+    grids = day_grid_cache.stats()
+    compressed = compression_cache.stats()
+    source_flights = source_store.flights.stats()
+    grid_flights = day_grid_cache.flights.stats()
+    return [
+        _family(
+            "webepg_cache_hits_total",
+            "counter",
+            "Cache lookups answered from memory.",
+            [
+                ({"cache": "source_files"}, source["hits"]),
+                ({"cache": "day_grids"}, grids["hits"]),
+                ({"cache": "compressed_bodies"}, compressed["hits"]),
+            ],
+        ),
+        _family(
+            "webepg_cache_misses_total",
+            "counter",
+            "Cache lookups that had to load or build the value.",
+            [
+                ({"cache": "source_files"}, source["misses"] + source["reloads"]),
+                ({"cache": "day_grids"}, grids["misses"]),
+                ({"cache": "compressed_bodies"}, compressed["misses"]),
+            ],
+        ),
+        _family(
+            "webepg_cache_evictions_total",
+            "counter",
+            "Entries dropped to stay within a cache's size limit.",
+            [
+                ({"cache": "day_grids"}, grids["evictions"]),
+                ({"cache": "compressed_bodies"}, compressed["evictions"]),
+            ],
+        ),
+        _family(
+            "webepg_cache_entries",
+            "gauge",
+            "Entries held in memory.",
+            [
+                ({"cache": "source_files"}, source["cached_files"]),
+                ({"cache": "day_grids"}, grids["cached_grids"]),
+                ({"cache": "compressed_bodies"}, compressed["cached_bodies"]),
+            ],
+        ),
+        _family(
+            "webepg_source_loads_total",
+            "counter",
+            "Data files parsed or mapped, first loads and reloads after a change.",
+            [
+                ({"kind": "initial"}, source["misses"]),
+                ({"kind": "reload"}, source["reloads"]),
+            ],
+        ),
+        _family(
+            "webepg_single_flight_calls_total",
+            "counter",
+            "Calls that started a computation (leader) or joined one (coalesced).",
+            [
+                (
+                    {"flight": "source_loads", "role": "leader"},
+                    source_flights["leaders"],
+                ),
+                (
+                    {"flight": "source_loads", "role": "coalesced"},
+                    source_flights["coalesced"],
+                ),
+                ({"flight": "day_grids", "role": "leader"}, grid_flights["leaders"]),
+                (
+                    {"flight": "day_grids", "role": "coalesced"},
+                    grid_flights["coalesced"],
+                ),
+            ],
+        ),
+    ]
+
+
+_RENDERERS: List[Callable[[], str]] = [
+    http_request_duration.render,
+    http_response_bytes.render,
+    ingest_runs.render,
+]
+
+
+def render_metrics() -> str:
+    """Return all metrics in the Prometheus text exposition format."""
+    families = [render() for render in _RENDERERS]
+    families.extend(_cache_families())
+    return "\n".join(families) + "\n"
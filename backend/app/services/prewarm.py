@@ -0,0 +1,148 @@
+"""Background pre-warming of sources after startup."""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.grid_cache import day_grid_cache
+from app.services.source_store import source_store
+from app.utils.file_operations import load_configured_sources
+
+logger = logging.getLogger(__name__)
+
+# SourceData properties built for each source, covering every endpoint
+WARM_INDEXES = (
+    "channels_by_slug",
+    "timelines",
+    "transition_times",
+    "category_index",
+    "search_index",
+)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+MISSING = "missing"
+FAILED = "failed"
+
+
+def configured_source_ids() -> List[str]:
+    """
+    Return the sources to warm.
+
+    ``PREWARM_SOURCES`` when set, otherwise every configured source, in
+    configuration order.
+    """
+    if settings.PREWARM_SOURCES:
+        return list(dict.fromkeys(settings.PREWARM_SOURCES))
+
+    try:
+        return [source["id"] for source in load_configured_sources()]
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+class SourceWarmer:
+    """
+    Loads sources and builds their indexes and day grids in a thread pool.
+
+    Loads go through the source store, so a request for a source that is
+    being warmed waits for that load (in a worker thread, via
+    ``source_store.aget``) instead of starting its own.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.enabled = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def start(self, source_ids: List[str], workers: int) -> None:
+        """
+        Start warming sources in the background and return immediately.
+
+        Args:
+            source_ids: Sources to warm, in order
+            workers: Number of sources loaded at the same time
+        """
+        with self._lock:
+            self.enabled = True
+            self.started_at = time.monotonic()
+            self.finished_at = None if source_ids else self.started_at
+            self._states = dict.fromkeys(source_ids, PENDING)
+            self._errors = {}
+        if not source_ids:
+            return
+
+        logger.info(f"Pre-warming {len(source_ids)} sources with {workers} threads")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(workers, 1), thread_name_prefix="prewarm"
+        )
+        for source in source_ids:
+            self._executor.submit(self._warm, source)
+
+    def shutdown(self) -> None:
+        """Drop sources that have not started warming; running loads finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _set_state(self, source: str, state: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._states[source] = state
+            if error is not None:
+                self._errors[source] = error
+            if all(value not in (PENDING, LOADING) for value in self._states.values()):
+                self.finished_at = time.monotonic()
+
+    def _warm(self, source: str) -> None:
+        self._set_state(source, LOADING)
+        started = time.perf_counter()
+        try:
+            source_data = source_store.get(source).prepare(*WARM_INDEXES)
+            day_grid_cache.prewarm(source_data)
+        except FileNotFoundError:
+            # Configured but not ingested yet
+            self._set_state(source, MISSING)
+            return
+        except Exception as e:
+            logger.warning(f"Pre-warming {source} failed: {str(e)}")
+            self._set_state(source, FAILED, str(e))
+            return
+        self._set_state(source, READY)
+        logger.info(f"Pre-warmed {source} in {time.perf_counter() - started:.2f}s")
+
+    def status(self) -> Dict[str, Any]:
+        """Return warm-up progress for the readiness endpoint."""
+        with self._lock:
+            states = dict(self._states)
+            errors = dict(self._errors)
+            started_at, finished_at = self.started_at, self.finished_at
+
+        counts = dict.fromkeys((PENDING, LOADING, READY, MISSING, FAILED), 0)
+        for state in states.values():
+            counts[state] += 1
+        elapsed = None
+        if started_at is not None:
+            elapsed = round((finished_at or time.monotonic()) - started_at, 3)
+        return {
+            "ready": not self.enabled or finished_at is not None,
+            "enabled": self.enabled,
+            "total": len(states),
+            "progress": counts,
+            "elapsed_seconds": elapsed,
+            "in_progress": [
+                source for source, state in states.items() if state == LOADING
+            ],
+            "errors": errors,
+        }
+
+
+source_warmer = SourceWarmer()
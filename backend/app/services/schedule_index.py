@@ -0,0 +1,156 @@
+"""Per-channel schedule arrays for time-based lookups."""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.columnar import ColumnarPrograms, np
+from app.utils.grid_engine import TimedProgram
+from app.utils.time_utils import iso_to_epoch
+
+Program = Dict[str, Any]
+
+
+class ChannelTimeline:
+    """
+    A channel's programs with their UTC start/end times as epoch seconds.
+
+    Programs are held in start-time order as positions into the source's
+    program sequence, so results can be handed back in file order when ties
+    between equal start times matter, and columnar sources are only decoded
+    for the programs a lookup returns. ``max_ends[i]`` is the latest end time
+    among the first ``i + 1`` programs, which keeps lookups correct when a
+    source contains overlapping programs.
+    """
+
+    __slots__ = ("source", "positions", "starts", "ends", "max_ends")
+
+    def __init__(
+        self,
+        source: Sequence[Program],
+        positions: List[int],
+        starts: List[float],
+        ends: List[float],
+    ) -> None:
+        self.source = source
+        self.positions = positions
+        self.starts = starts
+        self.ends = ends
+        self.max_ends = list(accumulate(ends, max))
+
+    @property
+    def programs(self) -> List[Program]:
+        """The channel's programs in start-time order."""
+        return [self.source[position] for position in self.positions]
+
+    def _program(self, idx: int) -> Program:
+        return self.source[self.positions[idx]]
+
+    def now_next(self, at: float) -> Tuple[Optional[Program], Optional[Program]]:
+        """
+        Find the program airing at ``at`` and the one that follows it.
+
+        The current program is the earliest-starting program with
+        ``start <= at < end``. The next program is the first one starting at
+        or after the current program ends, or, when nothing is airing, the
+        first program starting after ``at``.
+
+        Args:
+            at: Instant to look up, in epoch seconds
+
+        Returns:
+            Tuple of (current program, next program); either may be None
+        """
+        started = bisect_right(self.starts, at)
+        current_idx = bisect_right(self.max_ends, at)
+
+        if current_idx < started:
+            current_end = self.ends[current_idx]
+            next_idx = bisect_left(self.starts, current_end, lo=current_idx + 1)
+            next_program = (
+                self._program(next_idx) if next_idx < len(self.positions) else None
+            )
+            return self._program(current_idx), next_program
+
+        if started < len(self.positions):
+            return None, self._program(started)
+        return None, None
+
+    def _timed(self, indices: List[int]) -> List[TimedProgram]:
+        indices.sort(key=self.positions.__getitem__)
+        return [
+            (self.starts[idx], self.ends[idx], self._program(idx)) for idx in indices
+        ]
+
+    def overlapping(self, start: float, end: float) -> List[TimedProgram]:
+        """
+        Return programs that start before ``end`` and end at or after ``start``.
+
+        Args:
+            start: Window start, in epoch seconds
+            end: Window end (exclusive), in epoch seconds
+
+        Returns:
+            (start epoch, end epoch, program) tuples in source file order
+        """
+        lo = bisect_left(self.max_ends, start)
+        hi = bisect_left(self.starts, end)
+        return self._timed(
+            [
+                idx
+                for idx in range(lo, hi)
+                if self.ends[idx] >= start or self.starts[idx] >= start
+            ]
+        )
+
+    def in_source_order(self) -> List[TimedProgram]:
+        """Return all of the channel's programs in source file order."""
+        return self._timed(list(range(len(self.positions))))
+
+
+def _columnar_timelines(programs: ColumnarPrograms) -> Dict[str, ChannelTimeline]:
+    if not len(programs):
+        return {}
+
+    # Group by channel (codes follow first appearance in the file), then
+    # order each channel by start time and file position
+    order = np.lexsort(
+        (np.arange(len(programs)), programs.start_epochs, programs.channel_codes)
+    )
+    boundaries = np.flatnonzero(np.diff(programs.channel_codes[order])) + 1
+
+    timelines: Dict[str, ChannelTimeline] = {}
+    for chunk in np.split(order, boundaries):
+        channel = programs.channels[programs.channel_codes[chunk[0]]]
+        timelines[channel] = ChannelTimeline(  # type: ignore[index]
+            programs,
+            chunk.tolist(),
+            programs.start_epochs[chunk].tolist(),
+            programs.end_epochs[chunk].tolist(),
+        )
+    return timelines
+
+
+def build_timelines(programs: Sequence[Program]) -> Dict[str, ChannelTimeline]:
+    """Group a source's programs by channel slug into timelines."""
+    if isinstance(programs, ColumnarPrograms):
+        return _columnar_timelines(programs)
+
+    entries: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+    for position, program in enumerate(programs):
+        entries[program.get("channel")].append(  # type: ignore[index]
+            (iso_to_epoch(program["start_time"]), position)
+        )
+
+    timelines: Dict[str, ChannelTimeline] = {}
+    for channel, keyed in entries.items():
+        keyed.sort()
+        positions = [position for _, position in keyed]
+        timelines[channel] = ChannelTimeline(
+            programs,
+            positions,
+            [start for start, _ in keyed],
+            [iso_to_epoch(programs[position]["end_time"]) for position in positions],
+        )
+    return timelines
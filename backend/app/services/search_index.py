@@ -0,0 +1,167 @@
+"""Full-text index over program titles, subtitles and descriptions."""
+
+import heapq
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from app.utils.columnar import program_column, program_epochs
+
+Program = Dict[str, Any]
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Field bits stored with each posting
+TITLE = 4
+SUBTITLE = 2
+DESCRIPTION = 1
+SEARCH_FIELDS = (("title", TITLE), ("subtitle", SUBTITLE), ("description", DESCRIPTION))
+
+# Score of a term, by the bits of the fields it appears in: the best field wins
+_FIELD_SCORES = [
+    3 if bits & TITLE else 2 if bits & SUBTITLE else 1 if bits & DESCRIPTION else 0
+    for bits in range(8)
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens with accents removed."""
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(
+            char
+            for char in unicodedata.normalize("NFKD", text)
+            if not unicodedata.combining(char)
+        )
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _field_tokens(texts: Tuple[Any, ...]) -> List[Tuple[str, int]]:
+    # Tokens of a program's search fields with the bits of the fields they are in
+    fields: Dict[str, int] = {}
+    for text, (_, bit) in zip(texts, SEARCH_FIELDS, strict=True):
+        if not text or not isinstance(text, str):
+            continue
+        for token in tokenize(text):
+            fields[token] = fields.get(token, 0) | bit
+    return list(fields.items())
+
+
+class SearchHit(NamedTuple):
+    """A matching program: its position in the source, UTC start and score."""
+
+    position: int
+    start: float
+    score: int
+
+
+class _Postings:
+    """Programs containing one token, in (start time, file position) order."""
+
+    __slots__ = ("starts", "positions", "fields")
+
+    def __init__(self) -> None:
+        self.starts = array("d")
+        self.positions = array("l")
+        self.fields = array("B")
+
+
+class SearchIndex:
+    """
+    Inverted index from token to the programs containing it.
+
+    Postings are sorted by start time, so a query only reads the postings
+    that start inside its window.
+    """
+
+    def __init__(self, programs: Sequence[Program]) -> None:
+        starts = program_epochs(programs, "start_time")
+        starts = starts if isinstance(starts, list) else starts.tolist()
+        columns = [program_column(programs, key) for key, _ in SEARCH_FIELDS]
+
+        self._postings: Dict[str, _Postings] = {}
+
+        # Repeat airings share their text; tokenize each combination once
+        tokenized: Dict[Tuple[Any, ...], List[Tuple[str, int]]] = {}
+        for position in sorted(range(len(starts)), key=starts.__getitem__):
+            texts = tuple(column[position] for column in columns)
+            fields = tokenized.get(texts)
+            if fields is None:
+                fields = tokenized[texts] = _field_tokens(texts)
+
+            start = starts[position]
+            for token, bits in fields:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = _Postings()
+                postings.starts.append(start)
+                postings.positions.append(position)
+                postings.fields.append(bits)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def search(
+        self, query: str, start: float, end: float, limit: int
+    ) -> Tuple[int, List[SearchHit]]:
+        """
+        Find programs containing every term of a query that start in a window.
+
+        Each term scores 3, 2 or 1 for the best field it appears in (title,
+        subtitle, description). Hits are ranked by total score, then by start
+        time, then by source file order.
+
+        Args:
+            query: Free text; tokenized the same way as the programs
+            start: Window start, in epoch seconds
+            end: Window end (exclusive), in epoch seconds
+            limit: Maximum number of hits to return
+
+        Returns:
+            Tuple of (total number of matching programs, top hits)
+        """
+        windows = []
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if postings is None:
+                return 0, []
+            lo = bisect_left(postings.starts, start)
+            hi = bisect_left(postings.starts, end)
+            if lo == hi:
+                return 0, []
+            windows.append((hi - lo, lo, hi, postings))
+        if not windows:
+            return 0, []
+
+        # Start from the rarest term and narrow the candidates term by term
+        windows.sort(key=lambda window: window[0])
+        _, lo, hi, postings = windows[0]
+        scores = {
+            postings.positions[idx]: _FIELD_SCORES[postings.fields[idx]]
+            for idx in range(lo, hi)
+        }
+        starts = {
+            postings.positions[idx]: postings.starts[idx] for idx in range(lo, hi)
+        }
+        for _, lo, hi, postings in windows[1:]:
+            matched: Dict[int, int] = {}
+            for idx in range(lo, hi):
+                position = postings.positions[idx]
+                score = scores.get(position)
+                if score is not None:
+                    matched[position] = score + _FIELD_SCORES[postings.fields[idx]]
+            scores = matched
+            if not scores:
+                return 0, []
+
+        hits = heapq.nsmallest(
+            limit,
+            (
+                SearchHit(position, starts[position], score)
+                for position, score in scores.items()
+            ),
+            key=lambda hit: (-hit.score, hit.start, hit.position),
+        )
+        return len(scores), hits
@@ -0,0 +1,68 @@
+"""Coalescing of concurrent identical computations on the event loop."""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time and shares its result.
+
+    The first caller for a key (the leader) starts the computation as a
+    task; callers arriving while it runs are coalesced onto that task. Each
+    caller awaits it through ``asyncio.shield``, so a caller that goes away
+    cancels neither the computation nor the other callers. Results are not
+    kept once the task finishes: caching is up to the caller.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``func()``, or the run of it already in flight for ``key``.
+
+        Args:
+            key: Normalized parameters identifying the computation,
+                including the version of the data it reads
+            func: Starts the computation; only called by the leader
+
+        Returns:
+            The computation's result, shared by every caller for ``key``
+
+        Raises:
+            Exception: Whatever the computation raised, for every caller
+        """
+        task = self._tasks.get(key)
+        # A task left by an event loop that has since closed is never awaited
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Retrieving the exception also keeps asyncio from logging it when
+        # every caller was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return leader and coalesced call counts and computations running."""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "in_flight": len(self._tasks),
+        }
@@ -0,0 +1,498 @@
+"""Process-wide in-memory store for parsed source data files."""
+
+import functools
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.services.category_index import CategoryIndex
+from app.services.data_access import run_io
+from app.services.schedule_index import ChannelTimeline, build_timelines
+from app.services.search_index import SearchIndex
+from app.services.single_flight import SingleFlight
+from app.utils.columnar import (
+    CURRENT_FILE,
+    ColumnarPrograms,
+    columnar_available,
+    columns_path,
+    ensure_program_columns,
+    load_program_columns,
+)
+from app.utils.date_ranges import (
+    DATES_SUFFIX,
+    build_date_ranges,
+    dates_path,
+    load_date_ranges,
+)
+from app.utils.file_operations import load_json
+from app.utils.server_timing import phase
+
+logger = logging.getLogger(__name__)
+
+# (st_mtime_ns, st_size) of a file on disk, or of several files concatenated
+FileSignature = Tuple[int, ...]
+
+
+@dataclass(eq=False)
+class CachedFile:
+    """Parsed contents of a data file and the signature it was loaded at."""
+
+    signature: FileSignature
+    data: Any
+
+    @property
+    def version(self) -> str:
+        """Opaque version string that changes whenever the file changes."""
+        return _format_version(self.signature)
+
+    @property
+    def modified(self) -> float:
+        """Modification time of the (first) file as epoch seconds."""
+        return self.signature[0] / 1e9
+
+
+@dataclass(eq=False)
+class SourceData:
+    """Programs and channels for a single source at one on-disk version."""
+
+    source: str
+    version: str
+    modified: float
+    programs: Sequence[Dict[str, Any]]
+    channels: List[Dict[str, Any]]
+    _build_locks: Dict[str, threading.Lock] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def prepare(self, *names: str) -> "SourceData":
+        """
+        Build the named cached properties that are not built yet.
+
+        A thread asking for a property another thread is building waits for
+        it instead of building its own copy.
+
+        Args:
+            names: Property names, e.g. ``"timelines"``, ``"search_index"``
+
+        Returns:
+            This SourceData, for chaining
+        """
+        for name in names:
+            if name in self.__dict__:
+                continue
+            with self._build_locks.setdefault(name, threading.Lock()):
+                getattr(self, name)
+        return self
+
+    def is_prepared(self, *names: str) -> bool:
+        """Return whether all the named cached properties are built."""
+        return all(name in self.__dict__ for name in names)
+
+    @cached_property
+    def channels_by_slug(self) -> Dict[str, Dict[str, Any]]:
+        """Channel metadata keyed by slug, keeping the first entry for each slug."""
+        index: Dict[str, Dict[str, Any]] = {}
+        for channel in self.channels:
+            index.setdefault(channel.get("channel_slug"), channel)  # type: ignore[arg-type]
+        return index
+
+    @cached_property
+    def timelines(self) -> Dict[str, ChannelTimeline]:
+        """Per-channel sorted start/end epoch arrays for time-based lookups."""
+        return build_timelines(self.programs)
+
+    @cached_property
+    def category_index(self) -> CategoryIndex:
+        """Programs by normalized category and UTC start day."""
+        return CategoryIndex(self.programs)
+
+    @cached_property
+    def search_index(self) -> SearchIndex:
+        """Full-text index over program titles, subtitles and descriptions."""
+        return SearchIndex(self.programs)
+
+    @cached_property
+    def transition_times(self) -> List[float]:
+        """Sorted start and end times of every program, without duplicates."""
+        times = set()
+        for timeline in self.timelines.values():
+            times.update(timeline.starts)
+            times.update(timeline.ends)
+        return sorted(times)
+
+    @cached_property
+    def programs_by_channel(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Programs keyed by channel slug, each list sorted by start time."""
+        return {
+            channel: timeline.programs for channel, timeline in self.timelines.items()
+        }
+
+
+def _file_signature(path: Path) -> FileSignature:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _columns_signature(source: str) -> FileSignature:
+    if not columnar_available():
+        return 0, 0
+    try:
+        return _file_signature(columns_path(source) / CURRENT_FILE)
+    except FileNotFoundError:
+        return 0, 0
+
+
+def _dates_signature(source: str) -> FileSignature:
+    try:
+        return _file_signature(dates_path(source))
+    except FileNotFoundError:
+        return 0, 0
+
+
+def _format_version(*signatures: FileSignature) -> str:
+    return "-".join(".".join(f"{part:x}" for part in sig) for sig in signatures)
+
+
+class SourceStore:
+    """
+    Cache of parsed JSON data files, keyed by filename.
+
+    A file is parsed once and served from memory until its mtime or size
+    changes on disk, at which point it is reloaded on the next access.
+    Callers must treat the returned data as read-only: it is shared between
+    all requests.
+    """
+
+    def __init__(self) -> None:
+        self._files: Dict[str, CachedFile] = {}
+        self._sources: Dict[str, SourceData] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        # Concurrent async loads of the same data share one worker thread
+        self.flights = SingleFlight()
+
+    def _load_lock(self, filename: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(filename, threading.Lock())
+
+    def _cached(
+        self,
+        key: str,
+        signature: Callable[[], FileSignature],
+        loader: Callable[[FileSignature], Any],
+        prepare: Optional[Callable[[], None]] = None,
+    ) -> CachedFile:
+        try:
+            current = signature()
+        except FileNotFoundError:
+            with self._lock:
+                self._files.pop(key, None)
+            raise
+
+        entry = self._files.get(key)
+        if entry is not None and entry.signature == current:
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        # Only one thread parses a given file; the others wait and reuse it
+        with self._load_lock(key):
+            entry = self._files.get(key)
+            if prepare is not None and (
+                entry is None or entry.signature != signature()
+            ):
+                prepare()
+            current = signature()
+            if entry is not None and entry.signature == current:
+                with self._lock:
+                    self.hits += 1
+                return entry
+
+            new_entry = CachedFile(signature=current, data=loader(current))
+            with self._lock:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.reloads += 1
+                    logger.info(f"Reloaded {key} after change on disk")
+                self._files[key] = new_entry
+            return new_entry
+
+    def load_entry(self, filename: str) -> CachedFile:
+        """
+        Return a file in the XMLTV data directory with its on-disk signature.
+
+        Args:
+            filename: Name of the file to read
+
+        Returns:
+            The cached entry for the current version of the file
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        path = Path(settings.XMLTV_DATA_DIR) / filename
+        try:
+            return self._cached(
+                filename,
+                lambda: _file_signature(path),
+                lambda _signature: load_json(filename),
+            )
+        except FileNotFoundError:
+            logger.error(f"File not found: {path}")
+            raise
+
+    def load_programs(self, source: str) -> CachedFile:
+        """
+        Return a source's programs, memory-mapped from columns when possible.
+
+        The columnar copy is used when it was built from the current version
+        of ``{source}_programs.json``. When it is missing or stale, one
+        process builds it (see ``ensure_program_columns``) and the others
+        wait and map the result; the JSON file is only parsed here when no
+        columns can be written. The entry's signature covers both, so
+        publishing a snapshot after the JSON file switches readers over on
+        their next access.
+
+        Args:
+            source: Source identifier
+
+        Returns:
+            The cached entry; its data is a sequence of program dicts
+
+        Raises:
+            FileNotFoundError: If the programs file doesn't exist
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        filename = f"{source}_programs.json"
+        path = Path(settings.XMLTV_DATA_DIR) / filename
+
+        def load(signature: FileSignature) -> Any:
+            columns = load_program_columns(source, signature[:2])
+            if columns is not None:
+                return columns
+            return load_json(filename)
+
+        try:
+            return self._cached(
+                filename,
+                lambda: _file_signature(path) + _columns_signature(source),
+                load,
+                prepare=lambda: ensure_program_columns(source),
+            )
+        except FileNotFoundError:
+            logger.error(f"File not found: {path}")
+            raise
+
+    def load_dates(self, source: str) -> CachedFile:
+        """
+        Return the available-dates summary of a source's programs.
+
+        Read from the ``{source}_dates.json`` sidecar written by ingest when
+        it matches the current programs file; otherwise built from the
+        programs and kept in memory until the programs file changes.
+
+        Args:
+            source: Source identifier
+
+        Returns:
+            The cached entry; its data is a ``build_date_ranges`` dict
+
+        Raises:
+            FileNotFoundError: If the programs file doesn't exist
+            json.JSONDecodeError: If the programs file contains invalid JSON
+        """
+        path = Path(settings.XMLTV_DATA_DIR) / f"{source}_programs.json"
+
+        def load(signature: FileSignature) -> Any:
+            date_ranges = load_date_ranges(source, signature[:2])
+            if date_ranges is not None:
+                return date_ranges
+            return build_date_ranges(self.load_programs(source).data)
+
+        return self._cached(
+            f"{source}{DATES_SUFFIX}",
+            lambda: _file_signature(path) + _dates_signature(source),
+            load,
+        )
+
+    def load_file(self, filename: str) -> Any:
+        """
+        Return the parsed contents of a file in the XMLTV data directory.
+
+        Args:
+            filename: Name of the file to read
+
+        Returns:
+            The parsed JSON data, shared with other callers
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        return self.load_entry(filename).data
+
+    def get(self, source: str) -> SourceData:
+        """
+        Return the programs and channels for a source.
+
+        Args:
+            source: Source identifier
+
+        Returns:
+            SourceData for the current on-disk version of the source files
+
+        Raises:
+            FileNotFoundError: If either source file doesn't exist
+            json.JSONDecodeError: If either file contains invalid JSON
+        """
+        programs_entry = self.load_programs(source)
+        channels_entry = self.load_entry(f"{source}_channels.json")
+        version = _format_version(programs_entry.signature, channels_entry.signature)
+
+        source_data = self._sources.get(source)
+        if source_data is None or source_data.version != version:
+            source_data = SourceData(
+                source=source,
+                version=version,
+                modified=programs_entry.modified,
+                programs=programs_entry.data,
+                channels=channels_entry.data,
+            )
+            with self._lock:
+                self._sources[source] = source_data
+        return source_data
+
+    def _fresh(
+        self, key: str, signature: Callable[[], FileSignature]
+    ) -> Optional[CachedFile]:
+        # The cached entry, if its files are unchanged on disk; never loads
+        entry = self._files.get(key)
+        if entry is None:
+            return None
+        try:
+            if entry.signature != signature():
+                return None
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def _programs_signature(self, source: str) -> FileSignature:
+        path = Path(settings.XMLTV_DATA_DIR) / f"{source}_programs.json"
+        return _file_signature(path) + _columns_signature(source)
+
+    def _current_source(self, source: str) -> Optional[SourceData]:
+        # The cached source, if both its files are unchanged on disk
+        source_data = self._sources.get(source)
+        if source_data is None:
+            return None
+        channels_path = Path(settings.XMLTV_DATA_DIR) / f"{source}_channels.json"
+        programs_entry = self._fresh(
+            f"{source}_programs.json", lambda: self._programs_signature(source)
+        )
+        channels_entry = self._fresh(
+            f"{source}_channels.json", lambda: _file_signature(channels_path)
+        )
+        if programs_entry is None or channels_entry is None:
+            return None
+        version = _format_version(programs_entry.signature, channels_entry.signature)
+        return source_data if version == source_data.version else None
+
+    async def aget(self, source: str, *indexes: str) -> SourceData:
+        """
+        Return a source without blocking the event loop on loading it.
+
+        A source that is in memory, current and has ``indexes`` built is
+        returned straight away. Otherwise loading it, or waiting for a load
+        or index build that another request or the startup warmer already
+        has in flight, happens in the I/O thread pool.
+
+        Args:
+            source: Source identifier
+            indexes: SourceData properties the caller is about to use
+
+        Returns:
+            SourceData for the current on-disk version of the source files
+
+        Raises:
+            FileNotFoundError: If either source file doesn't exist
+            json.JSONDecodeError: If either file contains invalid JSON
+        """
+        source_data = self._current_source(source)
+        if source_data is not None and source_data.is_prepared(*indexes):
+            return source_data
+        with phase("load"):
+            return await self.flights.run(
+                ("source", source, indexes),
+                functools.partial(run_io, self._get_prepared, source, indexes),
+            )
+
+    def _get_prepared(self, source: str, indexes: Tuple[str, ...]) -> SourceData:
+        return self.get(source).prepare(*indexes)
+
+    async def aload_entry(self, filename: str) -> CachedFile:
+        """
+        Awaitable ``load_entry``; reads and parses in the I/O thread pool.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        path = Path(settings.XMLTV_DATA_DIR) / filename
+        entry = self._fresh(filename, lambda: _file_signature(path))
+        if entry is not None:
+            return entry
+        with phase("load"):
+            return await self.flights.run(
+                ("entry", filename),
+                functools.partial(run_io, self.load_entry, filename),
+            )
+
+    async def aload_dates(self, source: str) -> CachedFile:
+        """
+        Awaitable ``load_dates``; reads or builds in the I/O thread pool.
+
+        Raises:
+            FileNotFoundError: If the programs file doesn't exist
+            json.JSONDecodeError: If the programs file contains invalid JSON
+        """
+        path = Path(settings.XMLTV_DATA_DIR) / f"{source}_programs.json"
+        entry = self._fresh(
+            f"{source}{DATES_SUFFIX}",
+            lambda: _file_signature(path) + _dates_signature(source),
+        )
+        if entry is not None:
+            return entry
+        with phase("load"):
+            return await self.flights.run(
+                ("dates", source), functools.partial(run_io, self.load_dates, source)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the number of files held in memory."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "cached_files": len(self._files),
+                "columnar_files": sum(
+                    isinstance(entry.data, ColumnarPrograms)
+                    for entry in self._files.values()
+                ),
+                "cached_sources": len(self._sources),
+            }
+
+
+source_store = SourceStore()
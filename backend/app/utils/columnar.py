@@ -0,0 +1,572 @@
+"""
+Memory-mapped columnar snapshots of a source's programs file.
+
+``{source}_programs.columns/`` holds numbered snapshot directories
+(``v000001/``, ``v000002/``...), a ``current`` file naming the published
+snapshot and a ``.lock`` file. Snapshots are never modified once published:
+a new version is written next to the old ones and ``current`` is switched to
+it, so a reader always sees one complete snapshot. Only one process builds a
+source's snapshot at a time (the others wait on the lock and then attach to
+its result), and the previous snapshot is kept for readers that are still
+opening it.
+
+Each snapshot directory holds:
+
+- ``meta.json``: format version, snapshot version, signature of the JSON
+  file the columns were built from, key names, key layouts and the channel
+  table
+- ``start.npy`` / ``end.npy``: UTC start and end times as epoch seconds
+- ``channel.npy``: index into the channel table
+- ``layout.npy``: index into the layouts (a program's keys, in order)
+- ``refs.npy``: (programs x keys) references into the value table, -1 where
+  a program does not have the key
+- ``value_offsets.npy`` / ``value_data.npy``: the value table, as offsets into
+  one UTF-8 buffer. ``value_kinds.npy`` marks plain strings (0) and
+  JSON-encoded values such as category lists (1).
+
+Identical values (titles, categories, "N/A" placeholders) are stored once.
+Arrays are opened with ``mmap_mode="r"``, so worker processes share the same
+pages through the OS page cache instead of each holding parsed copies.
+The indexes derived from the columns (timelines, categories, search terms)
+are still built by each worker as Python lists, which keeps lookups on
+``bisect`` but costs every worker its own copy.
+
+NumPy is optional; without it nothing is written and readers fall back to
+the JSON file.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from app.config import settings
+from app.utils.serialization import dumps, loads, read_json_file
+from app.utils.time_utils import iso_to_epoch
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the installed extras
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+COLUMNS_SUFFIX = "_programs.columns"
+CURRENT_FILE = "current"
+_LOCK_FILE = ".lock"
+# Attempts to open the current snapshot when it is replaced mid-open
+_OPEN_ATTEMPTS = 3
+# Serializes builds when fcntl is unavailable
+_build_lock = threading.Lock()
+
+_KIND_STR = 0
+_KIND_JSON = 1
+# Programs decoded per batch when iterating
+_ITER_CHUNK = 4096
+
+Program = Dict[str, Any]
+FileSignature = Tuple[int, int]
+
+_ARRAYS = (
+    "start",
+    "end",
+    "channel",
+    "layout",
+    "refs",
+    "value_offsets",
+    "value_data",
+    "value_kinds",
+)
+
+
+def columnar_available() -> bool:
+    """Return True if columnar files can be written and read."""
+    return np is not None and settings.COLUMNAR_PROGRAMS
+
+
+def columns_path(source: str) -> Path:
+    """Return the columns directory of a source."""
+    return Path(settings.XMLTV_DATA_DIR) / f"{source}{COLUMNS_SUFFIX}"
+
+
+def _open_array(path: Path) -> Any:
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        # Zero-length arrays cannot be memory-mapped
+        return np.load(path)
+
+
+class ColumnarPrograms(Sequence[Program]):
+    """
+    Read-only sequence of program dicts backed by memory-mapped columns.
+
+    Programs are rebuilt on access with the same keys, key order and values
+    as the JSON file. Decoded values are cached, and repeated values are
+    shared between the dicts handed out, so callers must not mutate them.
+    """
+
+    def __init__(self, directory: Path, meta: Dict[str, Any]) -> None:
+        self.directory = directory
+        self.keys: List[str] = meta["keys"]
+        self.layouts: List[List[int]] = meta["layouts"]
+        self.channels: List[Optional[str]] = meta["channels"]
+        arrays = {name: _open_array(directory / f"{name}.npy") for name in _ARRAYS}
+        self.start_epochs = arrays["start"]
+        self.end_epochs = arrays["end"]
+        self.channel_codes = arrays["channel"]
+        self._layout = arrays["layout"]
+        self._refs = arrays["refs"]
+        self._value_offsets = arrays["value_offsets"]
+        self._value_data = arrays["value_data"]
+        self._value_kinds = arrays["value_kinds"]
+        # Zero-copy view of the mapped value buffer; slicing it is much
+        # cheaper than slicing the array
+        self._value_text = memoryview(self._value_data)
+        self._value = lru_cache(maxsize=settings.COLUMNAR_VALUE_CACHE_SIZE)(
+            self._decode_value
+        )
+
+    def _decode(self, start: int, end: int, kind: int) -> Any:
+        if kind == _KIND_STR:
+            return str(self._value_text[start:end], "utf-8")
+        return loads(self._value_text[start:end].tobytes())
+
+    def _decode_value(self, ref: int) -> Any:
+        start, end = self._value_offsets[ref : ref + 2].tolist()
+        return self._decode(start, end, int(self._value_kinds[ref]))
+
+    def _build(self, layout: int, refs: List[int]) -> Program:
+        value = self._value
+        keys = self.keys
+        return {keys[key]: value(refs[key]) for key in self.layouts[layout]}
+
+    def _decode_refs(self, refs: Any) -> Dict[int, Any]:
+        # Decode each distinct value referenced in ``refs`` once
+        unique = np.unique(refs)
+        unique = unique[unique >= 0]
+        value_starts = self._value_offsets[unique].tolist()
+        value_ends = self._value_offsets[unique + 1].tolist()
+        kinds = self._value_kinds[unique].tolist()
+        return {
+            ref: self._decode(value_start, value_end, kind)
+            for ref, value_start, value_end, kind in zip(
+                unique.tolist(), value_starts, value_ends, kinds, strict=True
+            )
+        }
+
+    def _decode_range(self, start: int, stop: int) -> List[Program]:
+        refs = self._refs[start:stop]
+        values = self._decode_refs(refs)
+        keys = self.keys
+        layouts = self.layouts
+        return [
+            {keys[key]: values[row[key]] for key in layouts[layout]}
+            for layout, row in zip(
+                self._layout[start:stop].tolist(), refs.tolist(), strict=True
+            )
+        ]
+
+    def column(self, key: str) -> List[Any]:
+        """
+        Return one key's value for every program, None where it is absent.
+
+        Much cheaper than iterating when only a few keys are needed, since
+        no program dicts are built.
+        """
+        if key not in self.keys:
+            return [None] * len(self)
+        refs = self._refs[:, self.keys.index(key)]
+        values = self._decode_refs(refs)
+        values[-1] = None
+        return [values[ref] for ref in refs.tolist()]
+
+    def __len__(self) -> int:
+        return len(self._layout)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("program index out of range")
+        return self._build(int(self._layout[index]), self._refs[index].tolist())
+
+    def __iter__(self) -> Iterator[Program]:
+        for start in range(0, len(self), _ITER_CHUNK):
+            yield from self._decode_range(start, min(start + _ITER_CHUNK, len(self)))
+
+
+def program_column(programs: Sequence[Program], key: str) -> List[Any]:
+    """
+    Return ``program.get(key)`` for every program in a source.
+
+    Columnar programs are read straight from the key's column instead of
+    decoding every program.
+    """
+    if isinstance(programs, ColumnarPrograms):
+        return programs.column(key)
+    return [program.get(key) for program in programs]
+
+
+def program_epochs(programs: Sequence[Program], key: str) -> Sequence[float]:
+    """
+    Return a source's ``start_time`` or ``end_time`` values as epoch seconds.
+
+    Columnar programs already store these as arrays.
+    """
+    if isinstance(programs, ColumnarPrograms):
+        return programs.start_epochs if key == "start_time" else programs.end_epochs
+    return [iso_to_epoch(program[key]) for program in programs]
+
+
+def _build_columns(
+    programs: Sequence[Program],
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    keys: Dict[str, int] = {}
+    layouts: Dict[Tuple[int, ...], int] = {}
+    channels: Dict[Optional[str], int] = {}
+    # Value table references by kind, keyed by the value's text
+    interned: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+    value_chunks: List[bytes] = []
+    value_kinds: List[int] = []
+
+    starts: List[float] = []
+    ends: List[float] = []
+    channel_codes: List[int] = []
+    layout_codes: List[int] = []
+    rows: List[Tuple[Tuple[int, ...], List[int]]] = []
+
+    for program in programs:
+        starts.append(iso_to_epoch(program["start_time"]))
+        ends.append(iso_to_epoch(program["end_time"]))
+        channel_codes.append(channels.setdefault(program.get("channel"), len(channels)))
+
+        row_keys = []
+        row_refs = []
+        for key, value in program.items():
+            if isinstance(value, str):
+                kind, text = _KIND_STR, value
+            else:
+                kind, text = _KIND_JSON, dumps(value).decode("utf-8")
+            ref = interned[kind].get(text)
+            if ref is None:
+                ref = interned[kind][text] = len(value_chunks)
+                value_chunks.append(text.encode("utf-8"))
+                value_kinds.append(kind)
+            key_index = keys.get(key)
+            if key_index is None:
+                key_index = keys[key] = len(keys)
+            row_keys.append(key_index)
+            row_refs.append(ref)
+        layout = tuple(row_keys)
+        rows.append((layout, row_refs))
+        layout_codes.append(layouts.setdefault(layout, len(layouts)))
+
+    if len(layouts) > np.iinfo(np.uint16).max + 1:
+        raise ValueError(f"Too many distinct program layouts: {len(layouts)}")
+
+    flat_refs: List[int] = []
+    for layout, row_refs in rows:
+        full_row = [-1] * len(keys)
+        for key_index, ref in zip(layout, row_refs, strict=True):
+            full_row[key_index] = ref
+        flat_refs.extend(full_row)
+    refs = np.array(flat_refs, dtype=np.int32).reshape(len(programs), len(keys))
+
+    value_offsets = np.zeros(len(value_chunks) + 1, dtype=np.int64)
+    np.cumsum([len(chunk) for chunk in value_chunks], out=value_offsets[1:])
+
+    meta = {
+        "keys": list(keys),
+        "layouts": [list(layout) for layout in layouts],
+        "channels": list(channels),
+    }
+    arrays = {
+        "start": np.array(starts, dtype=np.float64),
+        "end": np.array(ends, dtype=np.float64),
+        "channel": np.array(channel_codes, dtype=np.int32),
+        "layout": np.array(layout_codes, dtype=np.uint16),
+        "refs": refs,
+        "value_offsets": value_offsets,
+        "value_data": np.frombuffer(b"".join(value_chunks), dtype=np.uint8),
+        "value_kinds": np.array(value_kinds, dtype=np.uint8),
+    }
+    return meta, arrays
+
+
+def _snapshot_name(version: int) -> str:
+    return f"v{version:06d}"
+
+
+def _parse_version(name: str) -> Optional[int]:
+    if name.startswith("v") and name[1:].isdigit():
+        return int(name[1:])
+    return None
+
+
+def current_version(source: str) -> Optional[int]:
+    """Return the published snapshot version of a source, if there is one."""
+    try:
+        return int((columns_path(source) / CURRENT_FILE).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@contextmanager
+def columns_lock(source: str) -> Iterator[None]:
+    """
+    Hold the lock that allows one snapshot build of a source at a time.
+
+    The lock is an flock on the columns directory's lock file, so it is
+    shared by all worker processes; without fcntl it only covers the
+    current process.
+    """
+    directory = columns_path(source)
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        with _build_lock:
+            yield
+        return
+    with open(directory / _LOCK_FILE, "a+b") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _current_snapshot(source: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+    for _ in range(_OPEN_ATTEMPTS):
+        version = current_version(source)
+        if version is None:
+            return None
+        directory = columns_path(source) / _snapshot_name(version)
+        try:
+            return directory, loads((directory / "meta.json").read_bytes())
+        except FileNotFoundError:
+            # Pruned after a newer snapshot was published; look again
+            continue
+        except json.JSONDecodeError as e:
+            logger.warning(f"Ignoring unreadable columnar metadata in {directory}: {e}")
+            return None
+    return None
+
+
+def _matches(meta: Dict[str, Any], source_signature: FileSignature) -> bool:
+    return meta.get("format") == FORMAT_VERSION and tuple(
+        meta.get("source_signature", ())
+    ) == tuple(source_signature)
+
+
+def _write_current(directory: Path, version: int) -> None:
+    staging = directory / f"{CURRENT_FILE}.tmp-{os.getpid()}"
+    staging.write_text(str(version))
+    os.replace(staging, directory / CURRENT_FILE)
+
+
+def _prune(directory: Path, version: int) -> None:
+    # The previous snapshot is kept for readers that read ``current`` just
+    # before it changed. Processes that mapped older snapshots keep their
+    # pages until they reload, even once the files are removed.
+    for entry in directory.iterdir():
+        name = entry.name
+        if ".tmp-" in name:
+            # Left behind by a build that died; no other build is running
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+        elif entry.is_dir():
+            entry_version = _parse_version(name)
+            if entry_version is not None and entry_version < version - 1:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def _publish(source: str, meta: Dict[str, Any], arrays: Dict[str, Any]) -> Path:
+    # Callers hold columns_lock(source)
+    directory = columns_path(source)
+    versions = [
+        version
+        for version in map(_parse_version, os.listdir(directory))
+        if version is not None
+    ]
+    version = max([*versions, current_version(source) or 0]) + 1
+    meta["version"] = version
+
+    snapshot = directory / _snapshot_name(version)
+    staging = directory / f"{snapshot.name}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array, allow_pickle=False)
+        (staging / "meta.json").write_bytes(dumps(meta))
+        staging.rename(snapshot)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    _write_current(directory, version)
+    _prune(directory, version)
+    logger.info(f"Columnar programs snapshot {snapshot} published")
+    return snapshot
+
+
+def _snapshot_meta(
+    programs: Sequence[Program], source_signature: FileSignature
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    meta, arrays = _build_columns(programs)
+    meta.update(
+        format=FORMAT_VERSION,
+        source_signature=list(source_signature),
+        count=len(programs),
+    )
+    return meta, arrays
+
+
+def write_program_columns(
+    source: str, programs: Sequence[Program], source_signature: FileSignature
+) -> Path:
+    """
+    Publish a new columnar snapshot of a source's programs.
+
+    The snapshot is written to a temporary directory, renamed to its version
+    number and only then made current, so readers never see a partially
+    written set. Readers that still have the previous snapshot mapped keep
+    using it until they reload.
+
+    Args:
+        source: Source identifier
+        programs: Programs as loaded from the JSON file
+        source_signature: (st_mtime_ns, st_size) of the JSON file the
+            programs were loaded from
+
+    Returns:
+        Path of the snapshot directory
+
+    Raises:
+        ValueError: If the programs cannot be encoded
+        OSError: If there are issues writing the files
+    """
+    meta, arrays = _snapshot_meta(programs, source_signature)
+    with columns_lock(source):
+        return _publish(source, meta, arrays)
+
+
+def refresh_program_columns(source: str) -> Optional[Path]:
+    """
+    Rebuild the columnar snapshot of a source from its JSON programs file.
+
+    Runs under the source's build lock. When another process published a
+    snapshot of the current JSON file while this one waited for the lock,
+    that snapshot is used as is.
+
+    Args:
+        source: Source identifier
+
+    Returns:
+        Path of the current snapshot directory, or None if columnar files
+        are disabled or the JSON file changed while it was being read
+
+    Raises:
+        FileNotFoundError: If the programs file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        ValueError: If the programs cannot be encoded
+        OSError: If there are issues writing the files
+    """
+    if not columnar_available():
+        return None
+
+    path = Path(settings.XMLTV_DATA_DIR) / f"{source}_programs.json"
+    with columns_lock(source):
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        snapshot = _current_snapshot(source)
+        if snapshot is not None and _matches(snapshot[1], signature):
+            return snapshot[0]
+
+        programs = read_json_file(path)
+        stat = os.stat(path)
+        if (stat.st_mtime_ns, stat.st_size) != signature:
+            logger.warning(f"{path} changed while building columns, skipping")
+            return None
+        meta, arrays = _snapshot_meta(programs, signature)
+        del programs
+        return _publish(source, meta, arrays)
+
+
+def ensure_program_columns(source: str) -> None:
+    """
+    Build a source's snapshot if it is missing or older than its JSON file.
+
+    Called before a process loads a source, so that one process parses the
+    JSON file and every worker maps the result instead of holding its own
+    parsed copy. Failures are logged and leave the caller to read the JSON.
+
+    Args:
+        source: Source identifier
+    """
+    if not columnar_available() or not settings.COLUMNAR_BUILD_ON_LOAD:
+        return
+    try:
+        stat = os.stat(Path(settings.XMLTV_DATA_DIR) / f"{source}_programs.json")
+    except FileNotFoundError:
+        return
+    snapshot = _current_snapshot(source)
+    if snapshot is not None and _matches(snapshot[1], (stat.st_mtime_ns, stat.st_size)):
+        return
+
+    try:
+        refresh_program_columns(source)
+    except (FileNotFoundError, json.JSONDecodeError):
+        # Reported by the JSON load that follows
+        return
+    except (OSError, ValueError) as e:
+        logger.warning(f"Columnar programs not written for {source}: {str(e)}")
+
+
+def load_program_columns(
+    source: str, source_signature: FileSignature
+) -> Optional[ColumnarPrograms]:
+    """
+    Open the current columnar snapshot of a source, if it is up to date.
+
+    Args:
+        source: Source identifier
+        source_signature: (st_mtime_ns, st_size) of the source's JSON file
+
+    Returns:
+        The memory-mapped programs, or None if columns are unavailable,
+        missing, or were built from a different version of the JSON file
+    """
+    if not columnar_available():
+        return None
+
+    for _ in range(_OPEN_ATTEMPTS):
+        snapshot = _current_snapshot(source)
+        if snapshot is None:
+            return None
+        directory, meta = snapshot
+        if not _matches(meta, source_signature):
+            return None
+        try:
+            return ColumnarPrograms(directory, meta)
+        except FileNotFoundError:
+            # Pruned while it was being opened; attach to the newer snapshot
+            continue
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable columnar programs in {directory}: {e}")
+            return None
+    return None
@@ -0,0 +1,269 @@
+"""
+Content-coding negotiation, response compressors and pre-compressed copies
+of data files.
+
+gzip is always available. Brotli and zstd are used when the ``brotli`` and
+``zstandard`` packages are installed (``speedups`` extra); without them only
+gzip is offered.
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.date_ranges import DATES_SUFFIX
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the installed extras
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the installed extras
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Pre-compressed copies are written once per ingest, so favour size
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+# Responses are compressed per request, so favour speed
+RESPONSE_GZIP_LEVEL = 6
+RESPONSE_BROTLI_QUALITY = 5
+RESPONSE_ZSTD_LEVEL = 3
+_CHUNK_SIZE = 1 << 20
+
+# Data files ingest writes for a source, named "<source id><suffix>"
+SOURCE_FILE_SUFFIXES = (
+    ".xml",
+    "_channels.json",
+    "_programs.json",
+    "_datacheck.json",
+    DATES_SUFFIX,
+)
+
+# File suffix of each pre-compressed copy, in server preference order
+PRECOMPRESSED_SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+if brotli is None:
+    del PRECOMPRESSED_SUFFIXES["br"]
+
+# Codings responses can be compressed with, in server preference order
+RESPONSE_CODINGS: Tuple[str, ...] = tuple(
+    coding
+    for coding, available in (
+        ("zstd", zstandard is not None),
+        ("br", brotli is not None),
+        ("gzip", True),
+    )
+    if available
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into quality values by coding.
+
+    Args:
+        header: Header value, e.g. ``"gzip;q=0.8, br"``
+
+    Returns:
+        Lower-cased codings (including ``*``) mapped to their q-value;
+        unparsable q-values count as 0
+    """
+    qualities: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_encoding(header: str, available: Iterable[str]) -> Optional[str]:
+    """
+    Choose the content coding to respond with.
+
+    Args:
+        header: The request's Accept-Encoding value
+        available: Codings the server can produce, in preference order
+
+    Returns:
+        The acceptable coding with the highest q-value, ties going to the
+        earlier ``available`` entry, or None to send the identity coding
+    """
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in available:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for one response body.
+
+    ``compress`` may buffer its input; ``flush`` emits everything given so
+    far as decodable output, so streamed chunks reach the client without
+    waiting for the end of the body.
+    """
+
+    def __init__(self, coding: str) -> None:
+        self.coding = coding
+        if coding == "gzip":
+            self._zlib = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif coding == "br":
+            self._brotli = brotli.Compressor(quality=RESPONSE_BROTLI_QUALITY)
+        elif coding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(
+                level=RESPONSE_ZSTD_LEVEL
+            ).compressobj()
+        else:
+            raise ValueError(f"Unsupported content coding: {coding}")
+
+    def compress(self, data: bytes) -> bytes:
+        """Feed part of the body; returns whatever output is ready."""
+        if self.coding == "gzip":
+            return self._zlib.compress(data)
+        if self.coding == "br":
+            return self._brotli.process(data)
+        return self._zstd.compress(data)
+
+    def flush(self) -> bytes:
+        """Return all pending output, keeping the stream open."""
+        if self.coding == "gzip":
+            return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+        if self.coding == "br":
+            return self._brotli.flush()
+        return self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        """Return the remaining output and end the stream."""
+        if self.coding == "gzip":
+            return self._zlib.flush()
+        if self.coding == "br":
+            return self._brotli.finish()
+        return self._zstd.flush()
+
+
+def _copy_compressed(source: BinaryIO, target: BinaryIO, coding: str) -> None:
+    if coding == "gzip":
+        # No name or mtime in the header keeps the output reproducible
+        with gzip.GzipFile(
+            filename="",
+            fileobj=target,
+            mode="wb",
+            compresslevel=GZIP_LEVEL,
+            mtime=0,
+        ) as compressed:
+            shutil.copyfileobj(source, compressed, _CHUNK_SIZE)
+        return
+
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+        target.write(compressor.process(chunk))
+    target.write(compressor.finish())
+
+
+def write_precompressed(path: Path) -> List[Path]:
+    """
+    Write a compressed copy of a file next to it for each available coding.
+
+    Copies are written to a temporary name and renamed into place, so a
+    static file handler never serves a partial copy.
+
+    Args:
+        path: File to compress
+
+    Returns:
+        Paths of the copies written
+
+    Raises:
+        OSError: If the file cannot be read or a copy cannot be written
+    """
+    written = []
+    for coding, suffix in PRECOMPRESSED_SUFFIXES.items():
+        target = path.with_name(path.name + suffix)
+        staging = path.with_name(f"{path.name}{suffix}.tmp")
+        try:
+            with path.open("rb") as source, staging.open("wb") as compressed:
+                _copy_compressed(source, compressed, coding)
+            os.replace(staging, target)
+        finally:
+            staging.unlink(missing_ok=True)
+        written.append(target)
+    return written
+
+
+def source_artifacts(source_id: str) -> List[Path]:
+    """Return the XML and JSON data files ingest has written for a source."""
+    data_dir = Path(settings.XMLTV_DATA_DIR)
+    # Exact names: a prefix match would also pick up the files of a source
+    # whose identifier starts with this one
+    candidates = [data_dir / f"{source_id}{suffix}" for suffix in SOURCE_FILE_SUFFIXES]
+    return sorted(path for path in candidates if path.is_file())
+
+
+def precompress_source(source_id: str) -> Tuple[int, int]:
+    """
+    Refresh the pre-compressed copies of a source's data files.
+
+    Failures are logged per file and do not stop the remaining files.
+
+    Args:
+        source_id: Source whose files were just written
+
+    Returns:
+        Tuple of (files compressed, files that failed)
+    """
+    compressed = failed = 0
+    for path in source_artifacts(source_id):
+        try:
+            write_precompressed(path)
+            compressed += 1
+        except OSError as e:
+            logger.warning(f"Pre-compressed copies not written for {path}: {str(e)}")
+            failed += 1
+    return compressed, failed
+
+
+def fresh_variants(
+    path: str, stat_result: os.stat_result
+) -> Dict[str, Tuple[str, os.stat_result]]:
+    """
+    Find the pre-compressed copies of a file that are up to date.
+
+    A copy older than its file was left behind by an earlier write and is
+    ignored, so clients never receive stale content.
+
+    Returns:
+        Path and stat of each usable copy, keyed by coding
+    """
+    variants = {}
+    for coding, suffix in PRECOMPRESSED_SUFFIXES.items():
+        variant_path = path + suffix
+        try:
+            variant_stat = os.stat(variant_path)
+        except OSError:
+            continue
+        if variant_stat.st_mtime >= stat_result.st_mtime:
+            variants[coding] = (variant_path, variant_stat)
+    return variants
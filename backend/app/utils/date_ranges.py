@@ -0,0 +1,159 @@
+"""
+Available-dates sidecar files for program sources.
+
+Ingest writes ``{source}_dates.json`` next to ``{source}_programs.json``. It
+holds the UTC bounds of the source's program start times and the first and
+last start time of each channel. Start times are also grouped into runs in
+which no two consecutive start times are more than ``RUN_GAP_SECONDS`` apart.
+
+Within a run, consecutive start times are less than a day apart in local
+time for any timezone whose offset changes by less than 12 hours at once,
+so the local dates covered by a run are every date from its first start to
+its last. The dates a source covers in a timezone are therefore derived from
+the runs in O(days), without reading the programs.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.utils.columnar import program_column, program_epochs
+from app.utils.file_operations import write_json
+from app.utils.grid_engine import SECONDS_PER_DAY, LocalClock
+from app.utils.serialization import read_json_file
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DATES_SUFFIX = "_dates.json"
+RUN_GAP_SECONDS = 12 * 3600
+
+Program = Dict[str, Any]
+DateRanges = Dict[str, Any]
+FileSignature = Tuple[int, ...]
+
+
+def dates_path(source: str) -> Path:
+    """Return the path of a source's available-dates sidecar."""
+    return Path(settings.XMLTV_DATA_DIR) / f"{source}{DATES_SUFFIX}"
+
+
+def build_date_ranges(programs: Sequence[Program]) -> DateRanges:
+    """
+    Summarize the start times of a source's programs.
+
+    Args:
+        programs: The source's programs, as a list or columnar sequence
+
+    Returns:
+        Dict with ``start``/``end`` (earliest and latest UTC start, or None
+        for an empty source), ``runs`` ([first, last] start per run) and
+        ``channels`` (channel slug -> [first, last] start), all in whole
+        epoch seconds
+    """
+    starts = [math.floor(start) for start in program_epochs(programs, "start_time")]
+
+    channels: Dict[str, List[int]] = {}
+    for channel, start in zip(program_column(programs, "channel"), starts, strict=True):
+        if channel is None:
+            continue
+        bounds = channels.get(channel)
+        if bounds is None:
+            channels[channel] = [start, start]
+        elif start < bounds[0]:
+            bounds[0] = start
+        elif start > bounds[1]:
+            bounds[1] = start
+
+    runs: List[List[int]] = []
+    for start in sorted(set(starts)):
+        if runs and start - runs[-1][1] <= RUN_GAP_SECONDS:
+            runs[-1][1] = start
+        else:
+            runs.append([start, start])
+
+    return {
+        "start": runs[0][0] if runs else None,
+        "end": runs[-1][1] if runs else None,
+        "runs": runs,
+        "channels": channels,
+    }
+
+
+def covered_days(date_ranges: DateRanges, clock: LocalClock) -> List[int]:
+    """
+    Return the local days on which at least one program starts.
+
+    Args:
+        date_ranges: Output of ``build_date_ranges``
+        clock: Clock for the target timezone
+
+    Returns:
+        Sorted local day indices (days since 1970-01-01)
+    """
+    days = set()
+    for first, last in date_ranges["runs"]:
+        first_day = clock.to_wall(first) // SECONDS_PER_DAY
+        last_day = clock.to_wall(last) // SECONDS_PER_DAY
+        days.update(range(min(first_day, last_day), max(first_day, last_day) + 1))
+    return sorted(days)
+
+
+def write_date_ranges(
+    source: str, programs: Sequence[Program], source_signature: FileSignature
+) -> Path:
+    """
+    Write the available-dates sidecar for a source.
+
+    Args:
+        source: Source identifier
+        programs: Programs as loaded from the programs file
+        source_signature: (st_mtime_ns, st_size) of the programs file the
+            programs were loaded from
+
+    Returns:
+        Path of the sidecar file
+
+    Raises:
+        OSError: If there are issues writing the file
+    """
+    date_ranges = build_date_ranges(programs)
+    date_ranges.update(format=FORMAT_VERSION, source_signature=list(source_signature))
+    path = dates_path(source)
+    write_json(path.name, date_ranges)
+    return path
+
+
+def load_date_ranges(
+    source: str, source_signature: FileSignature
+) -> Optional[DateRanges]:
+    """
+    Read a source's available-dates sidecar, if it is current.
+
+    Args:
+        source: Source identifier
+        source_signature: (st_mtime_ns, st_size) of the source's programs file
+
+    Returns:
+        The date ranges, or None if the sidecar is missing, unreadable or was
+        built from a different version of the programs file
+    """
+    path = dates_path(source)
+    try:
+        date_ranges = read_json_file(path)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring unreadable dates sidecar {path}: {e}")
+        return None
+
+    if not isinstance(date_ranges, dict):
+        return None
+    if date_ranges.get("format") != FORMAT_VERSION:
+        return None
+    if tuple(date_ranges.get("source_signature", ())) != tuple(source_signature):
+        return None
+    return date_ranges
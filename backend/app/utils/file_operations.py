@@ -3,12 +3,13 @@ import json
 import logging
 import lzma
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 from aiohttp import ClientResponseError, ClientTimeout
 
 from app.config import settings
+from app.utils.serialization import file_indent, read_json_file, write_json_file
 
 logger = logging.getLogger(__name__)
 
@@ -60,14 +61,15 @@ async def download_file(
         logger.error(f"Unexpected error downloading {file_url}: {str(e)}")
         return False
 
-def write_json(filename: str, data: Any, indent: int = 4) -> None:
+def write_json(filename: str, data: Any, indent: Optional[int] = None) -> None:
     """
     Write data to a JSON file.
 
     Args:
         filename: Name of the file to write
         data: Data to write to the file
-        indent: Number of spaces for indentation
+        indent: Number of spaces for indentation (default: compact or
+            indented according to JSON_COMPACT_FILES)
 
     Raises:
         OSError: If there are issues writing the file
@@ -77,8 +79,9 @@ def write_json(filename: str, data: Any, indent: int = 4) -> None:
     file_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        with file_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
+        write_json_file(
+            file_path, data, indent=file_indent() if indent is None else indent
+        )
         logger.info(f"Data saved to {file_path}")
     except (OSError, TypeError) as e:
         logger.error(f"Error writing to {filename}: {str(e)}")
@@ -101,8 +104,7 @@ def load_json(filename: str) -> Any:
     file_path = Path(settings.XMLTV_DATA_DIR) / filename
 
     try:
-        with file_path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_json_file(file_path)
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         raise
@@ -136,6 +138,30 @@ def load_sources(filename: str) -> Dict[str, Any]:
         logger.error(f"Invalid JSON in source configuration {filename}: {str(e)}")
         raise
 
+def load_configured_sources() -> List[Dict[str, Any]]:
+    """
+    Load the configured XMLTV sources, main and local files merged.
+
+    Local sources take precedence over main sources with the same id. The
+    local file is optional.
+
+    Returns:
+        Source entries in configuration order
+
+    Raises:
+        FileNotFoundError: If the main configuration file doesn't exist
+        json.JSONDecodeError: If either file contains invalid JSON
+    """
+    merged_sources: Dict[str, Dict[str, Any]] = {}
+    for filename in (settings.XMLTV_SOURCES, settings.XMLTV_SOURCES_LOCAL):
+        if filename == settings.XMLTV_SOURCES_LOCAL and not Path(filename).exists():
+            continue
+        sources: List[Dict[str, Any]] = load_sources(filename)  # type: ignore
+        for source in sources:
+            if "id" in source:
+                merged_sources[source["id"]] = source
+    return list(merged_sources.values())
+
 def load_list(file_path: str) -> List[Dict[str, Any]]:
     """
     Load JSON data from a file and return it as a list of dictionaries.
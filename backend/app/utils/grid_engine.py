@@ -0,0 +1,405 @@
+"""
+Single-pass day grid engine working on integer epoch seconds.
+
+Programs are converted from UTC to local wall-clock seconds once, split at
+local midnight, bucketed by local day and gap-filled without any string
+round trips. Strings are only produced for the programs that end up in the
+output.
+
+Output is identical to the string-based pipeline this replaced (convert each
+program with ``astimezone``, format, re-parse and ``localize``), including its
+use of ``pytz`` ``localize(is_dst=False)`` when comparing times around DST
+transitions. ``LocalClock`` replicates those pytz rules on integers.
+"""
+
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.utils.time_utils import PytzTimezone, process_timezone
+
+SECONDS_PER_DAY = 86400
+# Anything shorter than this is not worth a "No Data Available" filler
+MIN_GAP_SECONDS = 60
+
+_EPOCH = datetime(1970, 1, 1)
+_NON_EXISTENT_SHIFT = 6 * 3600
+
+Program = Dict[str, Any]
+# (UTC start epoch, UTC end epoch, program)
+TimedProgram = Tuple[float, float, Program]
+# (local start wall seconds, local end wall seconds, program, is continuation)
+Segment = Tuple[int, int, Program, bool]
+
+
+def _naive_to_seconds(dt: datetime) -> int:
+    return (dt - _EPOCH) // timedelta(seconds=1)
+
+
+def format_wall(wall: int) -> str:
+    """Format local wall-clock seconds as ``YYYY-MM-DD HH:MM:SS``."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(wall))
+
+
+def format_day(day: int) -> str:
+    """Format a local day index (days since 1970-01-01) as ``YYYY-MM-DD``."""
+    return time.strftime("%Y-%m-%d", time.gmtime(day * SECONDS_PER_DAY))
+
+
+def parse_day(date_str: str) -> int:
+    """Convert ``YYYY-MM-DD`` to a local day index."""
+    return (date.fromisoformat(date_str) - _EPOCH.date()).days
+
+
+class LocalClock:
+    """
+    UTC epoch <-> local wall-clock conversion for one pytz timezone.
+
+    ``to_wall`` matches ``datetime.astimezone(tz)`` and ``localize_offset``
+    matches ``tz.localize(naive, is_dst=False)``, including its handling of
+    ambiguous and non-existent wall times.
+    """
+
+    def __init__(self, timezone: Union[str, PytzTimezone]) -> None:
+        timezone = process_timezone(timezone)
+        self.timezone = timezone
+        transition_times = getattr(timezone, "_utc_transition_times", None)
+        if transition_times is None:
+            offset = timezone.utcoffset(None)
+            self._fixed_offset: Optional[int] = int(offset.total_seconds())
+            self._transitions: List[int] = []
+            self._infos: List[Tuple[int, bool]] = []
+        else:
+            self._fixed_offset = None
+            self._transitions = [_naive_to_seconds(t) for t in transition_times]
+            self._infos = [
+                (int(utcoffset.total_seconds()), bool(dst))
+                for utcoffset, dst, _ in timezone._transition_info
+            ]
+
+    def _info_at(self, epoch: int) -> Tuple[int, bool]:
+        idx = max(0, bisect_right(self._transitions, epoch) - 1)
+        return self._infos[idx]
+
+    def utc_offset(self, epoch: int) -> int:
+        """Return the UTC offset in seconds in effect at a UTC instant."""
+        if self._fixed_offset is not None:
+            return self._fixed_offset
+        return self._info_at(epoch)[0]
+
+    def to_wall(self, epoch: int) -> int:
+        """Convert a UTC epoch to local wall-clock seconds."""
+        return epoch + self.utc_offset(epoch)
+
+    def localize_offset(self, wall: int) -> int:
+        """Return the offset pytz assigns to a naive local time."""
+        if self._fixed_offset is not None:
+            return self._fixed_offset
+
+        # Candidate offsets keyed by the UTC instant they produce
+        possible: Dict[int, Tuple[int, bool]] = {}
+        for delta in (-SECONDS_PER_DAY, SECONDS_PER_DAY):
+            offset, dst = self._info_at(wall + delta)
+            if self.utc_offset(wall - offset) == offset:
+                possible.setdefault(wall - offset, (offset, dst))
+
+        if len(possible) == 1:
+            return next(iter(possible.values()))[0]
+        if not possible:
+            # Skipped by a forward transition: take the offset from before it
+            return self.localize_offset(wall - _NON_EXISTENT_SHIFT)
+
+        standard = {utc: info for utc, info in possible.items() if not info[1]}
+        candidates = standard or possible
+        return candidates[max(candidates)][0]
+
+
+@lru_cache(maxsize=128)
+def local_clock(timezone: Union[str, PytzTimezone]) -> LocalClock:
+    """Return a shared LocalClock for a timezone; clocks are immutable."""
+    return LocalClock(timezone)
+
+
+def split_segments(entries: Iterable[TimedProgram], clock: LocalClock) -> List[Segment]:
+    """
+    Convert programs to local time, splitting any that cross local midnight.
+
+    The part before midnight ends at 23:59:59; the part after midnight starts
+    at 00:00:00 and is marked as a continuation. Programs ending exactly at
+    midnight produce no continuation.
+    """
+    segments: List[Segment] = []
+    for start, end, program in entries:
+        start_wall = clock.to_wall(int(start))
+        end_wall = clock.to_wall(int(end))
+        start_day = start_wall // SECONDS_PER_DAY
+        end_day = end_wall // SECONDS_PER_DAY
+
+        if start_day == end_day:
+            segments.append((start_wall, end_wall, program, False))
+            continue
+
+        segments.append(
+            (start_wall, (start_day + 1) * SECONDS_PER_DAY - 1, program, False)
+        )
+        next_day = end_day * SECONDS_PER_DAY
+        if next_day < end_wall:
+            segments.append((next_day, end_wall, program, True))
+    return segments
+
+
+def _program_output(segment: Segment) -> Program:
+    start_wall, end_wall, program, continuation = segment
+    if continuation:
+        return {
+            **program,
+            "start_time": format_wall(start_wall),
+            "end_time": format_wall(end_wall),
+            "title": f"{program['title']} (cont)",
+        }
+    return {
+        **program,
+        "start_time": format_wall(start_wall),
+        "end_time": format_wall(end_wall),
+    }
+
+
+def _no_data_program(
+    start_wall: int, start_abs: int, end_wall: int, end_abs: int, channel: str
+) -> Program:
+    return {
+        "start_time": format_wall(start_wall),
+        "start": "N/A",
+        "end_time": format_wall(end_wall),
+        "end": "N/A",
+        "length": str(timedelta(seconds=end_abs - start_abs)),
+        "channel": channel,
+        "title": "No Data Available",
+        "subtitle": "N/A",
+        "description": "N/A",
+        "categories": ["N/A"],
+        "episode": "N/A",
+        "original_air_date": "N/A",
+        "rating": "N/A",
+    }
+
+
+def empty_day(day: int, clock: LocalClock, channel: str) -> List[Program]:
+    """Return the single filler entry for a channel with no programs on a day."""
+    day_start = day * SECONDS_PER_DAY
+    day_end = day_start + SECONDS_PER_DAY - 1
+    return [
+        _no_data_program(
+            day_start,
+            day_start - clock.localize_offset(day_start),
+            day_end,
+            day_end - clock.localize_offset(day_end),
+            channel,
+        )
+    ]
+
+
+def fill_day(
+    day: int,
+    segments: List[Segment],
+    clock: LocalClock,
+    channel: str,
+    min_length: int,
+) -> List[Program]:
+    """
+    Order one channel's segments for a local day and fill the gaps.
+
+    Gaps longer than a minute, including at the start and end of the day,
+    become "No Data Available" entries.
+
+    Args:
+        day: Local day index
+        segments: Segments starting on that day, in source order
+        clock: Clock for the target timezone
+        channel: Channel slug used for filler entries
+        min_length: Programs must be longer than this many seconds to be kept
+
+    Returns:
+        Output program dicts for the day
+    """
+    segments = sorted(segments, key=lambda segment: segment[0])
+    day_start = day * SECONDS_PER_DAY
+    day_end = day_start + SECONDS_PER_DAY - 1
+    day_end_abs = day_end - clock.localize_offset(day_end)
+
+    current_wall = day_start
+    current_abs = day_start - clock.localize_offset(day_start)
+    filled: List[Program] = []
+
+    for segment in segments:
+        start_wall, end_wall = segment[0], segment[1]
+        start_abs = start_wall - clock.localize_offset(start_wall)
+        end_abs = end_wall - clock.localize_offset(end_wall)
+
+        if start_abs - current_abs > MIN_GAP_SECONDS:
+            filled.append(
+                _no_data_program(
+                    current_wall, current_abs, start_wall - 1, start_abs - 1, channel
+                )
+            )
+
+        if end_abs - start_abs > min_length:
+            filled.append(_program_output(segment))
+
+        current_wall, current_abs = end_wall, end_abs
+
+    if day_end_abs - current_abs > MIN_GAP_SECONDS:
+        filled.append(
+            _no_data_program(
+                current_wall + 1, current_abs + 1, day_end, day_end_abs, channel
+            )
+        )
+
+    return filled
+
+
+def fill_window(
+    entries: Iterable[TimedProgram],
+    clock: LocalClock,
+    start: int,
+    end: int,
+    channel: str,
+) -> List[Program]:
+    """
+    Clip one channel's programs to a time window and fill the gaps.
+
+    Follows the per-channel day grid conventions: programs running past the
+    window end at its last second, and gaps longer than a minute become "No
+    Data Available" entries ending one second before the next program, or
+    starting one second after the last one at the end of the window.
+
+    Args:
+        entries: Programs overlapping the window, in source order
+        clock: Clock for the target timezone
+        start: Window start, in UTC epoch seconds
+        end: Window end (exclusive), in UTC epoch seconds
+        channel: Channel slug used for filler entries
+
+    Returns:
+        Output program dicts covering the window, in start-time order
+    """
+    last = end - 1
+    cursor = start
+    filled: List[Program] = []
+
+    for program_start, program_end, program in sorted(
+        entries, key=lambda entry: entry[0]
+    ):
+        clipped_start = max(int(program_start), start)
+        clipped_end = min(int(program_end), last)
+        if clipped_end <= clipped_start:
+            continue
+
+        if clipped_start - cursor > MIN_GAP_SECONDS:
+            filled.append(
+                _no_data_program(
+                    clock.to_wall(cursor),
+                    cursor,
+                    clock.to_wall(clipped_start - 1),
+                    clipped_start - 1,
+                    channel,
+                )
+            )
+
+        filled.append(
+            {
+                **program,
+                "start_time": format_wall(clock.to_wall(clipped_start)),
+                "end_time": format_wall(clock.to_wall(clipped_end)),
+            }
+        )
+        cursor = max(cursor, clipped_end)
+
+    if last - cursor > MIN_GAP_SECONDS:
+        # As in the day grid, a trailing gap starts after the last program
+        gap_start = cursor + 1 if filled else cursor
+        filled.append(
+            _no_data_program(
+                clock.to_wall(gap_start), gap_start, clock.to_wall(last), last, channel
+            )
+        )
+
+    return filled
+
+
+def build_channel_schedule(
+    entries: Iterable[TimedProgram], timezone: PytzTimezone, channel: str
+) -> Dict[str, List[Program]]:
+    """
+    Build the gap-filled, per-day schedule of a single channel.
+
+    Args:
+        entries: The channel's programs in source order
+        timezone: Target timezone
+        channel: Channel slug
+
+    Returns:
+        Programs grouped by local date (YYYY-MM-DD), in date order
+    """
+    clock = local_clock(timezone)
+    days: Dict[int, List[Segment]] = {}
+    for segment in split_segments(entries, clock):
+        days.setdefault(segment[0] // SECONDS_PER_DAY, []).append(segment)
+
+    return {
+        format_day(day): fill_day(day, days[day], clock, channel, min_length=0)
+        for day in sorted(days)
+    }
+
+
+def build_day_schedules(
+    entries_by_channel: Dict[str, List[TimedProgram]],
+    timezone: PytzTimezone,
+    date_str: str,
+    all_channels: Iterable[str],
+) -> Optional[Dict[str, List[Program]]]:
+    """
+    Build one local day of gap-filled programming for a set of channels.
+
+    Args:
+        entries_by_channel: Candidate programs per channel, in source order;
+            programs that do not start on the day after splitting are ignored
+        timezone: Target timezone
+        date_str: Local date (YYYY-MM-DD)
+        all_channels: Channels to include, in output order; channels without
+            programs get a full-day filler entry
+
+    Returns:
+        Programs keyed by channel slug, or None if no program in any channel
+        starts on the requested day
+    """
+    clock = local_clock(timezone)
+    day = parse_day(date_str)
+
+    day_segments: Dict[str, List[Segment]] = {}
+    for channel, entries in entries_by_channel.items():
+        segments = [
+            segment
+            for segment in split_segments(entries, clock)
+            if segment[0] // SECONDS_PER_DAY == day
+        ]
+        if segments:
+            day_segments[channel] = segments
+
+    if not day_segments:
+        return None
+
+    schedules: Dict[str, List[Program]] = {}
+    for channel in all_channels:
+        if channel in schedules:
+            continue
+        segments = day_segments.get(channel)
+        if segments:
+            schedules[channel] = fill_day(
+                day, segments, clock, channel, min_length=MIN_GAP_SECONDS
+            )
+        else:
+            schedules[channel] = empty_day(day, clock, channel)
+    return schedules
@@ -0,0 +1,96 @@
+"""ETag validators and Cache-Control freshness for the read endpoints."""
+
+import hashlib
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.config import settings
+
+
+def build_etag(version: str, *parts: object) -> str:
+    """
+    Build a weak ETag for a response.
+
+    Args:
+        version: Version of the data the response is built from
+        *parts: Normalized parameters that shape the response body
+
+    Returns:
+        A weak entity tag, e.g. ``W/"3f2a..."``
+    """
+    key = "|".join([version, *(str(part) for part in parts)])
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def ingest_interval(source: str) -> int:
+    """Return how often a source is re-ingested by the scheduler, in seconds."""
+    if source.startswith("xmlepg_"):
+        return settings.XMLEPG_REFRESH_HOURS * 3600
+    return settings.SOURCES_REFRESH_HOURS * 3600
+
+
+def seconds_until_next_ingest(
+    source: str, modified: float, now: Optional[float] = None
+) -> int:
+    """
+    Estimate how long a source's data will stay unchanged on disk.
+
+    Ingest runs on a fixed interval, so the next run is expected one interval
+    after the file was last written. If that point has already passed (e.g.
+    a run failed), the estimate rolls forward by whole intervals.
+
+    Args:
+        source: Source identifier
+        modified: Modification time of the source data, in epoch seconds
+        now: Current time in epoch seconds (default: now)
+
+    Returns:
+        Seconds until the next expected ingest, never less than
+        HTTP_CACHE_MIN_MAX_AGE
+    """
+    if now is None:
+        now = time.time()
+    interval = ingest_interval(source)
+    remaining = interval - (now - modified) % interval
+    return max(int(remaining), settings.HTTP_CACHE_MIN_MAX_AGE)
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str, max_age: int
+) -> Optional[Response]:
+    """
+    Attach validators to a response, or answer 304 if the client is current.
+
+    Args:
+        request: Incoming request, checked for If-None-Match
+        response: Response the endpoint's result will be rendered into
+        etag: ETag of the response body
+        max_age: Freshness lifetime in seconds
+
+    Returns:
+        A 304 Not Modified response to return as-is, or None if the endpoint
+        should build its full response
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(max_age, 0)}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
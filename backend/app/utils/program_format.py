@@ -0,0 +1,60 @@
+"""Program and channel entries as the read endpoints return them."""
+
+from datetime import datetime
+from typing import Any, Dict
+
+import pytz
+
+
+def parse_datetime(datetime_str: str, timezone: pytz.tzinfo.BaseTzInfo) -> datetime:
+    """Parse an ISO 8601 time from a data file and express it in ``timezone``."""
+    dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
+    return dt.astimezone(timezone)
+
+
+def format_program(
+    program: Dict[str, Any], target_timezone: pytz.tzinfo.BaseTzInfo
+) -> Dict[str, Any]:
+    """
+    Return a program as listed by the category and search endpoints.
+
+    Start and end are ISO 8601 times in ``target_timezone``, so the first ten
+    characters of ``start`` are the program's local date.
+    """
+    program_start = parse_datetime(program["start_time"], target_timezone)
+    program_end = parse_datetime(program["end_time"], target_timezone)
+
+    return {
+        "title": program["title"],
+        "start": program_start.isoformat(),
+        "end": program_end.isoformat(),
+        "description": program.get("description", ""),
+        "categories": program.get("categories", []),
+        "subtitle": program.get("subtitle", ""),
+        "episode": program.get("episode", ""),
+        "original_air_date": program.get("original_air_date", ""),
+        "rating": program.get("rating", ""),
+    }
+
+
+def listing_channel(channel_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a channel as listed by the category and search endpoints."""
+    return {
+        "id": channel_info["channel_id"],
+        "name": channel_info["channel_name"],
+        "icon": channel_info["channel_logo"],
+        "slug": channel_info["channel_slug"],
+        "lcn": channel_info["channel_number"],
+        "group": channel_info["channel_group"],
+    }
+
+
+def grid_channel(channel_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a channel as listed by the day grid and window endpoints."""
+    return {
+        "id": channel_info["channel_id"],
+        "name": channel_info["channel_names"],
+        "icon": channel_info["channel_logo"],
+        "slug": channel_info["channel_slug"],
+        "lcn": channel_info["channel_number"],
+    }
@@ -0,0 +1,129 @@
+"""
+Field projection and sparse encoding of program payloads.
+
+Endpoints wrap their program dicts in ``Projected`` instead of copying them.
+The wrappers are resolved by ``serialization.dumps`` while the response is
+encoded, so cached grids are shared untouched and only the smaller projected
+dicts are built, one program at a time.
+"""
+
+from typing import Annotated, Any, Dict, Optional, Tuple
+
+from fastapi import Depends, Query
+
+Program = Dict[str, Any]
+
+# Values ingest writes when an XMLTV element is missing
+_PLACEHOLDER_STRINGS = frozenset(("", "N/A"))
+
+
+def is_placeholder(value: Any) -> bool:
+    """Return whether a program value carries no information."""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value in _PLACEHOLDER_STRINGS
+    if isinstance(value, list):
+        return all(is_placeholder(item) for item in value)
+    return False
+
+
+def _is_placeholder_fast(value: Any) -> bool:
+    # Most program values are strings; skip the call for them
+    if value.__class__ is str:
+        return value in _PLACEHOLDER_STRINGS
+    return is_placeholder(value)
+
+
+class ProgramProjection:
+    """
+    Which keys of each program to encode.
+
+    Args:
+        fields: Keys to keep, in output order; None keeps every key
+        sparse: Drop keys whose value is a placeholder (None, "", "N/A", or a
+            list of only those)
+    """
+
+    __slots__ = ("fields", "sparse")
+
+    def __init__(self, fields: Optional[Tuple[str, ...]], sparse: bool) -> None:
+        self.fields = fields
+        self.sparse = sparse
+
+    @property
+    def etag_part(self) -> str:
+        """Normalized form of the projection, for ETags."""
+        fields = ",".join(self.fields) if self.fields is not None else "*"
+        return f"fields={fields};sparse={int(self.sparse)}"
+
+    def project(self, program: Optional[Program]) -> Optional[Program]:
+        """Return the projected copy of a single program."""
+        if program is None:
+            return None
+        if self.fields is None:
+            return {
+                key: value
+                for key, value in program.items()
+                if not _is_placeholder_fast(value)
+            }
+        if self.sparse:
+            return {
+                key: program[key]
+                for key in self.fields
+                if key in program and not _is_placeholder_fast(program[key])
+            }
+        return {key: program[key] for key in self.fields if key in program}
+
+
+class Projected:
+    """A program, or a list of programs, to be projected when encoded."""
+
+    __slots__ = ("value", "projection")
+
+    def __init__(self, value: Any, projection: ProgramProjection) -> None:
+        self.value = value
+        self.projection = projection
+
+    def resolve(self) -> Any:
+        """Return the JSON-compatible projected value."""
+        if isinstance(self.value, list):
+            return [self.projection.project(program) for program in self.value]
+        return self.projection.project(self.value)
+
+
+def project(value: Any, projection: Optional[ProgramProjection]) -> Any:
+    """Wrap a program or list of programs for projection, if one was requested."""
+    if projection is None:
+        return value
+    return Projected(value, projection)
+
+
+def etag_parts(projection: Optional[ProgramProjection]) -> Tuple[str, ...]:
+    """ETag parts for a projection; empty without one, so ETags are unchanged."""
+    return () if projection is None else (projection.etag_part,)
+
+
+def program_projection(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated program keys to return (default: all)",
+    ),
+    sparse: bool = Query(
+        default=False,
+        description='Omit program values that are empty or "N/A"',
+    ),
+) -> Optional[ProgramProjection]:
+    """Dependency parsing the ``fields`` and ``sparse`` query parameters."""
+    names = None
+    if fields:
+        names = tuple(
+            dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())
+        )
+    if not names and not sparse:
+        return None
+    return ProgramProjection(names or None, sparse)
+
+
+# Route parameter type for endpoints that accept ``fields`` and ``sparse``
+ProjectionParam = Annotated[Optional[ProgramProjection], Depends(program_projection)]
@@ -0,0 +1,141 @@
+"""
+JSON encoding and decoding for data files and API responses.
+
+Uses ``orjson`` when it is installed and falls back to the standard library
+``json`` module otherwise. Both backends produce UTF-8 JSON without ASCII
+escaping, and decode errors are raised as ``json.JSONDecodeError``.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.utils.projection import Projected
+from app.utils.server_timing import phase
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    # Only called for values the encoder does not support natively
+    if isinstance(obj, Projected):
+        return obj.resolve()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(data: Any, indent: Optional[int] = None) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON.
+
+    ``Projected`` program payloads are projected as they are encoded.
+
+    Args:
+        data: Data to serialize
+        indent: Spaces of indentation, or None for compact output. orjson
+            only supports two-space indentation and uses it for any value.
+
+    Returns:
+        The encoded JSON document
+
+    Raises:
+        TypeError: If the data is not JSON serializable
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        try:
+            return orjson.dumps(data, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            pass
+        # Non-string keys are rare and make orjson noticeably slower, so
+        # only allow them on a second attempt
+        try:
+            return orjson.dumps(
+                data, default=_default, option=option | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError as e:
+            raise TypeError(str(e)) from e
+
+    if indent:
+        return json.dumps(
+            data, ensure_ascii=False, indent=indent, default=_default
+        ).encode("utf-8")
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def file_indent() -> Optional[int]:
+    """Return the indentation for data files written by ingest."""
+    return None if settings.JSON_COMPACT_FILES else 2
+
+
+def read_json_file(path: Path) -> Any:
+    """
+    Read and decode a JSON file.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    return loads(path.read_bytes())
+
+
+def write_json_file(path: Path, data: Any, indent: Optional[int] = None) -> None:
+    """
+    Encode data and write it to a JSON file.
+
+    Raises:
+        OSError: If there are issues writing the file
+        TypeError: If the data is not JSON serializable
+    """
+    path.write_bytes(dumps(data, indent=indent))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fastest available encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(
+    content: Any, response: Optional[Response] = None
+) -> FastJSONResponse:
+    """
+    Render an endpoint result directly with the fast encoder.
+
+    Returning a response object bypasses FastAPI's response model validation
+    and serialization. For large ``Dict[str, Any]`` payloads, that costs more
+    than encoding them.
+
+    Args:
+        content: JSON-compatible data to render
+        response: Injected response whose headers (e.g. ETag) should be kept
+
+    Returns:
+        The rendered response
+    """
+    headers = dict(response.headers) if response is not None else None
+    with phase("serialize"):
+        return FastJSONResponse(content, headers=headers)
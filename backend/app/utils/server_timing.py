@@ -0,0 +1,105 @@
+"""
+Per-request phase timings for the ``Server-Timing`` header.
+
+``ServerTimingMiddleware`` starts a ``PhaseTimer`` for each request and
+handlers wrap the expensive steps of the read path in ``phase()``. Outside a
+timed request ``phase()`` returns a shared no-op context manager, so timing
+that is switched off costs one context variable lookup per phase.
+"""
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import ContextManager, Dict, Optional
+
+_NO_PHASE: ContextManager[None] = nullcontext()
+
+_current_timer: "ContextVar[Optional[PhaseTimer]]" = ContextVar(
+    "server_timing", default=None
+)
+
+
+class PhaseTimer:
+    """
+    Durations of the named phases of one request, summed per name.
+
+    Used as a context manager around the request: while it is entered,
+    ``phase()`` records into this timer.
+    """
+
+    __slots__ = ("started", "durations", "_token")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        # Seconds per phase name, in the order phases first ran
+        self.durations: Dict[str, float] = {}
+        self._token: Optional[Token[Optional[PhaseTimer]]] = None
+
+    def __enter__(self) -> "PhaseTimer":
+        self.started = time.perf_counter()
+        self._token = _current_timer.set(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._token is not None:
+            _current_timer.reset(self._token)
+            self._token = None
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add ``seconds`` to phase ``name``."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Return seconds since the request started."""
+        return time.perf_counter() - self.started
+
+    def header_value(self) -> str:
+        """
+        Return the phases and the total so far as a ``Server-Timing`` value.
+
+        e.g. ``load;dur=12.4, grid;dur=30.1, total;dur=45.0``
+        """
+        metrics = [
+            f"{name};dur={seconds * 1000:.1f}"
+            for name, seconds in self.durations.items()
+        ]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def summary(self) -> str:
+        """Return the phases for a log line, e.g. ``load=12.4ms grid=30.1ms``."""
+        return " ".join(
+            f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.durations.items()
+        )
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: PhaseTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.started)
+
+
+def phase(name: str) -> ContextManager[None]:
+    """
+    Time a block as phase ``name`` of the current request.
+
+    Phases are recorded on the event loop: wrap the ``await`` of work sent to
+    an executor, not the function run there. Time spent waiting for a
+    computation another request started counts, since this request waited.
+
+    Args:
+        name: Metric name for the header, a token such as ``load`` or ``grid``
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return _NO_PHASE
+    return _Phase(timer, name)
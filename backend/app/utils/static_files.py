@@ -0,0 +1,66 @@
+"""Static file serving that prefers pre-compressed copies written at ingest."""
+
+import mimetypes
+import os
+from typing import Optional, Tuple, Union
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+from app.utils.columnar import COLUMNS_SUFFIX
+from app.utils.compression import fresh_variants, negotiate_encoding
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves ``.br``/``.gz`` siblings to clients accepting them.
+
+    Nothing is compressed at request time: a file without an up-to-date
+    sibling for an acceptable coding is served as is. Each coding has its
+    own ETag, and ranges apply to the bytes actually sent.
+
+    The columnar program snapshots and their lock file live in the same
+    directory but are internal to the API, so they are never served.
+    """
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        parts = path.replace(os.sep, "/").split("/")
+        if any(part.endswith(COLUMNS_SUFFIX) for part in parts):
+            return "", None
+        return super().lookup_path(path)
+
+    def file_response(
+        self,
+        full_path: Union[str, "os.PathLike[str]"],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        variants = fresh_variants(os.fspath(full_path), stat_result)
+        coding = negotiate_encoding(
+            request_headers.get("accept-encoding", ""), variants
+        )
+        if coding is None:
+            response = FileResponse(
+                full_path, status_code=status_code, stat_result=stat_result
+            )
+        else:
+            variant_path, variant_stat = variants[coding]
+            media_type, _ = mimetypes.guess_type(os.fspath(full_path))
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                stat_result=variant_stat,
+                media_type=media_type or "text/plain",
+                headers={"Content-Encoding": coding},
+            )
+        # Any file may gain compressed copies at the next ingest
+        response.headers["Vary"] = "Accept-Encoding"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
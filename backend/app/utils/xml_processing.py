@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from lxml import etree
 
 from app.config import settings
+from app.services.ingest_hooks import after_source_ingest
 from app.utils.channel_name import clean_channel_name, get_channel_group
 from app.utils.file_operations import write_json
 
@@ -183,5 +184,7 @@ async def process_xml_file(file_id: str, save_path: str) -> None:  # noqa: C901
         write_json(f'{file_id}_programs.json', programs)
         write_json(f"{file_id}_datacheck.json", unchanged_channels)
 
+        await after_source_ingest(file_id)
+
     except Exception as exc:
         print(f"Error processing XML file {file_id}.xml: {str(exc)}")
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Compare the full-source category scan with the category index.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_category_index
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import pytz
+
+from app.routers.epg import is_movies_program, is_sports_program
+from app.services.category_index import CategoryIndex
+from app.utils.columnar import program_column
+from app.utils.program_format import parse_datetime
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _compare(
+    label: str,
+    predicate: Callable[[Optional[List[str]]], bool],
+    programs: List[Dict[str, Any]],
+    index: CategoryIndex,
+    start_date: datetime,
+    end_date: datetime,
+) -> None:
+    target_timezone = start_date.tzinfo
+
+    def scan() -> List[int]:
+        start_times = program_column(programs, "start_time")
+        categories = program_column(programs, "categories")
+        return [
+            position
+            for position, start_time in enumerate(start_times)
+            if start_date <= parse_datetime(start_time, target_timezone) < end_date
+            and predicate(categories[position])
+        ]
+
+    def lookup() -> List[int]:
+        return index.positions(
+            index.matching(lambda category: predicate([category])),
+            start_date.timestamp(),
+            end_date.timestamp(),
+        )
+
+    print(f"Select {label} programs:")
+    before = _timed("full scan", scan)
+    after = _timed("category index", lookup)
+    print(f"  speedup x{before / after:.1f}")
+    assert scan() == lookup()
+
+
+def main() -> None:
+    programs, _ = make_source(channel_count=200, days=14)
+    target_timezone = pytz.timezone("Australia/Sydney")
+    start_date = datetime.now(target_timezone).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    end_date = start_date + timedelta(days=7)
+    print(f"{len(programs)} programs, 7 day window")
+
+    _timed("build index (once per ingest)", lambda: CategoryIndex(programs), 1)
+    index = CategoryIndex(programs)
+
+    _compare("sports", is_sports_program, programs, index, start_date, end_date)
+    _compare("movies", is_movies_program, programs, index, start_date, end_date)
+
+
+if __name__ == "__main__":
+    main()
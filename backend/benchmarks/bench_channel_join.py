@@ -0,0 +1,82 @@
+"""
+Compare the linear channel metadata scan with the slug index.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_channel_join
+"""
+
+import time
+from typing import Any, Callable, Dict, List
+
+from app.services.source_store import SourceData
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], int], repeat: int = 3) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<24} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], int]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    programs, channels = make_source(channel_count=200, days=14)
+    source_data = SourceData(
+        source="synthetic",
+        version="bench",
+        modified=0.0,
+        programs=programs,
+        channels=channels,
+    )
+    print(f"{len(channels)} channels, {len(programs)} programs")
+
+    def scan_per_program() -> int:
+        found = 0
+        for program in programs:
+            channel_info = next(
+                (c for c in channels if c["channel_slug"] == program["channel"]),
+                None,
+            )
+            found += channel_info is not None
+        return found
+
+    def index_per_program() -> int:
+        channels_by_slug: Dict[str, Any] = source_data.channels_by_slug
+        return sum(
+            channels_by_slug.get(program["channel"]) is not None
+            for program in programs
+        )
+
+    slugs: List[str] = [channel["channel_slug"] for channel in channels]
+
+    def scan_per_channel() -> int:
+        return sum(
+            next((c for c in channels if c["channel_slug"] == slug), None) is not None
+            for slug in slugs
+        )
+
+    def index_per_channel() -> int:
+        channels_by_slug = source_data.channels_by_slug
+        return sum(channels_by_slug.get(slug) is not None for slug in slugs)
+
+    _timed("index build", lambda: len(source_data.channels_by_slug), repeat=1)
+
+    print("Per-program join (sports/movies, every program matching):")
+    before = _timed("linear scan", scan_per_program)
+    after = _timed("slug index", index_per_program)
+    print(f"  speedup x{before / after:.0f}")
+
+    print("Per-channel join (one day of /py/epg/date):")
+    before = _timed("linear scan", scan_per_channel)
+    after = _timed("slug index", index_per_channel)
+    print(f"  speedup x{before / after:.0f}")
+
+
+if __name__ == "__main__":
+    main()
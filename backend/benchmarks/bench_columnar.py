@@ -0,0 +1,98 @@
+"""
+Compare loading a source from its JSON programs file and from columns.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_columnar
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from app.config import settings
+from app.services.schedule_index import build_timelines
+from app.utils import columnar
+from app.utils.file_operations import load_json, write_json
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 3) -> Any:
+    best, result = min((_run(func) for _ in range(repeat)), key=lambda r: r[0])
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return result
+
+
+def _run(func: Callable[[], Any]) -> Tuple[float, Any]:
+    started = time.perf_counter()
+    result = func()
+    return time.perf_counter() - started, result
+
+
+def _python_heap(func: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1e6
+
+
+def main() -> None:
+    programs, _ = make_source(channel_count=200, days=14)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.XMLTV_DATA_DIR = tmp
+        write_json("synthetic_programs.json", programs)
+        path = os.path.join(tmp, "synthetic_programs.json")
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        print(f"{len(programs)} programs")
+
+        _timed(
+            "write columns", lambda: columnar.refresh_program_columns("synthetic"), 1
+        )
+
+        def from_json() -> Any:
+            return build_timelines(load_json("synthetic_programs.json"))
+
+        def from_columns() -> Any:
+            return build_timelines(
+                columnar.load_program_columns("synthetic", signature)
+            )
+
+        print("Load and index a source:")
+        _timed("JSON + timelines", from_json)
+        _timed("columns + timelines", from_columns)
+
+        print("Python heap held per worker:")
+        print(f"  {'JSON + timelines':<32} {_python_heap(from_json):10.1f} MB")
+        print(f"  {'columns + timelines':<32} {_python_heap(from_columns):10.1f} MB")
+
+        json_programs = load_json("synthetic_programs.json")
+        columns = columnar.load_program_columns("synthetic", signature)
+
+        def key_scan(programs: Any) -> int:
+            start_times = columnar.program_column(programs, "start_time")
+            categories = columnar.program_column(programs, "categories")
+            return sum(
+                1
+                for start_time, program_categories in zip(
+                    start_times, categories, strict=True
+                )
+                if start_time and "Movie" in program_categories
+            )
+
+        print("Scan two keys (dates, sports, movies):")
+        _timed("JSON list", lambda: key_scan(json_programs))
+        _timed("columns", lambda: key_scan(columns))
+
+        print("Decode every program:")
+        _timed("JSON list", lambda: sum(1 for p in json_programs if p["title"]))
+        _timed("columns", lambda: sum(1 for p in columns if p["title"]))
+
+
+if __name__ == "__main__":
+    main()
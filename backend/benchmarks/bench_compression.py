@@ -0,0 +1,69 @@
+"""
+Measure response compression of a full day grid per content coding.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_compression
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+import pytz
+
+from app.services.compression_cache import CompressionCache
+from app.services.grid_cache import build_day_grid
+from app.services.source_store import SourceData
+from app.utils import serialization
+from app.utils.compression import RESPONSE_CODINGS, StreamCompressor
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _compress(coding: str, body: bytes) -> bytes:
+    compressor = StreamCompressor(coding)
+    return compressor.compress(body) + compressor.finish()
+
+
+def _compare(coding: str, body: bytes, cache: CompressionCache) -> None:
+    compressed = _compress(coding, body)
+    print(f"{coding}: {len(compressed) / 1024:.1f} KiB")
+    _timed("compress", lambda: _compress(coding, body))
+    key = (coding, 'W/"bench"', "/api/py/epg/date")
+    cache.put(key, compressed)
+    _timed("cache hit", lambda: cache.get(key))
+
+
+def main() -> None:
+    programs, channels = make_source(channel_count=200, days=14)
+    source_data = SourceData(
+        source="synthetic",
+        version="bench",
+        modified=0.0,
+        programs=programs,
+        channels=channels,
+    )
+    target_timezone = pytz.timezone("Australia/Sydney")
+    date_str = datetime.now(target_timezone).strftime("%Y-%m-%d")
+    body = serialization.dumps(build_day_grid(source_data, target_timezone, date_str))
+    print(f"Day grid of {len(body) / 1024:.1f} KiB")
+
+    cache = CompressionCache(max_bytes=64 * 1024 * 1024)
+    for coding in RESPONSE_CODINGS:
+        _compare(coding, body, cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare encoding a full day grid with projected and sparse encodings of it.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_projection
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytz
+
+from app.services.grid_cache import build_day_grid
+from app.services.source_store import SourceData
+from app.utils import serialization
+from app.utils.projection import ProgramProjection, project
+from benchmarks.synthetic import make_source
+
+GRID_FIELDS = ("title", "start_time", "end_time")
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _encode(
+    grid: List[Dict[str, Any]], projection: Optional[ProgramProjection]
+) -> bytes:
+    return serialization.dumps(
+        [
+            {**entry, "programs": project(entry["programs"], projection)}
+            for entry in grid
+        ]
+    )
+
+
+def _compare(
+    label: str, grid: List[Dict[str, Any]], projection: Optional[ProgramProjection]
+) -> None:
+    _timed(f"encode {label}", lambda: _encode(grid, projection))
+    size = len(_encode(grid, projection))
+    print(f"  {'payload':<32} {size / 1024:10.1f} KiB")
+
+
+def main() -> None:
+    programs, channels = make_source(channel_count=200, days=14)
+    source_data = SourceData(
+        source="synthetic",
+        version="bench",
+        modified=0.0,
+        programs=programs,
+        channels=channels,
+    )
+    target_timezone = pytz.timezone("Australia/Sydney")
+    date_str = datetime.now(target_timezone).strftime("%Y-%m-%d")
+    grid = build_day_grid(source_data, target_timezone, date_str)
+    print(f"Day grid of {len(grid)} channels, backend: {serialization.BACKEND}")
+
+    cases: List[Tuple[str, Optional[ProgramProjection]]] = [
+        ("full", None),
+        ("sparse", ProgramProjection(None, True)),
+        ("fields", ProgramProjection(GRID_FIELDS, False)),
+        ("fields, sparse", ProgramProjection(GRID_FIELDS, True)),
+    ]
+    for label, projection in cases:
+        _compare(label, grid, projection)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare a full scan of a source with the search index as the source grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_search
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from app.services.search_index import SearchIndex, tokenize
+from benchmarks.synthetic import make_source
+
+QUERY = "live football"
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.2f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _scan(programs: List[Dict[str, Any]], start: float, end: float) -> int:
+    terms = tokenize(QUERY)
+    matches = 0
+    for program in programs:
+        program_start = datetime.fromisoformat(program["start_time"]).timestamp()
+        if not start <= program_start < end:
+            continue
+        words = set(
+            tokenize(
+                " ".join(
+                    [program["title"], program["subtitle"], program["description"]]
+                )
+            )
+        )
+        if all(term in words for term in terms):
+            matches += 1
+    return matches
+
+
+def _compare(days: int, start: float, end: float) -> None:
+    programs, _ = make_source(channel_count=200, days=days)
+    print(f"{len(programs)} programs ({days} days), one day window:")
+    _timed("build index (once per ingest)", lambda: SearchIndex(programs), 1)
+    index = SearchIndex(programs)
+    _timed("full scan", lambda: _scan(programs, start, end))
+    _timed("search index", lambda: index.search(QUERY, start, end, 50))
+
+
+def main() -> None:
+    start = datetime.now(timezone.utc).timestamp()
+    end = (datetime.now(timezone.utc) + timedelta(days=1)).timestamp()
+
+    for days in (7, 14, 28):
+        _compare(days, start, end)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compare the previous stdlib JSON paths with app.utils.serialization.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import pytz
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.services.grid_cache import build_day_grid
+from app.services.source_store import SourceData
+from app.utils import serialization
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    programs, channels = make_source(channel_count=200, days=14)
+    source_data = SourceData(
+        source="synthetic",
+        version="bench",
+        modified=0.0,
+        programs=programs,
+        channels=channels,
+    )
+    print(f"{len(programs)} programs, backend: {serialization.BACKEND}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        indented = Path(tmp) / "indented.json"
+        compact = Path(tmp) / "compact.json"
+
+        def write_indented() -> None:
+            with indented.open("w", encoding="utf-8") as f:
+                json.dump(programs, f, ensure_ascii=False, indent=4)
+
+        def read_indented() -> Any:
+            with indented.open("r", encoding="utf-8") as f:
+                return json.load(f)
+
+        print("Programs file:")
+        _timed("json.dump indent=4", write_indented)
+        _timed("write_json_file compact", lambda: serialization.write_json_file(compact, programs))
+        _timed("json.load indented", read_indented)
+        _timed("read_json_file compact", lambda: serialization.read_json_file(compact))
+        print(
+            f"  size {indented.stat().st_size / 1e6:.1f} MB -> "
+            f"{compact.stat().st_size / 1e6:.1f} MB"
+        )
+
+    target_timezone = pytz.timezone("Australia/Sydney")
+    date_str = (date.today() + timedelta(days=1)).isoformat()
+    payload = {
+        "query": "epg/date",
+        "date": date_str,
+        "channels": build_day_grid(source_data, target_timezone, date_str),
+    }
+    adapter: TypeAdapter[Dict[str, Any]] = TypeAdapter(Dict[str, Any])
+
+    print("One day of /py/epg/date:")
+    before = _timed(
+        "response model + dump_json",
+        lambda: adapter.dump_json(adapter.validate_python(payload)),
+    )
+    _timed("JSONResponse", lambda: JSONResponse(payload).body)
+    after = _timed("json_response", lambda: serialization.json_response(payload).body)
+    print(f"  speedup x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
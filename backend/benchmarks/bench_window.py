@@ -0,0 +1,70 @@
+"""
+Compare a full day grid with a three-hour window over the same source.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_window
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import pytz
+
+from app.routers.window import build_window
+from app.services.grid_cache import build_day_grid
+from app.services.source_store import SourceData
+from app.utils import serialization
+from benchmarks.synthetic import make_source
+
+
+def _timed(label: str, func: Callable[[], Any], repeat: int = 5) -> float:
+    best = min(_run(func) for _ in range(repeat))
+    print(f"  {label:<32} {best * 1000:10.1f} ms")
+    return best
+
+
+def _run(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    programs, channels = make_source(channel_count=200, days=14)
+    source_data = SourceData(
+        source="synthetic",
+        version="bench",
+        modified=0.0,
+        programs=programs,
+        channels=channels,
+    )
+    target_timezone = pytz.timezone("Australia/Sydney")
+    slugs = [channel["channel_slug"] for channel in channels]
+
+    start = datetime.now(target_timezone).replace(minute=0, second=0, microsecond=0)
+    start_epoch = int(start.timestamp())
+    end_epoch = int((start + timedelta(hours=3)).timestamp())
+    date_str = start.strftime("%Y-%m-%d")
+    print(f"{len(programs)} programs, {len(slugs)} channels:")
+    _timed("build timelines (once per ingest)", lambda: source_data.timelines, 1)
+
+    _timed("day grid", lambda: build_day_grid(source_data, target_timezone, date_str))
+    _timed(
+        "three hour window",
+        lambda: build_window(
+            source_data, slugs, target_timezone, start_epoch, end_epoch
+        ),
+    )
+
+    day = serialization.dumps(build_day_grid(source_data, target_timezone, date_str))
+    window = serialization.dumps(
+        build_window(source_data, slugs, target_timezone, start_epoch, end_epoch)
+    )
+    print(f"  {'day grid payload':<32} {len(day) / 1024:10.1f} KiB")
+    print(f"  {'window payload':<32} {len(window) / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Synthetic source data for benchmarks."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+TITLES = ["News", "Movie Night", "Live Football", "Cooking Show", "Drama"]
+CATEGORIES = [["News"], ["Movie"], ["Sport", "Football"], ["Lifestyle"], ["Drama"]]
+
+
+def make_source(
+    channel_count: int = 200, days: int = 14, seed: int = 42
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Build programs and channels shaped like a processed XMLTV source.
+
+    Args:
+        channel_count: Number of channels to generate
+        days: Number of days of programming per channel
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        Tuple of (programs, channels)
+    """
+    rnd = random.Random(seed)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=days)
+
+    channels: List[Dict[str, Any]] = []
+    programs: List[Dict[str, Any]] = []
+    for number in range(channel_count):
+        slug = f"channel-{number}"
+        channels.append(
+            {
+                "channel_id": f"channel.{number}",
+                "channel_slug": slug,
+                "channel_name": f"Channel {number}",
+                "channel_names": {
+                    "clean": f"Channel {number}",
+                    "location": f"Channel {number}",
+                    "real": f"Channel {number}",
+                },
+                "channel_number": str(number + 1),
+                "chlogo": "N/A",
+                "channel_group": "Synthetic",
+                "channel_url": "N/A",
+                "channel_logo": {"light": "N/A", "dark": "N/A"},
+            }
+        )
+
+        current = start
+        while current < end:
+            length = timedelta(minutes=rnd.choice([15, 30, 30, 60, 60, 90, 120]))
+            kind = rnd.randrange(len(TITLES))
+            programs.append(
+                {
+                    "start_time": current.isoformat(),
+                    "start": current.strftime("%H:%M"),
+                    "end_time": (current + length).isoformat(),
+                    "end": (current + length).strftime("%H:%M"),
+                    "length": str(length),
+                    "channel": slug,
+                    "title": f"{TITLES[kind]} {rnd.randint(1, 500)}",
+                    "subtitle": "N/A",
+                    "description": "N/A",
+                    "categories": CATEGORIES[kind],
+                    "episode": "N/A",
+                    "original_air_date": "N/A",
+                    "rating": "N/A",
+                }
+            )
+            current += length
+
+    return programs, channels
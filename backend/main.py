@@ -9,20 +9,42 @@ from apscheduler.triggers.interval import IntervalTrigger
 from fastapi import BackgroundTasks, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
 from app.config import settings
 from app.exceptions import WebEPGException
-from app.logging_config import setup_logging
+from app.logging_config import setup_logging, stop_logging
+from app.middleware.compression_middleware import CompressionMiddleware
 from app.middleware.logging_middleware import LoggingMiddleware
-from app.routers import channels, dates, epg, nownext, sources, transmitters, xmlepg
+from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.server_timing_middleware import ServerTimingMiddleware
+from app.routers import (
+    channels,
+    dates,
+    epg,
+    nownext,
+    search,
+    sources,
+    transmitters,
+    window,
+    xmlepg,
+)
+from app.services import data_access
+from app.services.compression_cache import compression_cache
+from app.services.grid_cache import day_grid_cache
+from app.services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.services.metrics import render_metrics
+from app.services.prewarm import configured_source_ids, source_warmer
+from app.services.source_store import source_store
+from app.utils.static_files import PrecompressedStaticFiles
 
 limiter = Limiter(key_func=get_remote_address)
 scheduler = AsyncIOScheduler()
+# Where the xmltvdata directory is served as static files
+STATIC_MOUNT_PATH = "/xmltvdata"
 
 # Function to process sources
 async def process_sources_task() -> None:
@@ -52,9 +74,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup: Configure and start the scheduler
     scheduler.add_job(
         process_sources_task,
-        trigger=IntervalTrigger(hours=3),
+        trigger=IntervalTrigger(hours=settings.SOURCES_REFRESH_HOURS),
         id='process_sources',
-        name='Process XMLTV sources every 3 hours',
+        name=f'Process XMLTV sources every {settings.SOURCES_REFRESH_HOURS} hours',
         replace_existing=True,
     )
 
@@ -68,9 +90,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     scheduler.add_job(
         process_xmlepg_task,
-        trigger=IntervalTrigger(hours=12),
+        trigger=IntervalTrigger(hours=settings.XMLEPG_REFRESH_HOURS),
         id="process_xmlepg",
-        name="Process XMLEPG every 12 hours",
+        name=f"Process XMLEPG every {settings.XMLEPG_REFRESH_HOURS} hours",
         replace_existing=True,
     )
 
@@ -83,11 +105,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # )
 
     scheduler.start()
+
+    # Startup: Load sources in the background; /api/py/ready reports progress
+    if settings.PREWARM_ON_STARTUP:
+        source_warmer.start(configured_source_ids(), settings.PREWARM_WORKERS)
     
     yield
     
-    # Shutdown: Stop the scheduler
+    # Shutdown: Stop the scheduler, any pending pre-warming and the
+    # data access pools, then flush queued log records
+    source_warmer.shutdown()
     scheduler.shutdown()
+    data_access.shutdown()
+    stop_logging()
 
 
 app = FastAPI(
@@ -153,6 +183,27 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore
 
+# Compress responses; added first so it sees the app's responses directly
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    cache=compression_cache,
+    # Static files are served from their pre-compressed copies or as is
+    excluded_paths=[STATIC_MOUNT_PATH],
+)
+
+# Phase timings; outside compression so the header includes it. Only added
+# when enabled, so requests skip it entirely otherwise
+if settings.SERVER_TIMING or settings.SLOW_REQUEST_MS > 0:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        emit_header=settings.SERVER_TIMING,
+        slow_request_ms=settings.SLOW_REQUEST_MS,
+    )
+
+# Latency and bytes per route; outside compression so bytes are as sent
+app.add_middleware(MetricsMiddleware)
+
 # Add logging middleware
 app.add_middleware(LoggingMiddleware)
 
@@ -224,13 +275,19 @@ app.include_router(sources.router, prefix="/api", tags=["sources"])
 app.include_router(channels.router, prefix="/api", tags=["channels"])
 app.include_router(epg.router, prefix="/api", tags=["epg"])
 app.include_router(dates.router, prefix="/api", tags=["dates"])
+app.include_router(search.router, prefix="/api", tags=["search"])
+app.include_router(window.router, prefix="/api", tags=["window"])
 app.include_router(nownext.router, prefix="/api/py/epg/nownext", tags=["nownext"])
 # app.include_router(foxtel.router, prefix="/api", tags=["foxtel"])
 app.include_router(transmitters.router, prefix="/api", tags=["transmitters"])
 app.include_router(xmlepg.router, prefix="/api", tags=["xmlepg"])
 
 # Mount static files
-app.mount("/xmltvdata", StaticFiles(directory="xmltvdata"), name="xmltvdata")
+app.mount(
+    STATIC_MOUNT_PATH,
+    PrecompressedStaticFiles(directory="xmltvdata"),
+    name="xmltvdata",
+)
 
 
 @app.get(
@@ -269,6 +326,34 @@ async def root(request: Request) -> Dict[str, str]:
                             "cpu_usage": 15.5,
                             "memory_usage": 45.2,
                             "disk_usage": 60.8
+                        },
+                        "source_cache": {
+                            "hits": 1520,
+                            "misses": 24,
+                            "reloads": 8,
+                            "cached_files": 24,
+                            "columnar_files": 12,
+                            "cached_sources": 12
+                        },
+                        "grid_cache": {
+                            "hits": 870,
+                            "misses": 60,
+                            "evictions": 0,
+                            "cached_grids": 60
+                        },
+                        "single_flight": {
+                            "source_loads": {
+                                "leaders": 24,
+                                "coalesced": 57,
+                                "failures": 0,
+                                "in_flight": 0
+                            },
+                            "day_grids": {
+                                "leaders": 60,
+                                "coalesced": 212,
+                                "failures": 0,
+                                "in_flight": 1
+                            }
                         }
                     }
                 }
@@ -287,6 +372,11 @@ async def health_check(request: Request) -> Dict[str, Any]:
         - **app_name**: Application name
         - **version**: API version
         - **system_info**: System resource usage (CPU, memory, disk)
+        - **source_cache**: In-memory source store hit/miss/reload counters
+        - **grid_cache**: Day grid cache hit/miss/eviction counters
+        - **compression_cache**: Compressed response cache counters and size
+        - **single_flight**: Loads and grid builds run by a leader request
+          versus coalesced onto one already in flight
     
     Use this endpoint for:
     - Load balancer health checks
@@ -302,8 +392,94 @@ async def health_check(request: Request) -> Dict[str, Any]:
             "cpu_usage": psutil.cpu_percent(),
             "memory_usage": psutil.virtual_memory().percent,
             "disk_usage": psutil.disk_usage('/').percent
-        }
+        },
+        "source_cache": source_store.stats(),
+        "grid_cache": day_grid_cache.stats(),
+        "compression_cache": compression_cache.stats(),
+        "single_flight": {
+            "source_loads": source_store.flights.stats(),
+            "day_grids": day_grid_cache.flights.stats(),
+        },
+    }
+
+@app.get(
+    "/api/py/ready",
+    tags=["system"],
+    summary="Readiness Check",
+    description="Report whether startup pre-warming of sources has finished.",
+    response_description="Readiness and pre-warming progress",
+    responses={
+        200: {
+            "description": "Pre-warming finished or is disabled",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "ready": True,
+                        "enabled": True,
+                        "total": 42,
+                        "progress": {
+                            "pending": 0,
+                            "loading": 0,
+                            "ready": 39,
+                            "missing": 2,
+                            "failed": 1
+                        },
+                        "elapsed_seconds": 18.342,
+                        "in_progress": [],
+                        "errors": {"xmlepg_ABC": "Expecting value: line 1 column 1 (char 0)"}
+                    }
+                }
+            }
+        },
+        503: {"description": "Sources are still being pre-warmed"}
     }
+)
+async def readiness_check() -> JSONResponse:
+    """
+    Readiness endpoint for load balancers and orchestrators.
+
+    Returns 503 while sources are being pre-warmed (``PREWARM_ON_STARTUP``)
+    and 200 once every source is loaded, missing or failed. Requests are
+    served during warm-up either way; a request for a source that is still
+    loading waits for that load rather than starting another.
+
+    Not rate limited, so it can be polled by probes.
+    """
+    progress = source_warmer.status()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK
+        if progress["ready"]
+        else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=progress,
+    )
+
+@app.get(
+    "/api/py/metrics",
+    tags=["system"],
+    summary="Metrics",
+    description="Request latency, cache and ingest metrics in Prometheus text format.",
+    response_class=PlainTextResponse,
+    response_description="Metrics in the Prometheus text exposition format",
+)
+async def metrics() -> PlainTextResponse:
+    """
+    Metrics endpoint for Prometheus scrapes.
+
+    Exposes:
+    - **webepg_http_request_duration_seconds**: Latency histogram by method,
+      route template and status code
+    - **webepg_http_response_bytes_total**: Bytes sent by route template
+    - **webepg_cache_hits_total** / **webepg_cache_misses_total** /
+      **webepg_cache_evictions_total** / **webepg_cache_entries**: Source
+      file, day grid and compressed body caches
+    - **webepg_source_loads_total**: Data files loaded and reloaded
+    - **webepg_single_flight_calls_total**: Leader and coalesced calls
+    - **webepg_ingest_runs_total**: Post-ingest refreshes by source and outcome
+
+    Each worker process keeps its own metrics. Not rate limited, so it can
+    be scraped.
+    """
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
 @app.post(
     "/api/py/trigger-process-sources",
@@ -0,0 +1,40 @@
+"""Fixtures shared by the test suite."""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.utils.file_operations import write_json
+from benchmarks.synthetic import make_source
+from main import app
+
+SourceFiles = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point XMLTV_DATA_DIR at an empty directory for the test."""
+    monkeypatch.setattr(settings, "XMLTV_DATA_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def write_source(data_dir: Path) -> Callable[..., SourceFiles]:
+    """Return a function writing a synthetic source's data files."""
+
+    def write(source: str, channel_count: int = 3, days: int = 2) -> SourceFiles:
+        programs, channels = make_source(channel_count=channel_count, days=days)
+        write_json(f"{source}_programs.json", programs)
+        write_json(f"{source}_channels.json", channels)
+        return programs, channels
+
+    return write
+
+
+@pytest.fixture
+def client(data_dir: Path) -> TestClient:
+    """A client for the API, without running its startup tasks."""
+    return TestClient(app)
@@ -0,0 +1,197 @@
+"""
+The day grouping the epg routes used before ``grid_engine``.
+
+Kept unchanged as the reference the engine's output is compared against:
+programs are split at local midnight as formatted strings, then grouped by
+date and channel and gap-filled with wall-clock datetime arithmetic.
+"""
+
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import pytz
+
+Program = Dict[str, Any]
+
+
+def adjust_programming(
+    programming: List[Program], target_timezone: pytz.BaseTzInfo
+) -> List[Program]:
+    adjusted: List[Program] = []
+    for program in programming:
+        utc_start = datetime.fromisoformat(program["start_time"])
+        utc_end = datetime.fromisoformat(program["end_time"])
+        local_start = utc_start.astimezone(target_timezone)
+        local_end = utc_end.astimezone(target_timezone)
+
+        if local_start.date() != local_end.date():
+            midnight = local_start.replace(
+                hour=23, minute=59, second=59, microsecond=999999
+            )
+            if local_start < midnight:
+                adjusted.append(
+                    {
+                        **program,
+                        "start_time": local_start.strftime("%Y-%m-%d %H:%M:%S"),
+                        "end_time": midnight.strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                )
+            next_day = local_end.replace(hour=0, minute=0, second=0, microsecond=0)
+            if next_day < local_end:
+                adjusted.append(
+                    {
+                        **program,
+                        "start_time": next_day.strftime("%Y-%m-%d %H:%M:%S"),
+                        "end_time": local_end.strftime("%Y-%m-%d %H:%M:%S"),
+                        "title": f"{program['title']} (cont)",
+                    }
+                )
+        else:
+            adjusted.append(
+                {
+                    **program,
+                    "start_time": local_start.strftime("%Y-%m-%d %H:%M:%S"),
+                    "end_time": local_end.strftime("%Y-%m-%d %H:%M:%S"),
+                }
+            )
+
+    return adjusted
+
+
+def group_and_fill_programs(
+    programs: List[Program], tz: pytz.BaseTzInfo
+) -> Dict[str, List[Program]]:
+    grouped: Dict[str, List[Program]] = defaultdict(list)
+    for program in programs:
+        date = program["start_time"].split(" ")[0]
+        grouped[date].append(program)
+
+    for date, day_programs in grouped.items():
+        day_programs.sort(key=lambda x: x["start_time"])
+        filled_programs: List[Program] = []
+        current_time = tz.localize(
+            datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S")
+        )
+        day_end = tz.localize(
+            datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S")
+        )
+
+        for program in day_programs:
+            program_start = parse_datetime(program["start_time"], tz)
+            program_end = parse_datetime(program["end_time"], tz)
+
+            if program_start > current_time:
+                gap = (program_start - current_time).total_seconds()
+                if gap > 60:
+                    filled_programs.append(
+                        create_no_data_program(
+                            current_time,
+                            program_start - timedelta(seconds=1),
+                            program["channel"],
+                        )
+                    )
+
+            if (program_end - program_start).total_seconds() > 0:
+                filled_programs.append(program)
+
+            current_time = program_end
+
+        if (day_end - current_time).total_seconds() > 60:
+            filled_programs.append(
+                create_no_data_program(
+                    current_time + timedelta(seconds=1), day_end, program["channel"]
+                )
+            )
+
+        grouped[date] = filled_programs
+
+    return OrderedDict(sorted(grouped.items(), key=lambda x: x[0]))
+
+
+def group_and_fill_programschannels(
+    programs: List[Program], tz: pytz.BaseTzInfo, all_channels: List[str]
+) -> Dict[str, Dict[str, List[Program]]]:
+    grouped: Dict[str, Dict[str, List[Program]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+    for program in programs:
+        date = program["start_time"].split(" ")[0]
+        grouped[date][program["channel"]].append(program)
+
+    filled_grouped: Dict[str, Dict[str, List[Program]]] = defaultdict(
+        lambda: defaultdict(list)
+    )
+
+    for date, channels in grouped.items():
+        day_start = tz.localize(
+            datetime.strptime(f"{date} 00:00:00", "%Y-%m-%d %H:%M:%S")
+        )
+        day_end = tz.localize(
+            datetime.strptime(f"{date} 23:59:59", "%Y-%m-%d %H:%M:%S")
+        )
+
+        for channel in all_channels:
+            if channel not in channels:
+                filled_grouped[date][channel] = [
+                    create_no_data_program(day_start, day_end, channel)
+                ]
+                continue
+
+            channel_programs = channels[channel]
+            channel_programs.sort(key=lambda x: x["start_time"])
+            filled_programs: List[Program] = []
+            current_time = day_start
+
+            for program in channel_programs:
+                program_start = parse_datetime(program["start_time"], tz)
+                program_end = parse_datetime(program["end_time"], tz)
+
+                if program_start > current_time:
+                    gap = (program_start - current_time).total_seconds()
+                    if gap > 60:
+                        filled_programs.append(
+                            create_no_data_program(
+                                current_time,
+                                program_start - timedelta(seconds=1),
+                                channel,
+                            )
+                        )
+
+                if (program_end - program_start).total_seconds() > 60:
+                    filled_programs.append(program)
+
+                current_time = program_end
+
+            if (day_end - current_time).total_seconds() > 60:
+                filled_programs.append(
+                    create_no_data_program(
+                        current_time + timedelta(seconds=1), day_end, channel
+                    )
+                )
+
+            filled_grouped[date][channel] = filled_programs
+
+    return filled_grouped
+
+
+def parse_datetime(dt_string: str, tz: pytz.BaseTzInfo) -> datetime:
+    return tz.localize(datetime.strptime(dt_string, "%Y-%m-%d %H:%M:%S"))
+
+
+def create_no_data_program(start: datetime, end: datetime, channel: str) -> Program:
+    return {
+        "start_time": start.strftime("%Y-%m-%d %H:%M:%S"),
+        "start": "N/A",
+        "end_time": end.strftime("%Y-%m-%d %H:%M:%S"),
+        "end": "N/A",
+        "length": str(end - start),
+        "channel": channel,
+        "title": "No Data Available",
+        "subtitle": "N/A",
+        "description": "N/A",
+        "categories": ["N/A"],
+        "episode": "N/A",
+        "original_air_date": "N/A",
+        "rating": "N/A",
+    }
@@ -0,0 +1,164 @@
+"""Columnar program snapshots: round trips, versions and pruning."""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+from app.utils.columnar import (
+    CURRENT_FILE,
+    columns_path,
+    current_version,
+    load_program_columns,
+    np,
+    refresh_program_columns,
+    write_program_columns,
+)
+from app.utils.time_utils import iso_to_epoch
+
+pytestmark = pytest.mark.skipif(np is None, reason="NumPy is not installed")
+
+SIGNATURE = (1_700_000_000_000_000_000, 1234)
+
+# Keys missing, in a different order, repeated values, non-string values
+IRREGULAR_PROGRAMS: List[Dict[str, Any]] = [
+    {
+        "start_time": "2026-03-01T10:00:00+00:00",
+        "end_time": "2026-03-01T11:00:00+00:00",
+        "channel": "ch-1",
+        "title": "Café Society",
+        "categories": ["Drama", "Movie"],
+        "rating": "N/A",
+    },
+    {
+        "channel": "ch-2",
+        "title": "",
+        "start_time": "2026-03-01T21:00:00+11:00",
+        "end_time": "2026-03-01T22:30:00+11:00",
+        "categories": [],
+    },
+    {
+        "start_time": "2026-03-01T11:00:00Z",
+        "end_time": "2026-03-01T11:00:00Z",
+        "channel": "ch-1",
+        "title": "Café Society",
+        "rating": "N/A",
+        "other_data": {"season": 2, "live": True},
+    },
+]
+
+
+def _snapshots(source: str) -> List[str]:
+    return sorted(
+        entry.name for entry in columns_path(source).iterdir() if entry.is_dir()
+    )
+
+
+def _assert_same_programs(columns: Any, programs: List[Dict[str, Any]]) -> None:
+    assert len(columns) == len(programs)
+    decoded = list(columns)
+    assert decoded == programs
+    assert [list(p) for p in decoded] == [list(p) for p in programs]
+    assert [columns[i] for i in range(len(programs))] == programs
+    assert columns[-1] == programs[-1]
+    assert columns[1:] == programs[1:]
+
+
+def test_irregular_programs_round_trip(data_dir: Path) -> None:
+    write_program_columns("odd", IRREGULAR_PROGRAMS, SIGNATURE)
+    columns = load_program_columns("odd", SIGNATURE)
+
+    assert columns is not None
+    _assert_same_programs(columns, IRREGULAR_PROGRAMS)
+    assert columns.column("rating") == ["N/A", None, "N/A"]
+    assert columns.column("missing") == [None, None, None]
+    assert columns.start_epochs.tolist() == [
+        iso_to_epoch(p["start_time"]) for p in IRREGULAR_PROGRAMS
+    ]
+    assert columns.end_epochs.tolist() == [
+        iso_to_epoch(p["end_time"]) for p in IRREGULAR_PROGRAMS
+    ]
+
+
+def test_empty_source_round_trips(data_dir: Path) -> None:
+    write_program_columns("empty", [], SIGNATURE)
+    columns = load_program_columns("empty", SIGNATURE)
+
+    assert columns is not None
+    assert len(columns) == 0
+    assert list(columns) == []
+
+
+def test_refresh_matches_json_file(data_dir: Path, write_source: Callable) -> None:
+    programs, _ = write_source("synthetic")
+    refresh_program_columns("synthetic")
+
+    stat = os.stat(data_dir / "synthetic_programs.json")
+    columns = load_program_columns("synthetic", (stat.st_mtime_ns, stat.st_size))
+    assert columns is not None
+    _assert_same_programs(columns, programs)
+
+
+def test_stale_snapshot_is_not_loaded(data_dir: Path) -> None:
+    write_program_columns("odd", IRREGULAR_PROGRAMS, SIGNATURE)
+
+    assert load_program_columns("odd", (SIGNATURE[0] + 1, SIGNATURE[1])) is None
+    assert load_program_columns("never-written", SIGNATURE) is None
+
+
+def test_versions_increase_and_previous_snapshot_is_kept(data_dir: Path) -> None:
+    for expected_version in range(1, 5):
+        signature = (SIGNATURE[0] + expected_version, SIGNATURE[1])
+        programs = IRREGULAR_PROGRAMS[:expected_version]
+        write_program_columns("odd", programs, signature)
+
+        assert current_version("odd") == expected_version
+        assert (columns_path("odd") / CURRENT_FILE).read_text() == str(expected_version)
+        columns = load_program_columns("odd", signature)
+        assert columns is not None
+        assert list(columns) == programs
+
+    # Older snapshots are pruned; the previous one stays for late readers
+    assert _snapshots("odd") == ["v000003", "v000004"]
+
+
+def test_prune_removes_leftovers_of_dead_builds(data_dir: Path) -> None:
+    write_program_columns("odd", IRREGULAR_PROGRAMS, SIGNATURE)
+    directory = columns_path("odd")
+    (directory / "v000002.tmp-99999").mkdir()
+    (directory / f"{CURRENT_FILE}.tmp-99999").write_text("2")
+
+    write_program_columns("odd", IRREGULAR_PROGRAMS, SIGNATURE)
+
+    assert current_version("odd") == 2
+    assert sorted(entry.name for entry in directory.iterdir()) == [
+        ".lock",
+        CURRENT_FILE,
+        "v000001",
+        "v000002",
+    ]
+
+
+def test_refresh_reuses_a_matching_snapshot(
+    data_dir: Path, write_source: Callable
+) -> None:
+    write_source("synthetic")
+    first = refresh_program_columns("synthetic")
+    assert refresh_program_columns("synthetic") == first
+    assert current_version("synthetic") == 1
+
+    path = data_dir / "synthetic_programs.json"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert refresh_program_columns("synthetic") != first
+    assert current_version("synthetic") == 2
+
+
+def test_unreadable_current_file_means_no_snapshot(data_dir: Path) -> None:
+    write_program_columns("odd", IRREGULAR_PROGRAMS, SIGNATURE)
+    (columns_path("odd") / CURRENT_FILE).write_text("garbage")
+
+    assert current_version("odd") is None
+    assert load_program_columns("odd", SIGNATURE) is None
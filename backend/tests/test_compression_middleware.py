@@ -0,0 +1,327 @@
+"""Response compression: negotiation, streaming, caching and skipped responses."""
+
+import asyncio
+import gzip
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.services.compression_cache import CompressionCache
+from app.utils.compression import RESPONSE_CODINGS
+
+MINIMUM_SIZE = 100
+BODY = b'{"title": "Program"}' * 50
+
+
+def _body(request: Request) -> bytes:
+    # Distinct, mostly incompressible bodies per page, for the cache tests
+    page = int(request.query_params.get("page", 0))
+    return b"".join(
+        zlib.crc32(f"{page}-{i}".encode()).to_bytes(4, "big").hex().encode()
+        for i in range(int(request.query_params.get("size", len(BODY) // 8)))
+    )
+
+
+def _chunks(request: Request) -> Iterator[bytes]:
+    size = int(request.query_params.get("chunk", 60))
+    for index in range(int(request.query_params.get("count", 5))):
+        yield bytes([ord("a") + index]) * size
+
+
+def _app(tmp_path: Path) -> Starlette:
+    (tmp_path / "data.json").write_bytes(BODY)
+
+    async def buffered(request: Request) -> Response:
+        size = request.query_params.get("size")
+        body = BODY if size is None else BODY[: int(size)]
+        return Response(body, media_type="application/json")
+
+    async def tagged(request: Request) -> Response:
+        body = _body(request)
+        return Response(
+            body,
+            media_type="application/json",
+            headers={"ETag": f'"{zlib.crc32(body)}"'},
+        )
+
+    async def streamed(request: Request) -> Response:
+        headers = {}
+        if "etag" in request.query_params:
+            headers["ETag"] = '"streamed"'
+        return StreamingResponse(
+            _chunks(request), media_type="text/plain", headers=headers
+        )
+
+    async def encoded(request: Request) -> Response:
+        return Response(
+            gzip.compress(BODY),
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    async def image(request: Request) -> Response:
+        return Response(BODY, media_type="image/png")
+
+    async def file(request: Request) -> Response:
+        return FileResponse(tmp_path / "data.json", media_type="application/json")
+
+    return Starlette(
+        routes=[
+            Route("/buffered", buffered),
+            Route("/tagged", tagged),
+            Route("/streamed", streamed),
+            Route("/encoded", encoded),
+            Route("/image", image),
+            Route("/file", file),
+            Route("/static/file", file),
+        ]
+    )
+
+
+@pytest.fixture
+def cache() -> CompressionCache:
+    return CompressionCache(max_bytes=64 * 1024)
+
+
+@pytest.fixture
+def client(tmp_path: Path, cache: CompressionCache) -> Any:
+    app = CompressionMiddleware(
+        _app(tmp_path),
+        minimum_size=MINIMUM_SIZE,
+        cache=cache,
+        excluded_paths=["/static/"],
+    )
+    return TestClient(app)
+
+
+def _get(client: TestClient, url: str, accept: str = "gzip", **kwargs: Any) -> Any:
+    return client.get(url, headers={"Accept-Encoding": accept, **kwargs})
+
+
+async def _run(app: Any, path: str, query: bytes = b"") -> List[Dict[str, Any]]:
+    """Call an ASGI app once and return the messages it sends."""
+    messages: List[Dict[str, Any]] = []
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> Dict[str, Any]:
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is complete
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    async def send(message: Dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query,
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("gzip", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0.5, br;q=0.4", "gzip"),
+        ("gzip;q=0, unknown", None),
+        ("identity", None),
+        ("identity;q=0", None),
+        ("identity;q=0, gzip;q=0.1", "gzip"),
+        ("", None),
+        ("*", RESPONSE_CODINGS[0]),
+        ("*;q=0", None),
+        (", ".join(f"{c};q=0" for c in RESPONSE_CODINGS[:-1]) + ", *", "gzip"),
+    ],
+)
+def test_coding_follows_accept_encoding(
+    client: TestClient, accept: str, expected: Any
+) -> None:
+    response = _get(client, "/buffered", accept)
+
+    assert response.headers.get("content-encoding") == expected
+    if expected is not None:
+        assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == BODY
+
+
+def test_highest_quality_coding_wins(client: TestClient) -> None:
+    accept = ", ".join(
+        f"{coding};q={0.5 + index / 10}"
+        for index, coding in enumerate(reversed(RESPONSE_CODINGS))
+    )
+    response = _get(client, "/buffered", accept)
+    assert response.headers["content-encoding"] == RESPONSE_CODINGS[0]
+
+
+def test_small_bodies_are_sent_as_is(client: TestClient) -> None:
+    response = _get(client, f"/buffered?size={MINIMUM_SIZE - 1}")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(MINIMUM_SIZE - 1)
+    assert response.content == BODY[: MINIMUM_SIZE - 1]
+
+
+def test_buffered_bodies_get_a_content_length(tmp_path: Path) -> None:
+    app = CompressionMiddleware(_app(tmp_path), minimum_size=MINIMUM_SIZE, cache=None)
+    start, body = asyncio.run(_run(app, "/buffered"))
+
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(body["body"])).encode()
+    assert gzip.decompress(body["body"]) == BODY
+
+
+def test_short_streams_are_buffered_and_sent_as_is(client: TestClient) -> None:
+    response = _get(client, "/streamed?chunk=10&count=5")
+
+    assert "content-encoding" not in response.headers
+    assert response.content == b"a" * 10 + b"b" * 10 + b"c" * 10 + b"d" * 10 + b"e" * 10
+
+
+def test_long_streams_are_compressed_chunk_by_chunk(tmp_path: Path) -> None:
+    app = CompressionMiddleware(_app(tmp_path), minimum_size=MINIMUM_SIZE, cache=None)
+    messages = asyncio.run(_run(app, "/streamed", b"chunk=60&count=5"))
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    bodies = [m["body"] for m in messages[1:]]
+    # The first two chunks reach the threshold together, then one per chunk
+    assert len(bodies) == 5
+    decompressor = zlib.decompressobj(31)
+    decoded = [decompressor.decompress(body) for body in bodies]
+    # Every chunk is flushed, so it can be decoded as soon as it arrives
+    # StreamingResponse ends with an empty message, which ends the stream
+    assert decoded == [b"a" * 60 + b"b" * 60, b"c" * 60, b"d" * 60, b"e" * 60, b""]
+    assert decompressor.eof
+
+
+def test_etag_responses_are_compressed_once(
+    client: TestClient, cache: CompressionCache
+) -> None:
+    first = _get(client, "/tagged")
+    second = _get(client, "/tagged")
+
+    assert first.content == second.content
+    assert first.headers["etag"] == second.headers["etag"]
+    # The compressed body is a different representation: a weak ETag
+    assert first.headers["etag"].startswith('W/"')
+    assert first.headers["content-length"] == second.headers["content-length"]
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["cached_bodies"] == 1
+
+
+def test_cached_bodies_are_keyed_by_coding_and_target(
+    client: TestClient, cache: CompressionCache
+) -> None:
+    _get(client, "/tagged")
+    _get(client, "/tagged", "br" if "br" in RESPONSE_CODINGS else "gzip")
+    _get(client, "/tagged?page=1")
+    _get(client, "/tagged?page=1")
+
+    expected_bodies = 3 if "br" in RESPONSE_CODINGS else 2
+    assert cache.stats()["cached_bodies"] == expected_bodies
+    assert cache.stats()["hits"] == 4 - expected_bodies
+
+
+def test_streamed_etag_responses_are_cached(
+    client: TestClient, cache: CompressionCache
+) -> None:
+    first = _get(client, "/streamed?etag=1")
+    second = _get(client, "/streamed?etag=1")
+
+    assert (
+        first.content
+        == second.content
+        == b"".join(bytes([ord("a") + index]) * 60 for index in range(5))
+    )
+    assert "content-length" not in first.headers
+    assert second.headers["content-length"] == str(cache.stats()["cached_bytes"])
+    assert cache.stats()["hits"] == 1
+
+
+def test_least_recently_used_bodies_are_evicted(tmp_path: Path) -> None:
+    cache = CompressionCache(max_bytes=16 * 1024)
+    client = TestClient(
+        CompressionMiddleware(_app(tmp_path), minimum_size=MINIMUM_SIZE, cache=cache)
+    )
+    # Hex digits compress about 2:1, so each body fills about half an entry
+    size = cache.max_entry_bytes // 8
+
+    for page in range(30):
+        _get(client, f"/tagged?size={size}&page={page}")
+        if page == 0:
+            entry_bytes = cache.stats()["cached_bytes"]
+        # Page 0 stays in use and so is never the least recently used
+        _get(client, f"/tagged?size={size}&page=0")
+
+    stats = cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["cached_bytes"] <= cache.max_bytes
+    assert stats["cached_bodies"] == 30 - stats["evictions"]
+    assert entry_bytes <= cache.max_entry_bytes
+
+    hits = stats["hits"]
+    _get(client, f"/tagged?size={size}&page=0")
+    assert cache.stats()["hits"] == hits + 1
+    _get(client, f"/tagged?size={size}&page=1")
+    assert cache.stats()["hits"] == hits + 1
+
+
+def test_large_bodies_are_not_cached(
+    client: TestClient, cache: CompressionCache
+) -> None:
+    size = cache.max_entry_bytes  # compresses to about half its 8 * size bytes
+    _get(client, f"/tagged?size={size}")
+
+    assert cache.stats()["cached_bodies"] == 0
+
+
+def test_encoded_responses_pass_through(client: TestClient) -> None:
+    with client.stream("GET", "/encoded", headers={"Accept-Encoding": "gzip"}) as raw:
+        body = b"".join(raw.iter_raw())
+
+    assert raw.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(body) == BODY
+
+
+def test_range_responses_pass_through(client: TestClient) -> None:
+    response = _get(client, "/file", Range="bytes=0-9")
+
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY[:10]
+
+
+@pytest.mark.parametrize("url", ["/image", "/static/file"])
+def test_other_responses_pass_through(client: TestClient, url: str) -> None:
+    response = _get(client, url)
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(BODY))
+    assert response.content == BODY
+
+
+def test_head_requests_pass_through(client: TestClient) -> None:
+    response = client.head("/buffered", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(BODY))
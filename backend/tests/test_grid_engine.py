@@ -0,0 +1,108 @@
+"""The day grid engine against the string-based grouping it replaced."""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+import pytz
+
+from app.utils.grid_engine import build_channel_schedule, build_day_schedules
+from app.utils.time_utils import iso_to_epoch
+from tests import reference_grouping
+
+# Whole-hour, half-hour and 45-minute offsets, DST in both hemispheres and
+# Lord Howe's 30-minute DST shift
+ZONES = [
+    "UTC",
+    "Australia/Sydney",
+    "Australia/Lord_Howe",
+    "Australia/Adelaide",
+    "America/New_York",
+    "Asia/Kathmandu",
+]
+CHANNELS = ["ch-a", "ch-b"]
+# Output order asked for by the date route: unknown and repeated slugs included
+ALL_CHANNELS = ["ch-b", "ch-a", "ch-missing", "ch-a"]
+
+
+def _transitions(tz: pytz.BaseTzInfo) -> List[datetime]:
+    transitions = [
+        t.replace(tzinfo=timezone.utc)
+        for t in getattr(tz, "_utc_transition_times", [])
+        if datetime(2025, 1, 1) < t < datetime(2028, 1, 1)
+    ]
+    return transitions or [datetime(2026, 6, 1, tzinfo=timezone.utc)]
+
+
+def _programs(rnd: random.Random, tz: pytz.BaseTzInfo) -> List[Dict[str, Any]]:
+    """Programs around a DST change, with gaps, overlaps and zero lengths."""
+    center = rnd.choice(_transitions(tz))
+    programs: List[Dict[str, Any]] = []
+    for channel in CHANNELS:
+        current = center - timedelta(hours=rnd.randint(3, 30))
+        for _ in range(rnd.randint(1, 30)):
+            start = current + timedelta(minutes=rnd.choice([0, 0, 0, 1, 2, 61, -20]))
+            end = start + timedelta(
+                minutes=rnd.choice([0, 1, 2, 30, 45, 60, 90, 180, 600, 1500, 3000])
+            )
+            if rnd.random() < 0.5:
+                start, end = start.astimezone(tz), end.astimezone(tz)
+            programs.append(
+                {
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                    "channel": channel,
+                    "title": f"Program {len(programs)}",
+                    "categories": ["Test"],
+                }
+            )
+            current = end
+    rnd.shuffle(programs)
+    return programs
+
+
+def _entries(programs: List[Dict[str, Any]], channel: str) -> List[Any]:
+    return [
+        (iso_to_epoch(p["start_time"]), iso_to_epoch(p["end_time"]), p)
+        for p in programs
+        if p["channel"] == channel
+    ]
+
+
+@pytest.mark.parametrize("zone", ZONES)
+@pytest.mark.parametrize("seed", range(8))
+def test_build_day_schedules_matches_reference(zone: str, seed: int) -> None:
+    tz = pytz.timezone(zone)
+    programs = _programs(random.Random(seed), tz)
+    expected = reference_grouping.group_and_fill_programschannels(
+        reference_grouping.adjust_programming(programs, tz), tz, ALL_CHANNELS
+    )
+    entries = {channel: _entries(programs, channel) for channel in CHANNELS}
+
+    first_day = min(datetime.strptime(day, "%Y-%m-%d") for day in expected)
+    days = {
+        (first_day + timedelta(days=offset)).strftime("%Y-%m-%d")
+        for offset in range(-1, len(expected) + 2)
+    }
+    for day in sorted(days | set(expected)):
+        schedules = build_day_schedules(entries, tz, day, ALL_CHANNELS)
+        if day in expected:
+            assert json.dumps(schedules) == json.dumps(expected[day]), day
+        else:
+            assert schedules is None, day
+
+
+@pytest.mark.parametrize("zone", ZONES)
+@pytest.mark.parametrize("seed", range(8))
+def test_build_channel_schedule_matches_reference(zone: str, seed: int) -> None:
+    tz = pytz.timezone(zone)
+    programs = _programs(random.Random(seed), tz)
+    for channel in CHANNELS:
+        channel_programs = [p for p in programs if p["channel"] == channel]
+        expected = reference_grouping.group_and_fill_programs(
+            reference_grouping.adjust_programming(channel_programs, tz), tz
+        )
+        schedule = build_channel_schedule(_entries(programs, channel), tz, channel)
+        assert json.dumps(schedule) == json.dumps(expected)
@@ -0,0 +1,112 @@
+"""ETag validation and 304 responses of the read endpoints."""
+
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.utils.http_cache import build_etag, etag_matches
+
+CHANNEL_URL = "/api/py/epg/channels/cached/channel-0?timezone=Australia/Sydney"
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"other", W/"abc"', True),
+        ("*", True),
+        ('W/"other"', False),
+        ('W/"abcd"', False),
+    ],
+)
+def test_etag_matches_weakly(if_none_match: str, expected: bool) -> None:
+    assert etag_matches(if_none_match, 'W/"abc"') is expected
+
+
+def test_build_etag_covers_version_and_parts() -> None:
+    etag = build_etag("v1", "epg/channels", "source", "UTC")
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == build_etag("v1", "epg/channels", "source", "UTC")
+    assert etag != build_etag("v2", "epg/channels", "source", "UTC")
+    assert etag != build_etag("v1", "epg/channels", "source", "Australia/Sydney")
+
+
+def test_channel_schedule_answers_304_for_current_etag(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("cached")
+    response = client.get(CHANNEL_URL)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    revalidated = client.get(CHANNEL_URL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.headers["cache-control"] == response.headers["cache-control"]
+
+    # Strong and listed forms of the same tag match too
+    strong = etag.removeprefix("W/")
+    listed = client.get(CHANNEL_URL, headers={"If-None-Match": f'"stale", {strong}'})
+    assert listed.status_code == 304
+
+    stale = client.get(CHANNEL_URL, headers={"If-None-Match": 'W/"stale"'})
+    assert stale.status_code == 200
+    assert stale.json()["programs"] == response.json()["programs"]
+
+
+def test_day_grid_answers_304_for_current_etag(
+    client: TestClient, write_source: Callable
+) -> None:
+    programs, _ = write_source("cached")
+    day = datetime.fromisoformat(programs[0]["start_time"]).date()
+    url = f"/api/py/epg/date/{day:%Y%m%d}/cached"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    other_day = client.get(
+        f"/api/py/epg/date/{day + timedelta(days=1):%Y%m%d}/cached",
+        headers={"If-None-Match": etag},
+    )
+    assert other_day.status_code == 200
+    assert other_day.headers["etag"] != etag
+
+
+def test_etag_changes_when_source_is_rewritten(
+    client: TestClient, write_source: Callable, data_dir: Path
+) -> None:
+    write_source("cached")
+    etag = client.get(CHANNEL_URL).headers["etag"]
+
+    path = data_dir / "cached_programs.json"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    response = client.get(CHANNEL_URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_missing_channel_is_404_before_revalidation(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("cached")
+    response = client.get(
+        "/api/py/epg/channels/cached/no-such-channel", headers={"If-None-Match": "*"}
+    )
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_missing_source_is_404(client: TestClient) -> None:
+    response = client.get(CHANNEL_URL, headers={"If-None-Match": "*"})
+    assert response.status_code == 404
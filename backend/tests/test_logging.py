@@ -0,0 +1,141 @@
+"""Request logging and the queued log handlers."""
+
+import logging
+from logging.handlers import QueueHandler
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app import logging_config
+from app.logging_config import setup_logging, stop_logging
+from app.middleware.logging_middleware import LoggingMiddleware
+
+MIDDLEWARE_LOGGER = "app.middleware.logging_middleware"
+
+
+def _chunks() -> Iterator[bytes]:
+    for index in range(3):
+        yield f"chunk {index}\n".encode()
+
+
+async def _streamed(request: Request) -> Response:
+    return StreamingResponse(_chunks(), status_code=201, media_type="text/plain")
+
+
+async def _failing(request: Request) -> Response:
+    raise ValueError("broken")
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = Starlette(routes=[Route("/streamed", _streamed), Route("/failing", _failing)])
+    return TestClient(LoggingMiddleware(app), raise_server_exceptions=False)
+
+
+def _messages(caplog: pytest.LogCaptureFixture, level: int) -> List[str]:
+    return [
+        record.getMessage()
+        for record in caplog.records
+        if record.name == MIDDLEWARE_LOGGER and record.levelno == level
+    ]
+
+
+def test_streamed_response_is_logged_once_with_its_status(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.INFO, logger=MIDDLEWARE_LOGGER):
+        response = client.get("/streamed")
+
+    assert response.text == "chunk 0\nchunk 1\nchunk 2\n"
+    messages = _messages(caplog, logging.INFO)
+    assert len(messages) == 1
+    assert messages[0].startswith("GET /streamed - Client: testclient - Status: 201")
+
+
+def test_failed_request_is_logged_as_an_error_only(
+    client: TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.INFO, logger=MIDDLEWARE_LOGGER):
+        response = client.get("/failing")
+
+    assert response.status_code == 500
+    assert _messages(caplog, logging.INFO) == []
+    errors = _messages(caplog, logging.ERROR)
+    assert len(errors) == 1
+    assert "Error: ValueError: broken" in errors[0]
+
+
+@pytest.fixture
+def root_logger() -> Iterator[logging.Logger]:
+    """Restore the root logger's handlers and level after the test."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    stop_logging()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        if handler not in handlers:
+            handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+def test_records_are_written_by_the_listener(
+    root_logger: logging.Logger, tmp_path: Path
+) -> None:
+    log_file = tmp_path / "logs" / "app.log"
+    setup_logging(log_file=log_file, log_format="%(levelname)s %(message)s")
+
+    assert [type(handler) for handler in root_logger.handlers] == [QueueHandler]
+    for index in range(100):
+        logging.getLogger("webepg.test").info(f"queued {index}")
+    stop_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert lines == [f"INFO queued {index}" for index in range(100)]
+
+
+def test_stop_logging_restores_direct_handlers(
+    root_logger: logging.Logger, tmp_path: Path
+) -> None:
+    log_file = tmp_path / "app.log"
+    setup_logging(log_file=log_file, log_format="%(message)s")
+    stop_logging()
+
+    assert logging_config._listener is None
+    assert not any(isinstance(h, QueueHandler) for h in root_logger.handlers)
+    assert {type(h) for h in root_logger.handlers} == {
+        logging.StreamHandler,
+        logging.FileHandler,
+    }
+
+    # Written at once, without a listener thread
+    logging.getLogger("webepg.test").warning("after shutdown")
+    assert log_file.read_text() == "after shutdown\n"
+
+    # Stopping again is harmless
+    stop_logging()
+
+
+def test_setup_logging_again_replaces_the_listener(
+    root_logger: logging.Logger, tmp_path: Path
+) -> None:
+    setup_logging(log_file=tmp_path / "first.log", log_format="%(message)s")
+    first = logging_config._listener
+    logging.getLogger("webepg.test").info("first")
+
+    setup_logging(log_file=tmp_path / "second.log", log_format="%(message)s")
+    logging.getLogger("webepg.test").info("second")
+    stop_logging()
+
+    assert logging_config._listener is not first
+    # The old listener was flushed before its handlers were closed
+    assert (tmp_path / "first.log").read_text() == "first\n"
+    assert (tmp_path / "second.log").read_text() == "second\n"
@@ -0,0 +1,95 @@
+"""Field projection and sparse encoding through the read endpoints."""
+
+from typing import Any, Callable, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+
+CHANNEL_URL = "/api/py/epg/channels/projected/channel-0"
+
+
+def _programs(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [program for day in body["programs"].values() for program in day]
+
+
+@pytest.fixture
+def full(client: TestClient, write_source: Callable) -> Any:
+    write_source("projected")
+    return client.get(CHANNEL_URL)
+
+
+def test_fields_keep_only_the_requested_keys_in_order(
+    client: TestClient, full: Any
+) -> None:
+    response = client.get(CHANNEL_URL, params={"fields": "title,start_time"})
+
+    assert response.status_code == 200
+    assert _programs(response.json()) == [
+        {"title": program["title"], "start_time": program["start_time"]}
+        for program in _programs(full.json())
+    ]
+
+
+def test_unknown_fields_are_left_out(client: TestClient, full: Any) -> None:
+    response = client.get(CHANNEL_URL, params={"fields": "nonexistent,title"})
+
+    assert response.status_code == 200
+    assert _programs(response.json()) == [
+        {"title": program["title"]} for program in _programs(full.json())
+    ]
+
+
+def test_sparse_drops_placeholder_values(client: TestClient, full: Any) -> None:
+    response = client.get(CHANNEL_URL, params={"sparse": "true"})
+
+    expected = [
+        {
+            key: value
+            for key, value in program.items()
+            if value not in ("", "N/A", None) and value != ["N/A"]
+        }
+        for program in _programs(full.json())
+    ]
+    assert _programs(response.json()) == expected
+    assert sum(map(len, expected)) < sum(map(len, _programs(full.json())))
+
+
+def test_sparse_applies_to_the_selected_fields(client: TestClient, full: Any) -> None:
+    response = client.get(
+        CHANNEL_URL, params={"fields": "title,subtitle", "sparse": "true"}
+    )
+
+    for program in _programs(response.json()):
+        assert set(program) <= {"title", "subtitle"}
+        assert program.get("subtitle") != "N/A"
+
+
+def test_projection_is_part_of_the_etag(client: TestClient, full: Any) -> None:
+    def etag(**params: str) -> str:
+        return client.get(CHANNEL_URL, params=params).headers["etag"]
+
+    projected = {
+        etag(fields="title"),
+        etag(fields="title,start_time"),
+        etag(fields="start_time,title"),
+        etag(sparse="true"),
+        etag(fields="title", sparse="true"),
+    }
+    assert len(projected) == 5
+    assert full.headers["etag"] not in projected
+
+    # Equivalent spellings share a representation
+    assert etag(fields=" title , title") == etag(fields="title")
+    assert etag(fields="", sparse="false") == full.headers["etag"]
+
+
+def test_projected_etag_revalidates(client: TestClient, full: Any) -> None:
+    params = {"fields": "title"}
+    etag = client.get(CHANNEL_URL, params=params).headers["etag"]
+
+    revalidated = client.get(
+        CHANNEL_URL, params=params, headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    full_with_stale = client.get(CHANNEL_URL, headers={"If-None-Match": etag})
+    assert full_with_stale.status_code == 200
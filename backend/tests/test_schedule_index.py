@@ -0,0 +1,141 @@
+"""Channel timelines against the linear scans they replaced."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from app.services.schedule_index import build_timelines
+from app.utils.columnar import load_program_columns, np, write_program_columns
+from app.utils.time_utils import iso_to_epoch
+
+Program = Dict[str, Any]
+BASE = datetime(2026, 4, 4, 12, 0, tzinfo=timezone.utc)
+
+
+def _programs(seed: int) -> List[Program]:
+    """Two channels with gaps, overlaps, equal starts and zero-length programs."""
+    rnd = random.Random(seed)
+    programs: List[Program] = []
+    for channel in ["ch-a", "ch-b"]:
+        current = BASE
+        for _ in range(rnd.randint(1, 25)):
+            start = current + timedelta(minutes=rnd.choice([0, 0, 0, 5, -15, -30]))
+            end = start + timedelta(minutes=rnd.choice([0, 0, 1, 30, 60, 90]))
+            programs.append(
+                {
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                    "channel": channel,
+                    "title": f"Program {len(programs)}",
+                }
+            )
+            current = max(current, end)
+    rnd.shuffle(programs)
+    return programs
+
+
+def _scan_now_next(
+    programs: List[Program], at: float
+) -> Tuple[Optional[Program], Optional[Program]]:
+    # The loop nownext.get_nownext ran over each channel before timelines
+    ordered = sorted(programs, key=lambda p: iso_to_epoch(p["start_time"]))
+    for idx, program in enumerate(ordered):
+        start = iso_to_epoch(program["start_time"])
+        end = iso_to_epoch(program["end_time"])
+        if start <= at < end:
+            next_program = next(
+                (p for p in ordered[idx + 1 :] if iso_to_epoch(p["start_time"]) >= end),
+                None,
+            )
+            return program, next_program
+        if start > at:
+            return None, program
+    return None, None
+
+
+def _scan_overlapping(programs: List[Program], start: float, end: float) -> List[Any]:
+    return [
+        (iso_to_epoch(p["start_time"]), iso_to_epoch(p["end_time"]), p)
+        for p in programs
+        if iso_to_epoch(p["start_time"]) < end and iso_to_epoch(p["end_time"]) >= start
+    ]
+
+
+def _instants(programs: List[Program]) -> List[float]:
+    """Every program boundary, one second either side, and outside the data."""
+    boundaries = {
+        iso_to_epoch(p[key]) for p in programs for key in ("start_time", "end_time")
+    }
+    return sorted(
+        {edge + offset for edge in boundaries for offset in (-1, 0, 1)}
+        | {min(boundaries) - 3600, max(boundaries) + 3600}
+    )
+
+
+@pytest.fixture(params=["json", "columnar"])
+def load(
+    request: pytest.FixtureRequest, data_dir: Path
+) -> Callable[[List[Program]], Sequence[Program]]:
+    def load_programs(programs: List[Program]) -> Sequence[Program]:
+        if request.param == "json":
+            return programs
+        if np is None:
+            pytest.skip("NumPy is not installed")
+        write_program_columns("timeline", programs, (1, 1))
+        return load_program_columns("timeline", (1, 1))
+
+    return load_programs
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_now_next_matches_linear_scan(load: Callable, seed: int) -> None:
+    programs = _programs(seed)
+    timelines = build_timelines(load(programs))
+    for channel, timeline in timelines.items():
+        channel_programs = [p for p in programs if p["channel"] == channel]
+        for at in _instants(channel_programs):
+            assert timeline.now_next(at) == _scan_now_next(channel_programs, at), at
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_overlapping_matches_linear_scan(load: Callable, seed: int) -> None:
+    programs = _programs(seed)
+    timelines = build_timelines(load(programs))
+    for channel, timeline in timelines.items():
+        channel_programs = [p for p in programs if p["channel"] == channel]
+        instants = _instants(channel_programs)
+        for start in instants[::3]:
+            for end in instants[::5]:
+                if end <= start:
+                    continue
+                assert timeline.overlapping(start, end) == _scan_overlapping(
+                    channel_programs, start, end
+                ), (start, end)
+
+
+def test_now_on_a_boundary_belongs_to_the_next_program() -> None:
+    first = {
+        "start_time": "2026-04-04T12:00:00+00:00",
+        "end_time": "2026-04-04T13:00:00+00:00",
+        "channel": "ch",
+    }
+    zero_length = {
+        "start_time": "2026-04-04T13:00:00+00:00",
+        "end_time": "2026-04-04T13:00:00+00:00",
+        "channel": "ch",
+    }
+    second = {
+        "start_time": "2026-04-04T13:00:00+00:00",
+        "end_time": "2026-04-04T14:00:00+00:00",
+        "channel": "ch",
+    }
+    timeline = build_timelines([zero_length, second, first])["ch"]
+    boundary = iso_to_epoch("2026-04-04T13:00:00+00:00")
+
+    # A zero-length program never airs, but can still be the next one
+    assert timeline.now_next(boundary - 1) == (first, zero_length)
+    assert timeline.now_next(boundary) == (second, None)
+    assert timeline.now_next(boundary + 3600) == (None, None)
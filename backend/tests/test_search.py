@@ -0,0 +1,46 @@
+"""Programme search endpoint: parameters, paging and caching."""
+
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+SEARCH_URL = "/api/py/epg/search/searched"
+
+
+def test_search_finds_programs_and_pages(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("searched")
+    full = client.get(SEARCH_URL, params={"q": "news", "limit": 500}).json()
+    assert full["total"] == len(full["results"]) > 4
+    assert all("News" in hit["program"]["title"] for hit in full["results"])
+
+    pages = [
+        client.get(
+            SEARCH_URL, params={"q": "news", "limit": 2, "offset": offset}
+        ).json()
+        for offset in range(0, full["total"], 2)
+    ]
+    assert [hit for page in pages for hit in page["results"]] == full["results"]
+    assert {page["total"] for page in pages} == {full["total"]}
+
+
+def test_days_beyond_the_limit_are_rejected(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("searched")
+    for days in (0, 8, 3_000_000):
+        response = client.get(SEARCH_URL, params={"q": "news", "days": days})
+        assert response.status_code == 422, days
+
+
+def test_timezone_aliases_share_etag_and_body(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("searched")
+    at = "2030-01-01T00:00:00Z"
+    canonical = client.get(SEARCH_URL, params={"q": "news", "at": at})
+    alias = client.get(SEARCH_URL, params={"q": "news", "at": at, "timezone": "utc"})
+
+    assert canonical.headers["etag"] == alias.headers["etag"]
+    assert canonical.json()["timezone"] == alias.json()["timezone"] == "UTC"
@@ -0,0 +1,97 @@
+"""Server-Timing header, phase timings and the slow request log."""
+
+import logging
+from typing import Callable, List
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.config import settings
+from app.middleware.compression_middleware import CompressionMiddleware
+from app.middleware.server_timing_middleware import ServerTimingMiddleware
+from app.utils.server_timing import PhaseTimer, phase
+
+
+async def _timed(request: Request) -> Response:
+    with phase("load"):
+        pass
+    with phase("grid"):
+        pass
+    with phase("load"):
+        pass
+    return Response(b'{"programs": []}' * 100, media_type="application/json")
+
+
+def _client(**kwargs: object) -> TestClient:
+    app = Starlette(routes=[Route("/timed", _timed)])
+    compressed = CompressionMiddleware(app, minimum_size=100, cache=None)
+    return TestClient(ServerTimingMiddleware(compressed, **kwargs))  # type: ignore[arg-type]
+
+
+def _metric_names(header: str) -> List[str]:
+    return [metric.split(";", 1)[0] for metric in header.split(", ")]
+
+
+def test_header_lists_phases_once_each_and_the_total() -> None:
+    response = _client().get("/timed", headers={"Accept-Encoding": "gzip"})
+
+    # Compression runs before the response starts, so it is included
+    assert _metric_names(response.headers["server-timing"]) == [
+        "load",
+        "grid",
+        "compress",
+        "total",
+    ]
+    assert all(
+        ";dur=" in metric for metric in response.headers["server-timing"].split(", ")
+    )
+
+
+def test_header_is_left_out_unless_enabled() -> None:
+    response = _client(emit_header=False).get("/timed")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_api_sends_no_header_by_default(
+    client: TestClient, write_source: Callable
+) -> None:
+    assert settings.SERVER_TIMING is False
+    write_source("timed")
+
+    response = client.get("/api/py/epg/channels/timed/channel-0")
+
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+
+def test_slow_requests_are_logged_with_their_phases(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = "app.middleware.server_timing_middleware"
+    with caplog.at_level(logging.WARNING, logger=logger):
+        _client(emit_header=False, slow_request_ms=1e-6).get("/timed?day=1")
+        _client(emit_header=False, slow_request_ms=60_000).get("/timed?day=2")
+
+    messages = [r.getMessage() for r in caplog.records if r.name == logger]
+    assert len(messages) == 1
+    assert messages[0].startswith("Slow request: GET /timed?day=1 - Time: ")
+    assert "Phases: load=" in messages[0] and "grid=" in messages[0]
+
+
+def test_phase_is_a_no_op_outside_a_timed_request() -> None:
+    with phase("load"):
+        pass
+
+    with PhaseTimer() as timer:
+        with phase("load"):
+            pass
+    with phase("grid"):
+        pass
+
+    assert list(timer.durations) == ["load"]
@@ -0,0 +1,128 @@
+"""Coalescing of concurrent computations by SingleFlight."""
+
+import asyncio
+from typing import Any, Callable, Coroutine, List
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+def _run(test: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    asyncio.run(test())
+
+
+class _Load:
+    """A computation that runs until released, counting its starts."""
+
+    def __init__(self, result: Any = "loaded") -> None:
+        self.result = result
+        self.starts = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> Any:
+        self.starts += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_callers_share_one_load() -> None:
+    async def test() -> None:
+        flight = SingleFlight()
+        load = _Load()
+        callers = [asyncio.create_task(flight.run("key", load)) for _ in range(5)]
+        other_load = _Load("other")
+        other = asyncio.create_task(flight.run("other", other_load))
+        await asyncio.sleep(0)
+
+        assert flight.stats() == {
+            "leaders": 2,
+            "coalesced": 4,
+            "failures": 0,
+            "in_flight": 2,
+        }
+        load.release.set()
+        other_load.release.set()
+        assert await asyncio.gather(*callers) == ["loaded"] * 5
+        assert await other == "other"
+        assert load.starts == other_load.starts == 1
+
+    _run(test)
+
+
+def test_results_are_not_kept() -> None:
+    async def test() -> None:
+        flight = SingleFlight()
+        load = _Load()
+        load.release.set()
+
+        assert await flight.run("key", load) == "loaded"
+        assert await flight.run("key", load) == "loaded"
+        assert load.starts == 2
+        assert flight.stats()["in_flight"] == 0
+
+    _run(test)
+
+
+def test_failure_reaches_every_caller_and_is_not_cached() -> None:
+    async def test() -> None:
+        flight = SingleFlight()
+        failing = _Load(ValueError("broken"))
+        callers = [asyncio.create_task(flight.run("key", failing)) for _ in range(3)]
+        await asyncio.sleep(0)
+        failing.release.set()
+
+        results: List[Any] = await asyncio.gather(*callers, return_exceptions=True)
+        assert [str(result) for result in results] == ["broken"] * 3
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats()["failures"] == 1
+
+        # The next call starts a fresh computation
+        working = _Load()
+        working.release.set()
+        assert await flight.run("key", working) == "loaded"
+        assert working.starts == 1
+
+    _run(test)
+
+
+def test_cancelled_caller_leaves_the_others_running() -> None:
+    async def test() -> None:
+        flight = SingleFlight()
+        load = _Load()
+        leader = asyncio.create_task(flight.run("key", load))
+        follower = asyncio.create_task(flight.run("key", load))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats()["in_flight"] == 1
+
+        load.release.set()
+        assert await follower == "loaded"
+        assert load.starts == 1
+
+    _run(test)
+
+
+def test_computation_outlives_its_callers() -> None:
+    async def test() -> None:
+        flight = SingleFlight()
+        load = _Load()
+        caller = asyncio.create_task(flight.run("key", load))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0)
+
+        # A caller arriving later joins the computation still in flight
+        late = asyncio.create_task(flight.run("key", load))
+        await asyncio.sleep(0)
+        load.release.set()
+        assert await late == "loaded"
+        assert load.starts == 1
+        assert flight.stats()["coalesced"] == 1
+
+    _run(test)
@@ -0,0 +1,79 @@
+"""The mtime-aware source store: hits, misses and reloads."""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from app.services.source_store import SourceStore
+
+
+@pytest.fixture
+def store(data_dir: Path) -> SourceStore:
+    return SourceStore()
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_source_is_parsed_once(store: SourceStore, write_source: Callable) -> None:
+    programs, channels = write_source("stored")
+
+    first = store.get("stored")
+    assert list(first.programs) == programs
+    assert first.channels == channels
+    assert store.stats()["misses"] == 2
+    assert store.stats()["hits"] == 0
+
+    assert store.get("stored") is first
+    assert store.stats()["misses"] == 2
+    assert store.stats()["hits"] == 2
+    assert store.stats()["reloads"] == 0
+
+
+def test_changed_file_is_reloaded(
+    store: SourceStore, write_source: Callable, data_dir: Path
+) -> None:
+    write_source("stored")
+    first = store.get("stored")
+
+    _touch(data_dir / "stored_channels.json")
+    second = store.get("stored")
+
+    assert second is not first
+    assert second.version != first.version
+    assert store.stats()["reloads"] == 1
+    # The unchanged programs file is still served from memory
+    assert second.programs is first.programs
+
+
+def test_missing_source_is_not_cached(
+    store: SourceStore, write_source: Callable, data_dir: Path
+) -> None:
+    with pytest.raises(FileNotFoundError):
+        store.get("stored")
+
+    write_source("stored")
+    store.get("stored")
+    (data_dir / "stored_programs.json").unlink()
+
+    with pytest.raises(FileNotFoundError):
+        store.get("stored")
+    assert store.stats()["cached_files"] == 1
+
+
+def test_aget_returns_the_cached_source(
+    store: SourceStore, write_source: Callable
+) -> None:
+    write_source("stored")
+
+    async def load_twice():
+        return await store.aget("stored"), await store.aget("stored")
+
+    first, second = asyncio.run(load_twice())
+    assert first is second
+    assert store.stats()["misses"] == 2
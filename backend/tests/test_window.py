@@ -0,0 +1,156 @@
+"""Window clipping and gap filling, held to the day grid conventions."""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+import pytest
+import pytz
+from fastapi.testclient import TestClient
+
+from app.exceptions import InvalidTimeWindowError
+from app.routers.window import resolve_window
+from app.utils.grid_engine import (
+    MIN_GAP_SECONDS,
+    build_channel_schedule,
+    build_day_schedules,
+    fill_window,
+    local_clock,
+)
+
+ZONES = ["UTC", "Australia/Sydney", "Asia/Kathmandu", "America/New_York"]
+DAY = "2026-05-12"
+
+
+def _day_bounds(tz: pytz.BaseTzInfo) -> List[int]:
+    midnight = datetime.strptime(DAY, "%Y-%m-%d")
+    return [
+        int(tz.localize(midnight + timedelta(days=offset)).timestamp())
+        for offset in (0, 1)
+    ]
+
+
+def _entries(seed: int, start: int, end: int) -> List[Any]:
+    """Programs starting inside the day, without overlaps."""
+    rnd = random.Random(seed)
+    entries = []
+    current = start + rnd.choice([0, 30, 60, 61, 1800])
+    while current < end:
+        length = rnd.choice([1, 2, 25, 30, 60, 95]) * 60
+        entries.append(
+            (current, current + length, {"title": f"Program {len(entries)}"})
+        )
+        current += length + rnd.choice([0, 0, 30, 60, 61, 600])
+    rnd.shuffle(entries)
+    return entries
+
+
+def _window(entries: List[Any], tz: pytz.BaseTzInfo, start: int, end: int) -> Any:
+    return fill_window(entries, local_clock(tz), start, end, "ch")
+
+
+@pytest.mark.parametrize("zone", ZONES)
+@pytest.mark.parametrize("seed", range(10))
+def test_whole_day_window_matches_channel_day(zone: str, seed: int) -> None:
+    tz = pytz.timezone(zone)
+    start, end = _day_bounds(tz)
+    entries = _entries(seed, start, end)
+
+    schedule = build_channel_schedule(entries, tz, "ch")
+    assert _window(entries, tz, start, end) == schedule[DAY]
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_empty_window_is_one_filler(zone: str) -> None:
+    tz = pytz.timezone(zone)
+    start, end = _day_bounds(tz)
+
+    day_grid = build_day_schedules({"other": [(start, end, {})]}, tz, DAY, ["ch"])
+    assert day_grid is not None
+    assert _window([], tz, start, end) == day_grid["ch"]
+
+
+def test_programs_are_clipped_to_the_window() -> None:
+    tz = pytz.timezone("Australia/Sydney")
+    start, _ = _day_bounds(tz)
+    window_start, window_end = start + 3600, start + 3 * 3600
+    entries = [
+        (window_start - 600, window_start + 1800, {"title": "Running"}),
+        (window_start + 1800, window_end + 600, {"title": "Later"}),
+    ]
+
+    programs = _window(entries, tz, window_start, window_end)
+
+    assert [p["title"] for p in programs] == ["Running", "Later"]
+    assert programs[0]["start_time"] == f"{DAY} 01:00:00"
+    assert programs[0]["end_time"] == f"{DAY} 01:30:00"
+    assert programs[1]["start_time"] == f"{DAY} 01:30:00"
+    # The window end is exclusive: clipped programs end at its last second
+    assert programs[1]["end_time"] == f"{DAY} 02:59:59"
+
+
+def test_only_gaps_longer_than_a_minute_are_filled() -> None:
+    tz = pytz.utc
+    start, _ = _day_bounds(tz)
+    end = start + 3600
+    entries = [
+        (start + MIN_GAP_SECONDS, start + 600, {"title": "After a short gap"}),
+        (start + 600 + MIN_GAP_SECONDS + 1, end, {"title": "After a long gap"}),
+    ]
+
+    programs = _window(entries, tz, start, end)
+
+    assert [p["title"] for p in programs] == [
+        "After a short gap",
+        "No Data Available",
+        "After a long gap",
+    ]
+    assert programs[1]["start_time"] == f"{DAY} 00:10:00"
+    assert programs[1]["end_time"] == f"{DAY} 00:11:00"
+
+
+def test_resolve_window_defaults_to_three_hours_from_this_minute() -> None:
+    tz = pytz.timezone("Australia/Sydney")
+    window_start, window_end = resolve_window(None, None, tz)
+
+    assert window_start.second == window_start.microsecond == 0
+    assert window_end - window_start == timedelta(hours=3)
+    assert window_start.tzinfo.zone == "Australia/Sydney"
+
+
+def test_resolve_window_truncates_and_converts_bounds() -> None:
+    tz = pytz.timezone("Australia/Sydney")
+    window_start, window_end = resolve_window(
+        datetime(2026, 5, 12, 0, 0, 0, 500000), datetime(2026, 5, 19), tz
+    )
+
+    assert window_start.isoformat() == "2026-05-12T10:00:00+10:00"
+    assert window_end - window_start == timedelta(days=7)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (datetime(2026, 5, 12), datetime(2026, 5, 12)),
+        (datetime(2026, 5, 12), datetime(2026, 5, 11)),
+        (datetime(2026, 5, 12), datetime(2026, 5, 19, 0, 0, 1)),
+    ],
+)
+def test_resolve_window_rejects_empty_and_long_windows(
+    start: datetime, end: datetime
+) -> None:
+    with pytest.raises(InvalidTimeWindowError):
+        resolve_window(start, end, pytz.utc)
+
+
+def test_window_echoes_the_canonical_timezone(
+    client: TestClient, write_source: Callable
+) -> None:
+    write_source("windowed")
+    url = "/api/py/epg/window/windowed"
+    params = {"start": "2030-01-01T00:00:00Z"}
+    canonical = client.get(url, params=params)
+    alias = client.get(url, params={**params, "timezone": "utc"})
+
+    assert canonical.headers["etag"] == alias.headers["etag"]
+    assert canonical.json()["timezone"] == alias.json()["timezone"] == "UTC"